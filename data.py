@@ -1,19 +1,15 @@
-import requests
+import os
+import sys
+import argparse
 import pandas as pd
-import yfinance as yf
 
-# Function to fetch data from World Bank API
-def fetch_world_bank_data(indicator, country="IND", start_year=1980, end_year=2024):
-    url = f"https://api.worldbank.org/v2/country/{country}/indicator/{indicator}?date={start_year}:{end_year}&format=json"
-    response = requests.get(url)
-    data = response.json()
-    
-    if len(data) > 1 and isinstance(data[1], list):
-        records = [{"Year": int(item["date"]), "Value": item["value"]} for item in data[1] if item["value"] is not None]
-        df = pd.DataFrame(records)
-        return df.sort_values("Year", ascending=True)
-    else:
-        return pd.DataFrame(columns=["Year", "Value"])
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+from data_fetching import fetch_indicators, fetch_panel, fetch_csv, summarize_latencies
+from response_cache import ResponseCache
+from timeseries_store import sync_stocks
+
+# Shared on-disk response cache (per-source TTLs, ETag/Last-Modified revalidation)
+cache = ResponseCache()
 
 # Economic Indicators Mapping
 indicators = {
@@ -34,12 +30,26 @@ indicators = {
     "Manufacturing PMI": None,  # Placeholder, might need alternative source
 }
 
-# Fetch data from World Bank API
-data_frames = {}
-for key, indicator in indicators.items():
-    if indicator:
-        df = fetch_world_bank_data(indicator, start_year=1980)
-        data_frames[key] = df.set_index("Year")
+# Panel mode: many countries, one request per indicator per batch of countries
+parser = argparse.ArgumentParser(description="Fetch national economic indicators.")
+parser.add_argument("--countries", nargs="+", help="ISO3 codes; writes a long (Country, Year, Indicator, Value) panel")
+parser.add_argument("--panel-output", default="national_economic_indicators_panel_1980_2024.csv")
+parser.add_argument("--stock-aggregation", choices=["last", "mean"], default="last",
+                    help="How daily index closes become annual values")
+args = parser.parse_args()
+
+if args.countries:
+    panel_df = fetch_panel(indicators, args.countries, start_year=1980, cache=cache)
+    panel_df.to_csv(args.panel_output, index=False)
+    print(f"✅ Panel data ({panel_df['Country'].nunique()} countries) saved to {args.panel_output}")
+    print(f"📦 Cache stats: {cache.stats()}")
+    cache.close()
+    sys.exit(0)
+
+# Fetch data from World Bank API (concurrently, over one keep-alive session)
+latencies = []
+data_frames = fetch_indicators(indicators, start_year=1980, latencies=latencies, cache=cache)
+print(summarize_latencies(latencies).to_string(index=False))
 
 # Flatten multi-index and reset index
 final_df = pd.concat(data_frames, axis=1)  # Keep original column names
@@ -50,27 +60,21 @@ final_df = final_df.reset_index()  # Ensure "Year" is a proper column
 if "Exports (Billion USD)" in final_df.columns and "Imports (Billion USD)" in final_df.columns:
     final_df["Trade Balance (Billion USD)"] = final_df["Exports (Billion USD)"] - final_df["Imports (Billion USD)"]
 
-# Function to fetch stock data from Yahoo Finance (NIFTY & SENSEX)
-def fetch_stock_data(ticker, start_year="1980-01-01", end_year="2024-12-31"):
-    stock = yf.Ticker(ticker)
-    hist = stock.history(period="max", start=start_year, end=end_year)
-    hist = hist.resample('YE').last()  # Ensure yearly data
-    hist['Year'] = hist.index.year.astype(int)  # Convert year to integer
-    return hist[['Year', 'Close']].rename(columns={"Close": f"{ticker} Close Price"})
-
-# Fetch NIFTY 50 & SENSEX Data
-nifty_df = fetch_stock_data("^NSEI", start_year="1980-01-01")
-sensex_df = fetch_stock_data("^BSESN", start_year="1980-01-01")
+# NIFTY 50 & SENSEX: daily closes are kept in the local time-series store and only the
+# days since the last sync are downloaded; annual values are resampled from the store
+store = sync_stocks(["^NSEI", "^BSESN"], start="1980-01-01", cache=cache)
+stock_df = store.frame({"^NSEI": args.stock_aggregation, "^BSESN": args.stock_aggregation}, freq="annual",
+                       columns={"^NSEI": "^NSEI Close Price", "^BSESN": "^BSESN Close Price"})
+stock_df = stock_df[stock_df["Year"] <= 2024]
 
 # Merge stock data
-final_df = final_df.merge(nifty_df, on="Year", how="left")
-final_df = final_df.merge(sensex_df, on="Year", how="left")
+final_df = final_df.merge(stock_df, on="Year", how="left")
 
 # Function to fetch Consumer Confidence Index (CCI) from OECD API
 def fetch_cci_data():
     url = "https://stats.oecd.org/SDMX-JSON/data/DP_LIVE/IND.CCI.TOT.AGRWTH.A/OECD?contentType=csv"
     try:
-        cci_df = pd.read_csv(url)
+        cci_df = fetch_csv(url, source="oecd", cache=cache)
         cci_df = cci_df[['TIME', 'Value']]
         cci_df.columns = ['Year', 'Consumer Confidence Index (CCI)']
         cci_df['Year'] = cci_df['Year'].astype(int)
@@ -88,3 +92,5 @@ if not cci_df.empty:
 csv_filename = "national_economic_indicators_1980_2024.csv"
 final_df.to_csv(csv_filename, index=False)
 print(f"✅ Data successfully saved to {csv_filename}")
+print(f"📦 Cache stats: {cache.stats()}")
+cache.close()
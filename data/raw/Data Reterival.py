@@ -1,19 +1,13 @@
-import requests
+import os
+import sys
 import pandas as pd
-import yfinance as yf
 
-# Function to fetch data from World Bank API
-def fetch_world_bank_data(indicator, country="IND", start_year=2000, end_year=2024):
-    url = f"https://api.worldbank.org/v2/country/{country}/indicator/{indicator}?date={start_year}:{end_year}&format=json"
-    response = requests.get(url)
-    data = response.json()
-    
-    if len(data) > 1 and isinstance(data[1], list):
-        records = [{"Year": int(item["date"]), "Value": item["value"]} for item in data[1] if item["value"] is not None]
-        df = pd.DataFrame(records)
-        return df.sort_values("Year", ascending=True)
-    else:
-        return pd.DataFrame(columns=["Year", "Value"])
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+from data_fetching import fetch_indicators, fetch_stock_history, fetch_csv
+from response_cache import ResponseCache
+
+# Shared on-disk response cache (per-source TTLs, ETag/Last-Modified revalidation)
+cache = ResponseCache()
 
 # World Bank Indicators Mapping
 indicators = {
@@ -34,11 +28,7 @@ indicators = {
 }
 
 # Fetch data from World Bank API
-data_frames = {}
-for key, indicator in indicators.items():
-    if indicator:
-        df = fetch_world_bank_data(indicator)
-        data_frames[key] = df.set_index("Year")
+data_frames = fetch_indicators(indicators, start_year=2000, cache=cache)
 
 # Flatten multi-index and reset index
 final_df = pd.concat(data_frames, axis=1)  # Keep original column names
@@ -51,8 +41,7 @@ if "Exports (Billion USD)" in final_df.columns and "Imports (Billion USD)" in fi
 
 # Function to fetch stock data from Yahoo Finance (NIFTY & SENSEX)
 def fetch_stock_data(ticker, start_year="2000-01-01", end_year="2024-12-31"):
-    stock = yf.Ticker(ticker)
-    hist = stock.history(period="max", start=start_year, end=end_year)
+    hist = fetch_stock_history(ticker, start=start_year, end=end_year, cache=cache)
     hist = hist.resample('YE').last()  # Fix deprecation warning for 'Y'
     hist['Year'] = hist.index.year.astype(int)  # Ensure 'Year' is integer
     return hist[['Year', 'Close']].rename(columns={"Close": f"{ticker} Close Price"})
@@ -69,7 +58,7 @@ final_df = final_df.merge(sensex_df, on="Year", how="left")
 def fetch_cci_data():
     url = "https://stats.oecd.org/SDMX-JSON/data/DP_LIVE/IND.CCI.TOT.AGRWTH.A/OECD?contentType=csv"
     try:
-        cci_df = pd.read_csv(url)
+        cci_df = fetch_csv(url, source="oecd", cache=cache)
         cci_df = cci_df[['TIME', 'Value']]
         cci_df.columns = ['Year', 'Consumer Confidence Index (CCI)']
         cci_df['Year'] = cci_df['Year'].astype(int)
@@ -87,3 +76,5 @@ if not cci_df.empty:
 csv_filename = "national_economic_indicators.csv"
 final_df.to_csv(csv_filename, index=False)
 print(f"✅ Data successfully saved to {csv_filename}")
+print(f"📦 Cache stats: {cache.stats()}")
+cache.close()
@@ -1,23 +1,25 @@
 import os
-import requests
-import pandas as pd
-import yfinance as yf
+import sys
+import time
+import argparse
 
-# Define save directory
-SAVE_DIR = "data/raw"
-os.makedirs(SAVE_DIR, exist_ok=True)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+from data_fetching import WB_BASE_URL, MAX_WORKERS
+from response_cache import ResponseCache
+from source_adapters import HostRateLimiter, default_adapters, fetch_series, join_on_year
 
-# 🌎 World Bank API Base URL
-WB_API_URL = "https://api.worldbank.org/v2/country/IND/indicator/{}?date=2000:2024&format=json"
+# Define save directory (next to this script)
+SAVE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# 🔹 Sector-Specific Economic Indicators with API Sources
+# 🔹 Sector-Specific Economic Indicators. Codes are dispatched by form: World Bank
+# indicator codes, yahoo:<ticker> for Yahoo Finance, and http(s) URLs for other REST APIs.
 SECTOR_INDICATORS = {
     "Agriculture": {
         "Agricultural GDP (% of GDP)": "NV.AGR.TOTL.ZS",  # World Bank
         "Fertilizer Consumption (kg per hectare)": "AG.CON.FERT.ZS",  # World Bank
-        "Crop Yield (kg per hectare)": "AG.YLD.CREL.KG",  # FAO API
+        "Crop Yield (kg per hectare)": "AG.YLD.CREL.KG",  # World Bank (FAO data)
         "Rural Employment Rate (%)": "SL.AGR.EMPL.ZS",  # World Bank
-        "Agricultural Exports (Billion USD)": "TX.VAL.AGRI.ZS.UN",  # FAO API
+        "Agricultural Exports (Billion USD)": "TX.VAL.AGRI.ZS.UN",  # World Bank (FAO data)
     },
     "Services": {
         "Services GDP (% of GDP)": "NV.SRV.TOTL.ZS",  # World Bank
@@ -48,84 +50,46 @@ SECTOR_INDICATORS = {
     }
 }
 
-# Function to fetch data from World Bank API with error handling
-def fetch_world_bank_data(indicator):
-    """Fetches data from World Bank API for a given indicator with error handling."""
-    url = WB_API_URL.format(indicator)
-    response = requests.get(url)
-    
-    try:
-        data = response.json()
-        
-        # Check if response contains valid data
-        if isinstance(data, list) and len(data) > 1 and isinstance(data[1], list):
-            records = [{"Year": int(item["date"]), "Value": item["value"]} for item in data[1] if item["value"] is not None]
-            return pd.DataFrame(records)
-        else:
-            print(f"⚠️ Warning: No valid data found for indicator {indicator}. Response: {data}")
-            return pd.DataFrame(columns=["Year", "Value"])
-    
-    except Exception as e:
-        print(f"❌ Error fetching data for indicator {indicator}: {e}")
-        return pd.DataFrame(columns=["Year", "Value"])
-
-
-# Function to fetch data from other REST APIs
-def fetch_rest_api_data(url):
-    """Fetches data from REST API endpoints."""
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        df = pd.DataFrame(data)
-        return df
-    except Exception as e:
-        print(f"Error fetching data from {url}: {e}")
-        return pd.DataFrame()
-
-# Function to fetch stock/financial data from Yahoo Finance
-def fetch_stock_data(ticker):
-    """Fetches stock data from Yahoo Finance for the given ticker."""
-    stock = yf.Ticker(ticker)
-    hist = stock.history(period="max", start="2000-01-01", end="2024-12-31")
-    hist = hist.resample('YE').last()
-    hist['Year'] = hist.index.year.astype(int)
-    return hist[['Year', 'Close']].rename(columns={"Close": f"{ticker} Close Price"})
+def extract_and_save_sector_data(sector_indicators=SECTOR_INDICATORS, save_dir=SAVE_DIR, adapters=None,
+                                 max_workers=MAX_WORKERS, limiter=None):
+    """Fetches every sector's indicators concurrently and saves one CSV per sector.
 
-# Function to extract and save data for each sector
-def extract_and_save_sector_data():
-    """Extracts economic data for each sector and saves as CSV files."""
-    for sector, indicators in SECTOR_INDICATORS.items():
-        print(f"Fetching data for {sector} sector...")
+    All (sector, indicator) series go through one thread pool with per-host rate limits;
+    each sector is then aligned on Year with a single concat and written once.
+    """
+    os.makedirs(save_dir, exist_ok=True)
+    jobs = {(sector, name): code for sector, indicators in sector_indicators.items()
+            for name, code in indicators.items() if code}
+    start = time.perf_counter()
+    series = fetch_series(jobs, adapters or default_adapters(), max_workers=max_workers, limiter=limiter)
+    print(f"📥 Fetched {len(jobs)} indicators for {len(sector_indicators)} sectors in "
+          f"{time.perf_counter() - start:.2f}s")
 
-        sector_data = pd.DataFrame()
-
-        for indicator_name, indicator_code in indicators.items():
-            if indicator_code:
-                if "worldbank.org" in WB_API_URL:
-                    df = fetch_world_bank_data(indicator_code)
-                elif "yahoo" in indicator_code:
-                    df = fetch_stock_data(indicator_code)
-                elif "api" in indicator_code:
-                    df = fetch_rest_api_data(indicator_code)
-                else:
-                    continue  # Skip missing or unknown indicators
-
-                if not df.empty:
-                    df = df.rename(columns={"Value": indicator_name})
-                    if sector_data.empty:
-                        sector_data = df
-                    else:
-                        sector_data = sector_data.merge(df, on="Year", how="outer")
-
-        # Save sector data as CSV
-        if not sector_data.empty:
-            file_path = os.path.join(SAVE_DIR, f"{sector}_data.csv")
+    saved = {}
+    for sector, indicators in sector_indicators.items():
+        sector_data = join_on_year({name: series[(sector, name)] for name in indicators if (sector, name) in series})
+        if len(sector_data.columns) > 1:
+            file_path = os.path.join(save_dir, f"{sector}_data.csv")
             sector_data.to_csv(file_path, index=False)
+            saved[sector] = file_path
             print(f"✅ {sector} data saved to {file_path}")
         else:
             print(f"⚠️ No data found for {sector}")
+    return saved
 
 # Run the data extraction process
 if __name__ == "__main__":
-    extract_and_save_sector_data()
+    parser = argparse.ArgumentParser(description="Fetch sector-level indicators into one CSV per sector.")
+    parser.add_argument("--save-dir", default=SAVE_DIR)
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--wb-base-url", default=WB_BASE_URL, help="World Bank API root (e.g. a local stand-in server)")
+    parser.add_argument("--rate", type=float, help="Requests per second per host, overriding the defaults")
+    args = parser.parse_args()
+
+    # Shared on-disk response cache (per-source TTLs, ETag/Last-Modified revalidation)
+    cache = ResponseCache()
+    limiter = HostRateLimiter(rates={}, default=args.rate) if args.rate else None
+    extract_and_save_sector_data(save_dir=args.save_dir, adapters=default_adapters(cache, wb_base_url=args.wb_base_url),
+                                 max_workers=args.workers, limiter=limiter)
+    print(f"📦 Cache stats: {cache.stats()}")
+    cache.close()
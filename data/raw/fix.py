@@ -1,24 +1,26 @@
-import pandas as pd
+import os
+import sys
+import argparse
 
-# Define file path
-file_path = r"C:\Users\Deepali Mishra\Downloads\export-2025-02-12T17_18_28.660Z.csv"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+from timeseries_store import TimeSeriesStore, import_csv
 
-# Read the CSV while skipping the first three lines
-cci_df = pd.read_csv(file_path, skiprows=3, header=None, names=["Date", "CCI"])
+# Stores a monthly CCI export (three header lines, then Date,CCI rows) at its native frequency
+# and writes the annual average next to it; other frequencies come from the same store.
+parser = argparse.ArgumentParser(description="Import a monthly CCI export and resample it.")
+parser.add_argument("export", help="CSV export with three header lines followed by Date,CCI rows")
+parser.add_argument("--freq", choices=["annual", "quarterly", "monthly"], default="annual")
+parser.add_argument("--how", choices=["mean", "last"], default="mean")
+parser.add_argument("--output", default="cci_annual_data.csv")
+args = parser.parse_args()
 
-# Convert 'Date' column to datetime format
-cci_df["Date"] = pd.to_datetime(cci_df["Date"])
+store = TimeSeriesStore()
+import_csv("CCI", args.export, "Date", "CCI", freq="M", source="oecd-export", store=store,
+           skiprows=3, header=None, names=["Date", "CCI"])
 
-# Extract the Year
-cci_df["Year"] = cci_df["Date"].dt.year
+# Average CCI per period
+cci_df = store.frame({"CCI": args.how}, freq=args.freq)
+cci_df.to_csv(args.output, index=False)
 
-# Compute the annual average CCI for each year
-cci_annual_df = cci_df.groupby("Year")["CCI"].mean().reset_index()
-
-# Save the processed data to a new CSV file
-cleaned_csv_path = "cci_annual_data.csv"
-cci_annual_df.to_csv(cleaned_csv_path, index=False)
-
-# Print the processed data instead of using ace_tools
-print(cci_annual_df.head())
-print(f"✅ Annual CCI data saved as {cleaned_csv_path}")
+print(cci_df.head())
+print(f"✅ {args.freq.capitalize()} CCI data saved as {args.output}")
@@ -0,0 +1,167 @@
+"""gdp: single entry point for the GDP forecasting workflow.
+
+    python gdp.py fetch | preprocess | features | train | forecast | backtest | startup
+
+Only the standard library and src/config.py load at startup; each subcommand imports the
+modules (and pandas, statsmodels, xgboost, ...) it needs when it runs, so `--help` stays fast.
+"""
+import os
+import re
+import sys
+import time
+import shlex
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+from config import PATHS
+
+# Commands timed by `gdp startup` when none are given
+STARTUP_COMMANDS = ["--help", "forecast --help", "forecast"]
+
+def cmd_fetch(args):
+    import runpy
+    sys.argv = [os.path.join(ROOT, "data.py")] + args.fetch_args
+    runpy.run_path(sys.argv[0], run_name="__main__")
+
+def cmd_preprocess(args):
+    if args.chunk_rows or args.entity_col:
+        from chunked_preprocessing import run, CHUNK_ROWS
+        run(input_path=args.input, output_path=args.output, entity_col=args.entity_col,
+            chunk_rows=args.chunk_rows or CHUNK_ROWS, csv_export=not args.no_csv)
+        return
+    from data_preprocessing import run
+    run(input_path=args.input, output_path=args.output, csv_export=not args.no_csv)
+
+def cmd_features(args):
+    from feature_engineering import run
+    run(input_path=args.input, output_path=args.output, csv_export=not args.no_csv)
+
+def cmd_train(args):
+    import train_model
+    if args.model in ("arima", "all") and args.update:
+        from arima_update import update_model_file
+        _, report = update_model_file(input_path=args.input, refit=args.refit)
+        print(f"✅ ARIMA model updated through {report['last_year']} (+{report['appended']} years, "
+              f"{'refitted' if report['refit'] else 'parameters kept'})")
+    elif args.model in ("arima", "all"):
+        train_model.run_arima(input_path=args.input, search=args.search, criterion=args.criterion)
+    if args.model in ("xgboost", "all"):
+        train_model.run_xgboost(input_path=args.input, prune=args.prune, tune=args.tune, n_trials=args.trials,
+                                workers=args.workers)
+    if args.model in ("hybrid", "all"):
+        train_model.run_hybrid(input_path=args.input, method=args.method)
+    if args.publish:
+        from model_registry import publish
+        publish(features_path=args.input)
+
+def cmd_forecast(args):
+    from forecast import run
+    run(results_path=args.output, steps=args.steps, model_version=args.model_version,
+        cleaned_path=None if args.from_features else PATHS["cleaned_data"])
+
+def cmd_backtest(args):
+    from backtest import run
+    run(output_path=args.output, min_train=args.min_train, horizon=args.horizon, max_workers=args.workers)
+
+def parse_importtime(stderr):
+    """Returns [(cumulative microseconds, module)] for top-level imports in -X importtime output."""
+    imports = []
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)", line)
+        if match and not match.group(3):
+            imports.append((int(match.group(2)), match.group(4)))
+    return imports
+
+def cmd_startup(args):
+    """Times each command in a fresh interpreter and lists its slowest top-level imports."""
+    for command in args.commands or STARTUP_COMMANDS:
+        argv = [sys.executable, "-X", "importtime", os.path.abspath(__file__)] + shlex.split(command)
+        runs = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = subprocess.run(argv, capture_output=True, text=True)
+            runs.append(time.perf_counter() - start)
+        imports = sorted(parse_importtime(result.stderr), reverse=True)
+        total = sum(us for us, _ in imports) / 1e6
+        status = "" if result.returncode == 0 else f" (exit {result.returncode})"
+        print(f"⏱️ gdp {command}: best {min(runs):.3f}s of {args.repeat}, imports {total:.3f}s{status}")
+        for us, module in imports[:args.top]:
+            print(f"    {us / 1e6:7.3f}s  {module}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="gdp", description="GDP growth forecasting workflow.")
+    parser.add_argument("--events", help='Write JSON stage events to this file ("-" for stderr)')
+    parser.add_argument("--profile", action="store_true",
+                        help="Write a cProfile dump, folded stacks and allocation sites per stage")
+    parser.add_argument("--profile-dir", default=PATHS["profiles"])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    fetch = sub.add_parser("fetch", help="Fetch indicators from the World Bank, Yahoo and OECD (data.py)")
+    fetch.add_argument("fetch_args", nargs=argparse.REMAINDER, help="Arguments passed through to data.py")
+    fetch.set_defaults(func=cmd_fetch)
+
+    preprocess = sub.add_parser("preprocess", help="Clean and scale the raw indicators")
+    preprocess.add_argument("--input", default=PATHS["raw_data"])
+    preprocess.add_argument("--output", default=PATHS["cleaned_data"])
+    preprocess.add_argument("--no-csv", action="store_true", help="Skip the CSV export")
+    preprocess.add_argument("--chunk-rows", type=int, help="Stream the input in chunks of this many rows")
+    preprocess.add_argument("--entity-col", help="Entity column of a multi-country panel (streams the input)")
+    preprocess.set_defaults(func=cmd_preprocess)
+
+    features = sub.add_parser("features", help="Build the engineered features")
+    features.add_argument("--input", default=PATHS["cleaned_data"])
+    features.add_argument("--output", default=PATHS["features"])
+    features.add_argument("--no-csv", action="store_true", help="Skip the CSV export")
+    features.set_defaults(func=cmd_features)
+
+    train = sub.add_parser("train", help="Train ARIMA, XGBoost and the hybrid")
+    train.add_argument("model", nargs="?", choices=["arima", "xgboost", "hybrid", "all"], default="all")
+    train.add_argument("--input", default=PATHS["features"])
+    train.add_argument("--search", action="store_true", help="Search ARIMA orders")
+    train.add_argument("--criterion", choices=["aic", "bic"], default="aic")
+    train.add_argument("--update", action="store_true",
+                       help="Extend the saved ARIMA model with new years instead of refitting it")
+    train.add_argument("--refit", choices=["never", "drift", "always"], default="drift",
+                       help="With --update: when to re-estimate ARIMA parameters")
+    train.add_argument("--prune", action="store_true", help="Refit XGBoost on pruned features")
+    train.add_argument("--tune", action="store_true", help="Tune XGBoost hyperparameters")
+    train.add_argument("--trials", type=int, default=32)
+    train.add_argument("--workers", type=int)
+    train.add_argument("--method", choices=["weights", "residual"], default="weights",
+                       help="Hybrid stacking: per-horizon weights or XGBoost on ARIMA residuals")
+    train.add_argument("--publish", action="store_true", help="Store the models as a new registry version")
+    train.set_defaults(func=cmd_train)
+
+    forecast = sub.add_parser("forecast", help="Forecast GDP growth with the saved models")
+    forecast.add_argument("--steps", type=int, default=5)
+    forecast.add_argument("--model-version", help='Registry version ("current" or an id); default: the pickles')
+    forecast.add_argument("--from-features", action="store_true",
+                          help="Read the feature artifact instead of computing the model's features")
+    forecast.add_argument("--output", default=PATHS["forecast"])
+    forecast.set_defaults(func=cmd_forecast)
+
+    backtest = sub.add_parser("backtest", help="Walk-forward backtest of the models")
+    backtest.add_argument("--min-train", type=int, default=20)
+    backtest.add_argument("--horizon", type=int, default=5)
+    backtest.add_argument("--workers", type=int)
+    backtest.add_argument("--output", default=PATHS["backtest"])
+    backtest.set_defaults(func=cmd_backtest)
+
+    startup = sub.add_parser("startup", help="Measure startup time and import cost of gdp commands")
+    startup.add_argument("commands", nargs="*", help=f"Quoted commands to time (default: {STARTUP_COMMANDS})")
+    startup.add_argument("--repeat", type=int, default=3)
+    startup.add_argument("--top", type=int, default=8, help="Slowest imports to list per command")
+    startup.set_defaults(func=cmd_startup)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.events or args.profile:
+        from instrumentation import configure
+        configure(events=args.events, profile_dir=args.profile_dir if args.profile else None)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
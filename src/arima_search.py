@@ -0,0 +1,140 @@
+import os
+import time
+import pickle
+import signal
+import hashlib
+import argparse
+import warnings
+import itertools
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from config import PATHS
+
+# Order search settings
+P_VALUES = range(0, 6)
+Q_VALUES = range(0, 3)
+MAX_D = 2
+FIT_TIMEOUT = 60  # Seconds per candidate fit
+CACHE_DIR = os.path.join(os.path.dirname(PATHS["arima_model"]), "arima_search_cache")
+
+def prepare_series(df, target="GDP Growth (%)"):
+    """Returns the target as a yearly PeriodIndex series, as ARIMA training expects."""
+    series = df.set_index("Year")[target]
+    series.index = pd.to_datetime(series.index, format="%Y").to_period("Y")
+    return series
+
+def series_hash(series):
+    """Hashes a series' values and index so cached fits are only reused for identical data."""
+    digest = hashlib.sha256(pd.util.hash_pandas_object(series, index=True).values.tobytes())
+    return digest.hexdigest()[:16]
+
+def is_stationary(series, alpha=0.05):
+    """ADF rejects a unit root and KPSS does not reject stationarity."""
+    from statsmodels.tsa.stattools import adfuller, kpss
+    values = series.dropna()
+    if len(values) < 8 or values.nunique() <= 1:
+        return True
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        adf_p = adfuller(values, autolag="AIC")[1]
+        kpss_p = kpss(values, regression="c", nlags="auto")[1]
+    return adf_p < alpha and kpss_p >= alpha
+
+def choose_d(series, max_d=MAX_D, alpha=0.05):
+    """Smallest differencing order after which the series tests as stationary."""
+    for d in range(max_d + 1):
+        if is_stationary(series, alpha):
+            return d
+        series = series.diff().dropna()
+    return max_d
+
+def candidate_orders(series, p_values=P_VALUES, q_values=Q_VALUES, d=None, max_d=MAX_D):
+    """Builds the (p, d, q) grid, pruned to the tested differencing order and to models
+    small enough to estimate from the available observations."""
+    d = choose_d(series, max_d) if d is None else d
+    n = len(series) - d
+    return [(p, d, q) for p, q in itertools.product(p_values, q_values) if p + q + 2 < n // 3]
+
+def _fit_worker(series, order, timeout):
+    """Fits one candidate in a worker process, giving up after `timeout` seconds where supported."""
+    from statsmodels.tsa.arima.model import ARIMA
+
+    use_alarm = timeout and hasattr(signal, "SIGALRM")
+    start = time.perf_counter()
+    try:
+        # Armed inside the try so an early alarm is still reported as a timeout
+        if use_alarm:
+            def on_timeout(signum, frame):
+                raise TimeoutError
+            signal.signal(signal.SIGALRM, on_timeout)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            result = ARIMA(series, order=order).fit()
+        return {"order": order, "aic": result.aic, "bic": result.bic, "status": "ok",
+                "seconds": time.perf_counter() - start, "result": result}
+    except TimeoutError:
+        return {"order": order, "status": "timeout", "seconds": time.perf_counter() - start}
+    except Exception as e:
+        return {"order": order, "status": f"failed: {e}", "seconds": time.perf_counter() - start}
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+def _cache_path(cache_dir, key, order):
+    return os.path.join(cache_dir, f"{key}_{order[0]}_{order[1]}_{order[2]}.pkl")
+
+def search_orders(series, orders=None, criterion="aic", max_workers=None, timeout=FIT_TIMEOUT, cache_dir=CACHE_DIR):
+    """Fits candidate ARIMA orders in parallel and ranks them by AIC or BIC.
+
+    Fits are cached under cache_dir keyed by series hash and order, so repeated searches
+    only fit new candidates. Returns (ranking DataFrame, best fitted results or None).
+    """
+    orders = orders or candidate_orders(series)
+    key = series_hash(series)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    fits, todo = [], []
+    for order in orders:
+        path = _cache_path(cache_dir, key, order)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                fits.append({**pickle.load(f), "cached": True})
+        else:
+            todo.append(order)
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for fit in executor.map(_fit_worker, [series] * len(todo), todo, [timeout] * len(todo)):
+                fits.append({**fit, "cached": False})
+                if fit["status"] == "ok":
+                    with open(_cache_path(cache_dir, key, fit["order"]), "wb") as f:
+                        pickle.dump(fit, f)
+
+    ranking = pd.DataFrame([{k: v for k, v in fit.items() if k != "result"} for fit in fits])
+    if criterion not in ranking:
+        # No candidates, or none fitted: the caller falls back to its configured order
+        return ranking, None
+    ranking = ranking.sort_values([criterion, "order"], na_position="last", ignore_index=True)
+    best = None
+    if ranking[criterion].notna().any():
+        best_order = ranking.loc[0, "order"]
+        best = next(fit["result"] for fit in fits if fit["order"] == best_order)
+    return ranking, best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search ARIMA (p, d, q) orders for GDP Growth (%).")
+    parser.add_argument("--criterion", choices=["aic", "bic"], default="aic")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--timeout", type=float, default=FIT_TIMEOUT, help="Seconds allowed per fit")
+    args = parser.parse_args()
+
+    from artifact_store import load_frame
+    series = prepare_series(load_frame(PATHS["features"], columns=["Year", "GDP Growth (%)"]))
+    start = time.perf_counter()
+    ranking, best = search_orders(series, criterion=args.criterion, max_workers=args.workers, timeout=args.timeout)
+    print(ranking.to_string(index=False))
+    if best is None:
+        raise SystemExit(f"⚠️ No candidate order could be fitted ({len(ranking)} candidates)")
+    print(f"✅ Best order by {args.criterion.upper()}: {ranking.loc[0, 'order']} "
+          f"({len(ranking)} candidates in {time.perf_counter() - start:.2f}s)")
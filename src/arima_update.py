@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import pickle
+import argparse
+import numpy as np
+import pandas as pd
+from config import PATHS
+
+# Update settings
+TARGET = "GDP Growth (%)"
+DRIFT_Z = 3.0         # Refit when a new one-step-ahead error exceeds this many standard deviations
+DRIFT_RMS = 2.0       # ... or their root mean square does
+REVISION_TOL = 1e-9   # Stored observations that changed by more than this count as revised
+
+def year_index(results):
+    """The fitted model's Year labels (a yearly PeriodIndex)."""
+    return results.fittedvalues.index
+
+def drift_check(results, new_obs, revised=(), z_max=DRIFT_Z, z_rms=DRIFT_RMS):
+    """Standardized one-step-ahead forecast errors of the last `new_obs` observations and of
+    the revised positions (integer locations in the sample).
+
+    Returns (drifted, statistics). The errors come from the Kalman filter pass that was just
+    run, so the check costs nothing extra.
+    """
+    positions = np.union1d(np.asarray(revised, dtype=np.int64), np.arange(results.nobs - new_obs, results.nobs))
+    if not len(positions):
+        return False, {"new_obs": 0}
+    z = np.asarray(results.standardized_forecasts_error)[0, positions]
+    z = z[np.isfinite(z)]
+    stats = {"new_obs": new_obs, "max_abs_z": float(np.abs(z).max()) if len(z) else 0.0,
+             "rms_z": float(np.sqrt(np.mean(z ** 2))) if len(z) else 0.0}
+    return stats["max_abs_z"] > z_max or stats["rms_z"] > z_rms, stats
+
+def update_arima(results, series, refit="drift", z_max=DRIFT_Z, z_rms=DRIFT_RMS):
+    """Brings fitted ARIMA results up to date with `series` (Year-indexed, as prepare_series builds).
+
+    Years after the model's sample are appended and the state-space model is re-filtered with
+    the fitted parameters, one Kalman pass and no MLE. Revised values of years already in the
+    sample are applied the same way. Years missing from `series` are NaN, which the Kalman
+    filter skips, so the index stays contiguous. refit: "never", "drift" (re-estimate from the
+    current parameters only if the new or revised observations fail drift_check) or "always".
+
+    Returns (results, report).
+    """
+    known = year_index(results)
+    stored = pd.Series(np.asarray(results.model.endog, dtype=np.float64).ravel(), index=known)
+    # append() needs an index that continues the model's one, and matches series names
+    years = pd.period_range(known[0], max(series.index.max(), known[-1]), freq=known.freq, name=known.name)
+    series = (series[series.index >= known[0]].reindex(years).combine_first(stored)
+              .rename(getattr(results.model.data.orig_endog, "name", None)))
+    changed = ~np.isclose(series.loc[known].to_numpy(), stored.to_numpy(), rtol=0.0, atol=REVISION_TOL,
+                          equal_nan=True)
+    revised = int(changed.sum())
+    new = series[series.index > known[-1]]
+
+    start = time.perf_counter()
+    if revised:
+        # Earlier values changed: refilter the whole sample with the same parameters
+        updated = results.apply(series)
+    elif len(new):
+        updated = results.append(new)
+    else:
+        updated = results
+    drifted, stats = drift_check(updated, len(new), np.flatnonzero(changed), z_max, z_rms)
+
+    refitted = refit == "always" or (refit == "drift" and drifted)
+    if refitted:
+        from statsmodels.tsa.arima.model import ARIMA
+        model = updated.model
+        updated = ARIMA(series, order=model.order, seasonal_order=model.seasonal_order,
+                        trend=model.trend).fit(start_params=results.params)
+    report = {"first_year": str(known[0]), "last_year": str(year_index(updated)[-1]), "appended": len(new),
+              "revised": revised, "drift": drifted, "refit": refitted, **stats,
+              "seconds": time.perf_counter() - start}
+    return updated, report
+
+def update_state(state, series, refit="drift"):
+    """update_arima for a registry/batch arima.json state; returns (new state, report)."""
+    from model_registry import arima_state, restore_arima
+    updated, report = update_arima(restore_arima(state), series, refit=refit)
+    return arima_state(updated), report
+
+def update_model_file(model_path=PATHS["arima_model"], input_path=PATHS["features"], refit="drift", target=TARGET):
+    """Updates the pickled ARIMA model in place from the latest training data."""
+    from train_model import load_training_data
+    from arima_search import prepare_series
+    with open(model_path, "rb") as f:
+        results = pickle.load(f)
+    updated, report = update_arima(results, prepare_series(load_training_data(input_path), target), refit=refit)
+    if updated is not results:
+        with open(model_path, "wb") as f:
+            pickle.dump(updated, f)
+    return updated, report
+
+def update_batch(panel, output_dir=PATHS["batch_models"], refit="drift", entity_col="Country"):
+    """Updates every batch_training job's arima.json from a panel with the new observations."""
+    from arima_search import prepare_series
+    reports = []
+    groups = dict(tuple(panel.groupby(entity_col, sort=False)))
+    for root, _, files in os.walk(output_dir):
+        if "job.json" not in files:
+            continue
+        with open(os.path.join(root, "job.json")) as f:
+            job = json.load(f)
+        df = groups.get(job["entity"])
+        if df is None or job["target"] not in df:
+            continue
+        series = prepare_series(df[df[job["target"]].notna()], job["target"])
+        with open(os.path.join(root, "arima.json")) as f:
+            state = json.load(f)
+        try:
+            state, report = update_state(state, series, refit=refit)
+        except Exception as e:
+            reports.append({"entity": job["entity"], "target": job["target"], "error": f"{type(e).__name__}: {e}"})
+            continue
+        with open(os.path.join(root, "arima.json"), "w") as f:
+            json.dump(state, f)
+        reports.append({"entity": job["entity"], "target": job["target"], **report})
+    return pd.DataFrame(reports)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extend saved ARIMA models with new observations.")
+    parser.add_argument("--refit", choices=["never", "drift", "always"], default="drift")
+    parser.add_argument("--model", default=PATHS["arima_model"])
+    parser.add_argument("--features", default=PATHS["features"])
+    parser.add_argument("--batch-dir", help="Update batch_training.py artifacts instead of the main model")
+    parser.add_argument("--entity-col", default="Country")
+    args = parser.parse_args()
+
+    if args.batch_dir:
+        from artifact_store import load_frame
+        panel = load_frame(args.features)
+        if args.entity_col not in panel.columns:
+            panel.insert(0, args.entity_col, "IND")  # The single-country artifact
+        reports = update_batch(panel, args.batch_dir, args.refit, args.entity_col)
+        print(reports.to_string(index=False))
+        if len(reports) and "refit" in reports:
+            print(f"✅ Updated {len(reports)} models, {int(reports['refit'].fillna(False).sum())} refitted")
+    else:
+        _, report = update_model_file(args.model, args.features, args.refit)
+        print(json.dumps(report))
+        print(f"✅ ARIMA model updated through {report['last_year']}"
+              f"{' (refitted after drift)' if report['refit'] else ''}")
@@ -0,0 +1,76 @@
+import os
+import json
+import pandas as pd
+
+# Intermediate artifacts are stored as Arrow IPC (Feather v2) files by default: typed,
+# column-addressable and memory-mappable. Parquet and CSV are kept as export options.
+DEFAULT_FORMAT = "arrow"
+FORMATS = {".arrow": "arrow", ".feather": "arrow", ".parquet": "parquet", ".csv": "csv"}
+
+def artifact_format(path):
+    """Returns the storage format implied by a file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Unsupported artifact extension '{ext}' for {path}")
+    return FORMATS[ext]
+
+def with_format(path, fmt):
+    """Returns path with its extension swapped for the given format."""
+    return os.path.splitext(path)[0] + {"arrow": ".arrow", "parquet": ".parquet", "csv": ".csv"}[fmt]
+
+def schema_path(path):
+    return path + ".schema.json"
+
+def save_frame(df, path, csv_export=False):
+    """Saves a DataFrame as a typed artifact, plus a CSV copy when csv_export is set.
+
+    The column dtypes are recorded in a sidecar <path>.schema.json so CSV copies can be read
+    back without type inference.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    df = df.reset_index(drop=True)
+    fmt = artifact_format(path)
+    if fmt == "arrow":
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        # Uncompressed so the file can be memory-mapped without decoding
+        feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), path, compression="uncompressed")
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+    with open(schema_path(path), "w") as f:
+        json.dump({col: str(dtype) for col, dtype in df.dtypes.items()}, f, indent=2)
+
+    if csv_export and fmt != "csv":
+        save_frame(df, with_format(path, "csv"))
+
+def read_schema(path):
+    """Returns the recorded {column: dtype} schema of an artifact, or None if absent."""
+    if not os.path.exists(schema_path(path)):
+        return None
+    with open(schema_path(path)) as f:
+        return json.load(f)
+
+def load_frame(path, columns=None, memory_map=True):
+    """Loads an artifact, reading only the requested columns.
+
+    Arrow files are memory-mapped; CSV files use the recorded schema instead of inferring dtypes.
+    """
+    fmt = artifact_format(path)
+    if fmt == "arrow":
+        import pyarrow.feather as feather
+        table = feather.read_table(path, columns=columns, memory_map=memory_map)
+        return table.to_pandas()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return pq.read_table(path, columns=columns, memory_map=memory_map).to_pandas()
+
+    schema = read_schema(path)
+    dtype = None
+    if schema is not None:
+        wanted = columns if columns is not None else list(schema)
+        dtype = {col: schema[col] for col in wanted if col in schema}
+    df = pd.read_csv(path, usecols=columns, dtype=dtype)
+    return df[columns] if columns is not None else df
@@ -0,0 +1,109 @@
+import io
+import os
+import time
+import argparse
+import contextlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from config import PATHS
+
+# Backtest settings
+MIN_TRAIN = 20   # Observations before the first forecast origin
+HORIZON = 5      # Years ahead scored at each origin
+TARGET = "GDP Growth (%)"
+BACKTEST_FILE = PATHS["backtest"]
+
+# Per-worker state set once by _init_worker instead of being pickled with every origin
+_worker = {}
+
+def _init_worker(df, arima_base, min_train, horizon, xgb_params):
+    from arima_search import prepare_series
+    _worker.update(df=df, series=prepare_series(df), arima_base=arima_base, min_train=min_train,
+                   horizon=horizon, xgb_params=xgb_params)
+
+def _forecast_origin(origin):
+    """Forecasts every model from one origin, using only rows before it."""
+    from xgboost import XGBRegressor
+    from forecast import forecast_arima, forecast_xgboost, forecast_hybrid
+
+    df, series = _worker["df"], _worker["series"]
+    min_train, horizon = _worker["min_train"], _worker["horizon"]
+    history = df.iloc[:origin]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Extend the base ARIMA fit with the observations since its end: one Kalman filter
+        # pass with the fitted parameters instead of a new MLE fit
+        arima_results = _worker["arima_base"]
+        if origin > min_train:
+            arima_results = arima_results.append(series.iloc[min_train:origin])
+        arima_fc = forecast_arima(arima_results, history, steps=horizon)
+
+        X = history.drop(columns=[TARGET, "Year"], errors="ignore")
+        xgb_model = XGBRegressor(**_worker["xgb_params"]).fit(X, history[TARGET])
+        xgb_fc = forecast_xgboost(xgb_model, history, steps=horizon)
+
+        forecasts = forecast_hybrid(arima_fc, xgb_fc)
+
+    forecasts = forecasts.melt(id_vars="Year", var_name="model", value_name="forecast")
+    forecasts["model"] = forecasts["model"].str.extract(r"\((\w+)\)$", expand=False)
+    forecasts["horizon"] = forecasts["Year"] - int(history["Year"].max())
+    forecasts["origin"] = int(history["Year"].max())
+    return forecasts
+
+def run_backtest(df, min_train=MIN_TRAIN, horizon=HORIZON, order=None, xgb_params=None, max_workers=None):
+    """Walk-forward backtest of ARIMA, XGBoost and the hybrid over every origin after min_train.
+
+    Returns (per-forecast detail, error table with RMSE/MAE per model and horizon).
+    """
+    from train_model import ARIMA_ORDER, XGB_PARAMS, train_arima
+
+    df = df.sort_values("Year", ignore_index=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        arima_base = train_arima(df.iloc[:min_train], order=order or ARIMA_ORDER)
+
+    origins = range(min_train, len(df))
+    init_args = (df, arima_base, min_train, horizon, xgb_params or XGB_PARAMS)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=init_args) as executor:
+        detail = pd.concat(executor.map(_forecast_origin, origins), ignore_index=True)
+
+    actuals = df[["Year", TARGET]].rename(columns={TARGET: "actual"})
+    detail = detail.merge(actuals, on="Year", how="inner")
+    detail["error"] = detail["forecast"] - detail["actual"]
+
+    errors = detail.groupby(["model", "horizon"]).agg(
+        rmse=("error", lambda e: float(np.sqrt(np.mean(e ** 2)))),
+        mae=("error", lambda e: float(np.mean(np.abs(e)))),
+        n=("error", "size"),
+    ).reset_index()
+    return detail, errors
+
+def run(input_path=PATHS["features"], output_path=BACKTEST_FILE, min_train=MIN_TRAIN, horizon=HORIZON,
+        max_workers=None, oos_path=PATHS["oos_predictions"]):
+    """Backtests the models on the feature artifact and saves the error table.
+
+    The out-of-sample predictions are also cached as a matrix for the stacking layer.
+    """
+    from artifact_store import load_frame
+    from train_model import clean_data
+    from stacking import oos_matrix, save_oos
+    df = clean_data(load_frame(input_path))
+
+    start = time.perf_counter()
+    detail, errors = run_backtest(df, min_train=min_train, horizon=horizon, max_workers=max_workers)
+    print(errors.to_string(index=False))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    errors.to_csv(output_path, index=False)
+    save_oos(oos_matrix(detail), oos_path)
+    print(f"✅ Backtested {detail['origin'].nunique()} origins in {time.perf_counter() - start:.2f}s; "
+          f"errors saved to {output_path}")
+    return errors
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of the GDP models.")
+    parser.add_argument("--min-train", type=int, default=MIN_TRAIN)
+    parser.add_argument("--horizon", type=int, default=HORIZON)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output", default=BACKTEST_FILE)
+    args = parser.parse_args()
+    run(output_path=args.output, min_train=args.min_train, horizon=args.horizon, max_workers=args.workers)
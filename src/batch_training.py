@@ -0,0 +1,216 @@
+import io
+import os
+import re
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from config import PATHS
+
+# Batch training settings
+OUTPUT_DIR = PATHS["batch_models"]
+SUMMARY_FILE = PATHS["batch_summary"]
+ENTITY = "Country"
+TARGET = "GDP Growth (%)"
+SECTOR_LAGS = [1, 2, 3]   # Sector files hold ~25 annual rows, too short for the 6/12-year lags
+SECTOR_WINDOWS = [3]
+MIN_ROWS = 12             # Jobs with fewer observed target values are skipped
+
+# Per-worker state set once by _init_worker: the memory-mapped matrix and its layout
+_worker = {}
+
+def slug(name):
+    """Directory name for an entity or target: readable, plus a hash of the exact name so
+    names that differ only in punctuation ("GDP Growth (%)", "GDP Growth") never share one."""
+    digest = hashlib.sha1(str(name).encode()).hexdigest()[:8]
+    return f"{re.sub(r'[^A-Za-z0-9]+', '_', str(name)).strip('_')}-{digest}"
+
+def load_sector_files(paths, lags=SECTOR_LAGS, windows=SECTOR_WINDOWS):
+    """Stacks Sectoral_GDP.py outputs (<Sector>_data.csv) into one panel with engineered features.
+
+    Each file is one entity named after its sector; features are built per sector, so
+    columns another sector lacks are NaN and dropped by the worker.
+    """
+    from feature_engine import build_features
+    frames = []
+    for path in paths:
+        df = pd.read_csv(path).sort_values("Year", ignore_index=True)
+        columns = [col for col in df.columns if col != "Year"]
+        df = build_features(df, columns, lags, windows, interactions=False, cyclical=False)
+        df.insert(0, ENTITY, os.path.basename(path).replace("_data.csv", ""))
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+def default_jobs(panel, targets=None, entity_col=ENTITY):
+    """(entity, target) pairs for every target an entity has values for; targets default to
+    GDP Growth (%) if present, else every raw (non-engineered) column."""
+    if not targets:
+        raw = [col for col in panel.columns
+               if col not in (entity_col, "Year") and not re.search(r"_(lag\d+|roll_\w+|growth)$", col)]
+        targets = [TARGET] if TARGET in raw else raw
+    observed = panel.groupby(entity_col, sort=False)[list(targets)].count()
+    return [(entity, target) for entity in observed.index for target in targets if observed.at[entity, target]]
+
+def write_matrix(panel, path, entity_col=ENTITY):
+    """Writes the numeric columns as one float64 .npy file and returns the layout workers need:
+    column names and each entity's contiguous [start, stop) row range."""
+    panel = panel.sort_values([entity_col, "Year"], kind="stable", ignore_index=True)
+    columns = [col for col in panel.columns if col != entity_col]
+    matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(len(panel), len(columns)))
+    for j, col in enumerate(columns):
+        matrix[:, j] = pd.to_numeric(panel[col], errors="coerce").to_numpy(dtype=np.float64)
+    matrix.flush()
+    del matrix
+    codes, entities = pd.factorize(panel[entity_col], sort=False)
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.concatenate([[0], bounds])
+    stops = np.concatenate([bounds, [len(panel)]])
+    ranges = {entity: (int(start), int(stop)) for entity, start, stop in zip(entities, starts, stops)}
+    return columns, ranges
+
+def _init_worker(matrix_path, columns, ranges, threads):
+    """Maps the shared matrix read-only and pins BLAS/OpenMP pools to `threads`."""
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    try:
+        from threadpoolctl import threadpool_limits
+        # Kept alive for the worker's lifetime; also covers pools loaded before the fork
+        _worker["limits"] = threadpool_limits(limits=threads)
+    except ImportError:
+        pass
+    _worker.update(matrix=np.load(matrix_path, mmap_mode="r"), columns=columns, ranges=ranges, threads=threads)
+
+def _train_job(job, order, xgb_params, output_dir):
+    """Fits ARIMA and XGBoost for one (entity, target) and writes its artifacts."""
+    from model_registry import arima_state
+    from train_model import train_arima, train_xgboost, clean_data
+
+    entity, target = job
+    start = time.perf_counter()
+    record = {"entity": entity, "target": target, "pid": os.getpid()}
+    try:
+        lo, hi = _worker["ranges"][entity]
+        # Only this entity's rows are copied out of the shared mapping
+        df = pd.DataFrame(np.array(_worker["matrix"][lo:hi]), columns=_worker["columns"])
+        df = df.dropna(axis=1, how="all")
+        if target not in df.columns or df[target].notna().sum() < MIN_ROWS:
+            record.update(status="skipped", error=f"fewer than {MIN_ROWS} observations of {target}")
+            return record
+        df = df[df[target].notna()].reset_index(drop=True)
+        df["Year"] = df["Year"].astype(int)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = clean_data(df)
+            arima = train_arima(df, order=order, target=target)
+            xgb_model = train_xgboost(df, params={**xgb_params, "n_jobs": _worker["threads"]}, target=target,
+                                      verbose=False)
+
+        job_dir = os.path.join(output_dir, slug(entity), slug(target))
+        os.makedirs(job_dir, exist_ok=True)
+        with open(os.path.join(job_dir, "arima.json"), "w") as f:
+            json.dump(arima_state(arima), f)
+        xgb_model.save_model(os.path.join(job_dir, "xgboost.ubj"))
+        record.update(status="ok", rows=len(df), features=xgb_model.n_features_in_, arima_aic=float(arima.aic),
+                      years=f"{int(df['Year'].min())}-{int(df['Year'].max())}", path=job_dir)
+        with open(os.path.join(job_dir, "job.json"), "w") as f:
+            json.dump({**record, "order": list(order), "xgb_params": xgb_params}, f, indent=2)
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    finally:
+        record["seconds"] = time.perf_counter() - start
+    return record
+
+def run_batch(panel, jobs, output_dir=OUTPUT_DIR, workers=None, order=None, xgb_params=None, entity_col=ENTITY):
+    """Trains every (entity, target) job on a process pool and returns the summary table.
+
+    The panel is written once to a memory-mapped .npy file that every worker maps instead of
+    receiving a pickled copy; each worker gets cpu_count // workers BLAS/xgboost threads.
+    Largest entities are scheduled first to shorten the tail.
+    """
+    from train_model import ARIMA_ORDER, XGB_PARAMS
+    order, xgb_params = tuple(order or ARIMA_ORDER), xgb_params or XGB_PARAMS
+    workers = workers or os.cpu_count() or 1
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    os.makedirs(output_dir, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=output_dir) as tmp_dir:
+        matrix_path = os.path.join(tmp_dir, "panel.npy")
+        columns, ranges = write_matrix(panel, matrix_path, entity_col)
+        rows = {entity: stop - start for entity, (start, stop) in ranges.items()}
+        jobs = sorted(jobs, key=lambda job: -rows.get(job[0], 0))
+        print(f"🚀 {len(jobs)} jobs over {len(ranges)} entities on {workers} workers x {threads} threads "
+              f"({os.path.getsize(matrix_path) / 2 ** 20:.1f} MiB shared matrix)")
+
+        start = time.perf_counter()
+        records = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(matrix_path, columns, ranges, threads)) as executor:
+            futures = [executor.submit(_train_job, job, order, xgb_params, output_dir) for job in jobs]
+            for done, future in enumerate(as_completed(futures), 1):
+                records.append(future.result())
+                if done % max(1, len(jobs) // 10) == 0 or done == len(jobs):
+                    print(f"    {done}/{len(jobs)} jobs done")
+        elapsed = time.perf_counter() - start
+
+    summary = pd.DataFrame(records).sort_values(["entity", "target"], ignore_index=True)
+    counts = summary["status"].value_counts().to_dict()
+    print(f"✅ {counts} in {elapsed:.2f}s ({len(jobs) / elapsed:.1f} jobs/s)")
+    summary.attrs["seconds"] = elapsed
+    return summary
+
+def scaling(panel, jobs, output_dir=OUTPUT_DIR, max_workers=None):
+    """Jobs per second at 1, 2, 4, ... workers up to max_workers (default: every core)."""
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = sorted({min(2 ** i, max_workers) for i in range(max_workers.bit_length() + 1)})
+    rows = []
+    for workers in counts:
+        with contextlib.redirect_stdout(io.StringIO()):
+            seconds = run_batch(panel, jobs, output_dir, workers=workers).attrs["seconds"]
+        rows.append({"workers": workers, "seconds": seconds, "jobs_per_s": len(jobs) / seconds})
+    table = pd.DataFrame(rows)
+    table["speedup"] = table["jobs_per_s"] / table["jobs_per_s"].iloc[0]
+    return table
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train ARIMA + XGBoost for many (entity, target) series in parallel.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--features", default=PATHS["features"], help="Feature artifact with an entity column")
+    source.add_argument("--sector-files", nargs="+", help="Sectoral_GDP.py outputs (<Sector>_data.csv)")
+    parser.add_argument("--entity-col", default=ENTITY)
+    parser.add_argument("--entities", nargs="+", help="Only these entities")
+    parser.add_argument("--targets", nargs="+", help="Target columns (default: GDP Growth (%%), or every raw column)")
+    parser.add_argument("--jobs", help="CSV of entity,target pairs instead of entities x targets")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--order", type=int, nargs=3)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--summary", default=SUMMARY_FILE)
+    parser.add_argument("--scaling", action="store_true", help="Measure throughput at 1, 2, 4, ... workers")
+    args = parser.parse_args()
+
+    if args.sector_files:
+        panel, entity_col = load_sector_files(args.sector_files), ENTITY
+    else:
+        from artifact_store import load_frame
+        panel, entity_col = load_frame(args.features), args.entity_col
+        if entity_col not in panel.columns:
+            panel.insert(0, entity_col, "IND")  # The single-country artifact
+
+    if args.jobs:
+        jobs = list(pd.read_csv(args.jobs).itertuples(index=False, name=None))
+    else:
+        jobs = default_jobs(panel, args.targets, entity_col)
+    if args.entities:
+        jobs = [job for job in jobs if job[0] in set(args.entities)]
+
+    if args.scaling:
+        print(scaling(panel, jobs, args.output_dir, args.workers).to_string(index=False))
+    else:
+        summary = run_batch(panel, jobs, args.output_dir, args.workers, args.order, entity_col=entity_col)
+        os.makedirs(os.path.dirname(args.summary), exist_ok=True)
+        summary.to_csv(args.summary, index=False)
+        print(f"📦 Summary saved to {args.summary}")
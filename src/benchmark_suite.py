@@ -0,0 +1,242 @@
+import io
+import os
+import re
+import sys
+import json
+import time
+import platform
+import argparse
+import contextlib
+import subprocess
+import tracemalloc
+import numpy as np
+import pandas as pd
+from config import PATHS
+
+# Benchmark settings
+HISTORY_FILE = PATHS["benchmark_history"]
+ENTITY = "Country"
+SIZES = {                               # entities, periods, frequency
+    "tiny": (1, 45, "annual"),          # The real dataset's shape
+    "small": (50, 45, "annual"),
+    "medium": (500, 45, "annual"),
+    "monthly": (200, 540, "monthly"),
+    "large": (2000, 540, "monthly"),    # Opt-in: ~1M rows, several GiB of features
+}
+DEFAULT_SIZES = ["tiny", "small", "medium", "monthly"]
+REPEATS = 3
+THRESHOLD = 0.15          # Relative slowdown / memory growth flagged as a regression
+MIN_SECONDS = 0.005       # Ignore timing changes below this; they are noise
+FIRST_YEAR = 1700         # Single-series stages relabel periods as years from here
+
+def synthetic_panel(entities, periods, freq="annual", seed=0, template_path=PATHS["raw_data"]):
+    """Generates a raw indicator panel shaped like the real CSV.
+
+    Each indicator is an AR(1) process around the real column's mean with its standard
+    deviation, per entity; columns that start late in the real data (stock indices, CCI,
+    PMI) are missing for the same leading share of every series. Monthly panels label the
+    periods 1..periods in Year, so the annual code paths run unchanged.
+    """
+    template = pd.read_csv(template_path)
+    template.columns = template.columns.str.strip()
+    columns = [col for col in template.columns if col != "Year"]
+    stats = template[columns].apply(pd.to_numeric, errors="coerce")
+    mean = stats.mean().to_numpy()
+    std = stats.std().fillna(1.0).to_numpy()
+    leading_missing = (stats.notna().to_numpy().argmax(axis=0) / len(template) * periods).astype(int)
+
+    rng = np.random.default_rng(seed)
+    phi = 0.8 if freq == "annual" else 0.97
+    values = np.empty((periods, entities, len(columns)))
+    values[0] = mean + std * rng.standard_normal((entities, len(columns)))
+    shocks = std * np.sqrt(1 - phi ** 2)
+    for t in range(1, periods):
+        values[t] = mean + phi * (values[t - 1] - mean) + shocks * rng.standard_normal((entities, len(columns)))
+    for j, missing in enumerate(leading_missing):
+        values[:missing, :, j] = np.nan
+
+    first = int(template["Year"].min()) if freq == "annual" else 1
+    panel = pd.DataFrame(values.transpose(1, 0, 2).reshape(entities * periods, len(columns)), columns=columns)
+    panel.insert(0, "Year", np.tile(np.arange(first, first + periods), entities))
+    panel.insert(0, ENTITY, np.repeat([f"C{i:04d}" for i in range(entities)], periods))
+    return panel
+
+def single_series(df, entity=None):
+    """One entity's rows with periods relabelled as consecutive years, for the ARIMA and
+    forecasting stages that model a single annual series."""
+    entity = entity or df[ENTITY].iloc[0]
+    series = df[df[ENTITY] == entity].drop(columns=[ENTITY]).reset_index(drop=True)
+    series["Year"] = np.arange(FIRST_YEAR, FIRST_YEAR + len(series))
+    return series
+
+def build_stages():
+    """Returns [(stage, prepare(ctx) -> args, function, ctx key for the result)].
+
+    prepare runs outside the timed region, so copies of inputs a stage mutates are free.
+    """
+    from data_preprocessing import clean_data, scale_features, FEATURES_TO_SCALE
+    from feature_engineering import (INDICATORS, LAGS, WINDOWS, create_lag_features, create_rolling_features,
+                                     create_growth_rate_features, create_interaction_features,
+                                     create_cyclical_features)
+    from feature_engine import build_features
+    from train_model import train_arima, train_xgboost, clean_data as clean_training_data
+    from forecast import forecast_arima, forecast_xgboost
+
+    def features_of(ctx):
+        return ctx["scaled"][[ENTITY, "Year"] + INDICATORS]
+
+    def scale_panel(df, features):
+        # scale_features fills gaps with column means, so the entity labels go around it
+        scaled = scale_features(df.drop(columns=[ENTITY]), features)[0]
+        scaled.insert(0, ENTITY, df[ENTITY].to_numpy())
+        return scaled
+
+    def training_frame(ctx):
+        return clean_training_data(ctx["features"].drop(columns=[ENTITY]).copy())
+
+    return [
+        ("clean_data", lambda c: (c["raw"],), lambda raw: clean_data(raw, entity_col=ENTITY), "cleaned"),
+        ("scale_features", lambda c: (c["cleaned"].copy(), [f for f in FEATURES_TO_SCALE if f in c["cleaned"]]),
+         scale_panel, "scaled"),
+        ("create_lag_features", lambda c: (features_of(c),),
+         lambda df: create_lag_features(df, INDICATORS, LAGS, group_col=ENTITY), None),
+        ("create_rolling_features", lambda c: (features_of(c),),
+         lambda df: create_rolling_features(df, INDICATORS, WINDOWS, group_col=ENTITY), None),
+        ("create_growth_rate_features", lambda c: (features_of(c).copy(),),
+         lambda df: create_growth_rate_features(df, INDICATORS, group_col=ENTITY), None),
+        ("create_interaction_features", lambda c: (features_of(c).copy(),), create_interaction_features, None),
+        ("create_cyclical_features", lambda c: (features_of(c).copy(),), create_cyclical_features, None),
+        ("build_features", lambda c: (features_of(c),),
+         lambda df: build_features(df, INDICATORS, LAGS, WINDOWS, group_col=ENTITY), "features"),
+        ("train_arima", lambda c: (single_series(c["scaled"]),), train_arima, "arima"),
+        ("train_xgboost", lambda c: (training_frame(c),), train_xgboost, "xgb"),
+        ("forecast_arima", lambda c: (c["arima"], single_series(c["scaled"])),
+         lambda model, df: forecast_arima(model, df, steps=5), None),
+        ("forecast_xgboost", lambda c: (c["xgb"], single_series(c["features"])),
+         lambda model, df: forecast_xgboost(model, df, steps=5), None),
+    ]
+
+def measure(prepare, function, ctx, repeats=REPEATS):
+    """Best wall time over `repeats` calls, then one traced call for the Python/numpy peak.
+
+    tracemalloc sees numpy and pandas buffers but not xgboost's or BLAS's native allocations.
+    """
+    times, result = [], None
+    for _ in range(repeats):
+        args = prepare(ctx)
+        start = time.perf_counter()
+        result = function(*args)
+        times.append(time.perf_counter() - start)
+    args = prepare(ctx)
+    tracemalloc.start()
+    function(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rows = len(args[-1]) if isinstance(args[-1], pd.DataFrame) else None
+    return min(times), peak / 2 ** 20, rows, result
+
+def run_suite(sizes=DEFAULT_SIZES, stages=None, repeats=REPEATS, seed=0):
+    """Runs every stage at every size and returns one result dict per (size, stage)."""
+    all_stages = build_stages()
+    results = []
+    for size in sizes:
+        entities, periods, freq = SIZES[size]
+        ctx = {"raw": synthetic_panel(entities, periods, freq, seed)}
+        print(f"📦 {size}: {entities} series x {periods} {freq} periods ({len(ctx['raw']):,} rows)")
+        for name, prepare, function, key in all_stages:
+            with contextlib.redirect_stdout(io.StringIO()):
+                if stages and name not in stages:
+                    # Not recorded, but later stages may need its output
+                    if key:
+                        ctx[key] = function(*prepare(ctx))
+                    continue
+                seconds, peak_mib, rows, result = measure(prepare, function, ctx, repeats)
+            if key:
+                ctx[key] = result
+            results.append({"size": size, "stage": name, "rows": rows, "seconds": seconds, "peak_mib": peak_mib})
+            print(f"    {name:<30} {seconds * 1000:10.1f} ms  {peak_mib:9.1f} MiB")
+    return results
+
+def git_revision():
+    """Short commit hash of the code being measured, with "+dirty" for uncommitted changes."""
+    repo = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=repo, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=repo,
+                               capture_output=True, text=True).stdout.strip()
+        return commit + ("+dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def append_history(results, path=HISTORY_FILE):
+    """Appends one JSON line per suite run."""
+    entry = {"commit": git_revision(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+             "python": platform.python_version(), "machine": platform.machine(), "node": platform.node(),
+             "results": results}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
+
+def load_history(path=HISTORY_FILE):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def find_entry(history, ref):
+    """The latest run whose commit starts with ref, or history[int(ref)] for an index like -2.
+
+    Commit prefixes win: an all-digit ref such as 1234567 is only read as an index when no
+    commit starts with it and it is within the history.
+    """
+    matches = [entry for entry in history if entry["commit"].startswith(ref)]
+    if matches:
+        return matches[-1]
+    if re.fullmatch(r"[+-]?\d+", ref) and -len(history) <= int(ref) < len(history):
+        return history[int(ref)]
+    raise KeyError(f"No benchmark run for commit {ref}")
+
+def compare(base, head, threshold=THRESHOLD, min_seconds=MIN_SECONDS):
+    """Joins two runs on (size, stage) and flags slowdowns or memory growth above threshold."""
+    keys = ["size", "stage"]
+    old = pd.DataFrame(base["results"]).set_index(keys)
+    new = pd.DataFrame(head["results"]).set_index(keys)
+    table = old[["seconds", "peak_mib"]].join(new[["seconds", "peak_mib"]], lsuffix="_base", rsuffix="_head",
+                                              how="inner")
+    table["time_ratio"] = table["seconds_head"] / table["seconds_base"]
+    table["memory_ratio"] = table["peak_mib_head"] / table["peak_mib_base"].clip(lower=1e-9)
+    slower = (table["time_ratio"] > 1 + threshold) & (table["seconds_head"] - table["seconds_base"] > min_seconds)
+    bigger = (table["memory_ratio"] > 1 + threshold) & (table["peak_mib_head"] - table["peak_mib_base"] > 1.0)
+    table["regression"] = np.where(slower & bigger, "time+memory", np.where(slower, "time",
+                                   np.where(bigger, "memory", "")))
+    return table.reset_index()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages on synthetic panels.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="Run the suite and append the results to the history")
+    run_parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=DEFAULT_SIZES)
+    run_parser.add_argument("--stages", nargs="+", help="Only record these stages")
+    run_parser.add_argument("--repeats", type=int, default=REPEATS)
+    run_parser.add_argument("--history", default=HISTORY_FILE)
+    compare_parser = sub.add_parser("compare", help="Compare two runs from the history")
+    compare_parser.add_argument("base", nargs="?", default="-2", help="Commit prefix or history index (default -2)")
+    compare_parser.add_argument("head", nargs="?", default="-1", help="Commit prefix or history index (default -1)")
+    compare_parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    compare_parser.add_argument("--history", default=HISTORY_FILE)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        entry = append_history(run_suite(args.sizes, args.stages, args.repeats), args.history)
+        print(f"✅ Recorded {len(entry['results'])} results for {entry['commit']} in {args.history}")
+    else:
+        history = load_history(args.history)
+        base, head = find_entry(history, args.base), find_entry(history, args.head)
+        table = compare(base, head, args.threshold)
+        print(f"🔎 {base['commit']} ({base['timestamp']}) -> {head['commit']} ({head['timestamp']})")
+        print(table.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+        regressions = table[table["regression"] != ""]
+        if len(regressions):
+            print(f"⚠️ {len(regressions)} regressions above {args.threshold:.0%}")
+            sys.exit(1)
+        print("✅ No regressions")
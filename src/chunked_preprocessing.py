@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+from config import PATHS
+from data_preprocessing import FEATURES_TO_SCALE, parse_percent_columns, scaler_path, save_scaler
+from instrumentation import peak_rss_mib
+
+# Out-of-core preprocessing: the raw CSV is read in chunks of CHUNK_ROWS rows and every
+# stage is a generator, so memory is bounded by a chunk plus per-entity fill state instead
+# of the several full copies clean_data makes. Output matches data_preprocessing.run().
+CHUNK_ROWS = 100_000
+PARTITIONS = 16           # Entity hash partitions used when the input is not ordered by entity and Year
+
+def _keys(chunk, entity_col):
+    """Entity labels of the rows; one constant entity for a single-country file."""
+    return chunk[entity_col] if entity_col else pd.Series(0, index=chunk.index)
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS, entity_col=None):
+    """Yields the raw CSV in chunks, cleaned row by row as clean_data does: stripped column
+    names, numeric Year with missing years dropped, percentages parsed.
+
+    Value columns are float64 in every chunk, so all chunks share one Arrow schema.
+    """
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        chunk.columns = chunk.columns.str.strip()
+        chunk["Year"] = pd.to_numeric(chunk["Year"], errors="coerce")
+        chunk = chunk.dropna(subset=["Year"])
+        parse_percent_columns(chunk)
+        value_columns = [col for col in chunk.columns if col not in (entity_col, "Year")]
+        chunk = chunk.astype({"Year": "int64", **{col: "float64" for col in value_columns}})
+        if entity_col:
+            chunk[entity_col] = chunk[entity_col].astype(str)
+        yield chunk
+
+def scan(chunks, entity_col=None):
+    """One pass over the chunks collecting what the streaming fill needs.
+
+    Returns whether rows are already grouped by entity with Year non-decreasing inside each
+    entity, and each entity's first valid value per column (the target of the backward fill).
+    """
+    ordered, finished, last = True, set(), None
+    firsts, rows = [], 0
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        rows += len(chunk)
+        keys = _keys(chunk, entity_col).to_numpy()
+        years = chunk["Year"].to_numpy()
+        if ordered:
+            starts = np.concatenate([[True], keys[1:] != keys[:-1]])
+            runs = keys[starts]
+            continues = last is not None and runs[0] == last[0]
+            if last is not None and not continues:
+                finished.add(last[0])
+            # Entities appear in one contiguous run each, with Year non-decreasing inside it
+            within = ~starts
+            within[0] = continues
+            previous = np.concatenate([[last[1] if continues else years[0]], years[:-1]])
+            ordered = (len(set(runs)) == len(runs) and finished.isdisjoint(runs[1:] if continues else runs)
+                       and bool(np.all(years[within] >= previous[within])))
+            finished.update(runs[:-1])
+            last = (keys[-1], years[-1])
+        firsts.append(chunk.groupby(_keys(chunk, entity_col), sort=False).first())
+    # Chunk order is file order, so the first non-missing value over the per-chunk firsts wins
+    first_values = pd.concat(firsts).groupby(level=0, sort=False).first() if firsts else None
+    return {"ordered": ordered, "first_values": first_values, "rows": rows}
+
+def fill_chunks(chunks, first_values, entity_col=None):
+    """Forward-fills each entity across chunk boundaries and backward-fills its leading gaps.
+
+    The last filled row is carried into the next chunk, so an entity split over several
+    chunks is filled exactly as if it were read at once. Values still missing after the
+    forward fill precede the entity's first observation and take first_values.
+    """
+    carry = None
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        frame = chunk if carry is None else pd.concat([carry, chunk])
+        keys = _keys(frame, entity_col)
+        value_columns = frame.columns.drop(entity_col) if entity_col else frame.columns
+        filled = frame[value_columns].groupby(keys, sort=False).ffill()
+        leading = first_values.reindex(keys.to_numpy())[value_columns].set_axis(frame.index)
+        filled = filled.fillna(leading)
+        if entity_col:
+            filled.insert(frame.columns.get_loc(entity_col), entity_col, frame[entity_col])
+        out = filled if frame is chunk else filled.iloc[1:]
+        carry = filled.iloc[[-1]]
+        yield out
+
+def partition_chunks(chunks, tmp_dir, entity_col, partitions=PARTITIONS):
+    """Spills rows into entity hash partitions on disk and yields each partition sorted by
+    entity and Year, together with its entities' first valid values.
+
+    Used for inputs that are not ordered; peak memory is one partition (~rows / partitions).
+    A single-country file (no entity_col) is one entity, so it lands in one partition and is
+    sorted by Year in memory.
+    """
+    import pyarrow as pa
+    writers = {}
+    try:
+        for chunk in chunks:
+            bucket = pd.util.hash_array(_keys(chunk, entity_col).to_numpy()) % partitions
+            for part, rows in chunk.groupby(bucket, sort=False):
+                table = pa.Table.from_pandas(rows, preserve_index=False)
+                if part not in writers:
+                    writers[part] = pa.ipc.new_stream(os.path.join(tmp_dir, f"part{part:03d}.arrow"), table.schema)
+                writers[part].write_table(table)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    for part in sorted(writers):
+        path = os.path.join(tmp_dir, f"part{part:03d}.arrow")
+        with pa.memory_map(path) as source:
+            df = pa.ipc.open_stream(source).read_all().to_pandas()
+        os.remove(path)
+        df = df.sort_values([entity_col, "Year"] if entity_col else ["Year"], kind="stable", ignore_index=True)
+        yield df, df.groupby(_keys(df, entity_col), sort=False).first()
+
+def write_chunks(chunks, path, csv_path=None, stats_columns=()):
+    """Appends chunks to one Arrow IPC file (plus an optional CSV) as they arrive.
+
+    Returns the schema sidecar and running count/sum/min/max of stats_columns.
+    """
+    import pyarrow as pa
+    writer, schema, stats, dtypes = None, None, None, None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pa.ipc.new_file(path, schema)
+                dtypes = {col: str(dtype) for col, dtype in chunk.dtypes.items()}
+                if csv_path:
+                    chunk.iloc[:0].to_csv(csv_path, index=False)
+            writer.write_table(table.cast(schema))
+            if csv_path:
+                chunk.to_csv(csv_path, mode="a", header=False, index=False)
+            values = chunk[list(stats_columns)]
+            part = pd.DataFrame({"count": values.count(), "sum": values.sum(), "min": values.min(), "max": values.max()})
+            stats = part if stats is None else pd.DataFrame({
+                "count": stats["count"] + part["count"], "sum": stats["sum"] + part["sum"],
+                "min": np.fmin(stats["min"], part["min"]), "max": np.fmax(stats["max"], part["max"])})
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError(f"No rows with a valid Year to write to {path}")
+    return dtypes, stats
+
+def read_batches(path):
+    """Yields the record batches of an Arrow IPC file as DataFrames, memory-mapped."""
+    import pyarrow as pa
+    with pa.memory_map(path) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i).to_pandas()
+
+def scale_chunks(chunks, means, scaler, features):
+    """scale_features per chunk: remaining gaps take the column means, then MinMax scaling."""
+    for chunk in chunks:
+        chunk = chunk.fillna(means)
+        chunk[features] = scaler.transform(chunk[features])
+        yield chunk
+
+def run(input_path=PATHS["raw_data"], output_path=PATHS["cleaned_data"], entity_col=None, chunk_rows=CHUNK_ROWS,
+        features_to_scale=FEATURES_TO_SCALE, csv_export=True, partitions=PARTITIONS):
+    """Streaming data_preprocessing.run(): clean, fill and scale the raw CSV chunk by chunk.
+
+    Pass 1 scans the input for ordering and first valid values; pass 2 fills it (through
+    entity partitions if it is not ordered) into a temporary Arrow file while accumulating
+    column statistics; pass 3 fills the remaining gaps with column means, scales, and writes
+    the cleaned artifact. Nothing larger than a chunk (or a partition) is held in memory.
+    """
+    from sklearn.preprocessing import MinMaxScaler
+    start = time.perf_counter()
+    info = scan(read_chunks(input_path, chunk_rows, entity_col), entity_col)
+    print(f"🔎 Scanned {info['rows']} rows in chunks of {chunk_rows}: "
+          f"{'ordered by entity and Year' if info['ordered'] else f'unordered, using {partitions} entity partitions'}")
+
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(out_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=out_dir) as tmp_dir:
+        if info["ordered"]:
+            filled = fill_chunks(read_chunks(input_path, chunk_rows, entity_col), info["first_values"], entity_col)
+        else:
+            filled = (chunk for part, firsts in partition_chunks(read_chunks(input_path, chunk_rows, entity_col),
+                                                                 tmp_dir, entity_col, partitions)
+                      for chunk in fill_chunks([part], firsts, entity_col))
+        value_columns = [col for col in info["first_values"].columns if col != entity_col]
+        filled_path = os.path.join(tmp_dir, "filled.arrow")
+        _, stats = write_chunks(filled, filled_path, stats_columns=value_columns)
+
+        # The statistics scale_features would compute on the whole filled frame
+        means = stats["sum"] / stats["count"].where(stats["count"] > 0)
+        features = [col for col in features_to_scale if col in value_columns]
+        scaler = MinMaxScaler().fit(pd.DataFrame([stats["min"][features], stats["max"][features]]))
+
+        csv_path = os.path.splitext(output_path)[0] + ".csv" if csv_export else None
+        dtypes, _ = write_chunks(scale_chunks(read_batches(filled_path), means, scaler, features), output_path, csv_path)
+
+    with open(output_path + ".schema.json", "w") as f:
+        json.dump(dtypes, f, indent=2)
+    if csv_path:
+        with open(csv_path + ".schema.json", "w") as f:
+            json.dump(dtypes, f, indent=2)
+    save_scaler(scaler, features, scaler_path(output_path))
+    peak = peak_rss_mib()
+    print(f"✅ Chunked preprocessing of {info['rows']} rows done in {time.perf_counter() - start:.2f}s"
+          f"{f', peak RSS {peak:.0f} MiB' if peak else ''}. Cleaned data saved at: {output_path}")
+    return output_path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean and scale a raw indicator CSV in bounded memory.")
+    parser.add_argument("--input", default=PATHS["raw_data"])
+    parser.add_argument("--output", default=PATHS["cleaned_data"])
+    parser.add_argument("--entity-col", help="Entity column of a multi-country panel (e.g. Country)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--partitions", type=int, default=PARTITIONS)
+    parser.add_argument("--no-csv", action="store_true", help="Skip the CSV export")
+    args = parser.parse_args()
+    run(args.input, args.output, args.entity_col, args.chunk_rows, csv_export=not args.no_csv,
+        partitions=args.partitions)
@@ -0,0 +1,113 @@
+import io
+import time
+import argparse
+import contextlib
+import numpy as np
+import pandas as pd
+from config import PATHS
+
+# Typing schema applied to frames before they are stored:
+# identifiers become categoricals, numbers stored as text are parsed in one pass, and
+# float64 columns are stored as float32 unless listed in EXACT_COLUMNS or out of range.
+ID_COLUMNS = ["Country", "Indicator"]
+EXACT_COLUMNS = ["Year", "GDP Growth (%)"]   # The ARIMA target keeps full precision
+FLOAT_DTYPE = np.float32
+UNIT_CHARS = r"[%,\s]"                        # Stripped before parsing: percent signs, thousands separators
+MAX_EXACT_INT = 2 ** 24                       # Larger integers are not all representable in float32
+
+def parse_numeric(df, columns):
+    """Converts text columns such as "6.5%" or "1,234" to float, in place and in one pass.
+
+    Columns that are already numeric are left untouched; the text ones are stacked into one
+    array, stripped of UNIT_CHARS with a single vectorized replace and parsed together.
+    """
+    text = [col for col in columns if col in df.columns and not pd.api.types.is_numeric_dtype(df[col])]
+    if not text:
+        return df
+    flat = pd.Series(df[text].to_numpy(dtype=object).ravel(order="F"), dtype="str")
+    values = flat.str.replace(UNIT_CHARS, "", regex=True).to_numpy(dtype=np.float64, na_value=np.nan)
+    parsed = values.reshape(len(df), len(text), order="F")
+    for j, col in enumerate(text):
+        df[col] = parsed[:, j]
+    return df
+
+def fits_float32(values):
+    """True when float32 keeps the column's meaning: finite values stay in range, and
+    integer-valued columns (counts, ids) stay exact."""
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return True
+    largest = np.abs(finite).max()
+    if largest > np.finfo(FLOAT_DTYPE).max:
+        return False
+    return not (largest > MAX_EXACT_INT and np.array_equal(finite, np.round(finite)))
+
+def downcast_floats(df, exclude=EXACT_COLUMNS):
+    """Stores float64 columns as FLOAT_DTYPE where fits_float32 allows.
+
+    Columns that are already narrower (such as build_features output at float32) are not read.
+    """
+    columns = [col for col, dtype in df.dtypes.items() if dtype == np.float64 and col not in exclude
+               and fits_float32(df[col].to_numpy())]
+    return df.astype({col: FLOAT_DTYPE for col in columns}) if columns else df
+
+def categorize(df, columns=ID_COLUMNS):
+    """Stores entity and indicator identifiers as categoricals."""
+    columns = [col for col in columns if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype)]
+    return df.astype({col: "category" for col in columns}) if columns else df
+
+def compact(df, exclude=EXACT_COLUMNS, id_columns=ID_COLUMNS):
+    """Applies the typing schema: categorical identifiers and float32 values."""
+    return downcast_floats(categorize(df, id_columns), exclude)
+
+def frame_mib(df):
+    return df.memory_usage(index=True, deep=True).sum() / 2 ** 20
+
+def memory_report(before, after):
+    """Bytes per dtype before and after compaction, with the total saving."""
+    def by_dtype(df):
+        usage = df.memory_usage(index=False, deep=True)
+        return usage.groupby(df.dtypes.astype(str).to_numpy()).sum() / 2 ** 20
+    report = pd.DataFrame({"before_mib": by_dtype(before), "after_mib": by_dtype(after)}).fillna(0.0)
+    report.loc["total"] = [frame_mib(before), frame_mib(after)]
+    report["ratio"] = report["after_mib"] / report["before_mib"].where(report["before_mib"] > 0)
+    return report
+
+def compare_features(cleaned, verify=False):
+    """Builds the feature matrix at float64 and in the compact layout, reporting memory and
+    build time; with verify, backtests both and compares the model error tables."""
+    from feature_engine import build_features
+    from feature_engineering import INDICATORS, LAGS, WINDOWS
+    results = {}
+    for name, dtype in [("float64", np.float64), ("compact", FLOAT_DTYPE)]:
+        start = time.perf_counter()
+        df = build_features(cleaned, INDICATORS, LAGS, WINDOWS, dtype=dtype)
+        if dtype is FLOAT_DTYPE:
+            df = compact(df)
+        results[name] = (df.dropna(), time.perf_counter() - start)
+    (wide, wide_seconds), (narrow, narrow_seconds) = results["float64"], results["compact"]
+    print(memory_report(wide, narrow).to_string(float_format=lambda x: f"{x:.3f}"))
+    print(f"⏱️ Feature build {wide_seconds:.3f}s -> {narrow_seconds:.3f}s")
+
+    if verify:
+        from backtest import run_backtest
+        from train_model import clean_data
+        tables = {}
+        for name, df in [("float64", wide), ("compact", narrow)]:
+            with contextlib.redirect_stdout(io.StringIO()):
+                tables[name] = run_backtest(clean_data(df.copy()))[1].set_index(["model", "horizon"])
+        diff = tables["compact"][["rmse", "mae"]] - tables["float64"][["rmse", "mae"]]
+        table = tables["float64"][["rmse"]].join(tables["compact"][["rmse"]], lsuffix="_float64", rsuffix="_compact")
+        print(table.join(diff.add_suffix("_diff")).to_string(float_format=lambda x: f"{x:.6f}"))
+        worst = float((diff.abs() / tables["float64"][["rmse", "mae"]]).max().max())
+        print(f"{'✅' if worst < 1e-3 else '⚠️'} Largest relative change in backtest RMSE/MAE: {worst:.2e}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory and accuracy report for the compact dtype layout.")
+    parser.add_argument("--input", default=PATHS["cleaned_data"], help="Cleaned artifact to build features from")
+    parser.add_argument("--verify", action="store_true", help="Backtest float64 and compact features and compare")
+    args = parser.parse_args()
+
+    from artifact_store import load_frame
+    compare_features(load_frame(args.input), verify=args.verify)
@@ -0,0 +1,46 @@
+import os
+import json
+
+# Project layout. Every path can be overridden with a JSON config file or the
+# GDP_PROJECT_ROOT environment variable instead of editing the scripts.
+PROJECT_ROOT = os.environ.get("GDP_PROJECT_ROOT", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_PATHS = {
+    "raw_data": "national_economic_indicators_1980_2024.csv",
+    "cleaned_data": os.path.join("data", "processed", "cleaned_data.arrow"),
+    "features": os.path.join("data", "processed", "feature_engineered.arrow"),
+    "arima_model": os.path.join("models", "arima_model.pkl"),
+    "xgb_model": os.path.join("models", "xgboost_model.pkl"),
+    "hybrid_model": os.path.join("models", "hybrid_model.pkl"),
+    "model_registry": os.path.join("models", "registry"),
+    "batch_models": os.path.join("models", "batch"),
+    "timeseries": os.path.join("data", "timeseries"),
+    "forecast": os.path.join("results", "gdp_forecast.csv"),
+    "backtest": os.path.join("results", "backtest_errors.csv"),
+    "scenarios": os.path.join("results", "gdp_scenarios.csv"),
+    "oos_predictions": os.path.join("results", "oos_predictions.arrow"),
+    "batch_summary": os.path.join("results", "batch_training_summary.csv"),
+    "benchmark_history": os.path.join("results", "benchmark_history.jsonl"),
+    "events": os.path.join("results", "events.jsonl"),
+    "profiles": os.path.join("results", "profiles"),
+    "pipeline_cache": os.path.join(".pipeline", "cache"),
+    "pipeline_state": os.path.join(".pipeline", "state.json"),
+}
+
+def resolve_paths(config_file=None, overrides=None, root=None):
+    """Returns the absolute artifact paths, applying a JSON config file and explicit overrides.
+
+    The config file may set "root" and any key of DEFAULT_PATHS; relative paths are
+    resolved against the root.
+    """
+    paths = dict(DEFAULT_PATHS)
+    if config_file:
+        with open(config_file) as f:
+            config = json.load(f)
+        root = root or config.pop("root", None)
+        paths.update(config)
+    paths.update(overrides or {})
+    root = root or PROJECT_ROOT
+    return {name: path if os.path.isabs(path) else os.path.join(root, path) for name, path in paths.items()}
+
+PATHS = resolve_paths()
@@ -0,0 +1,221 @@
+import io
+import time
+import requests
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from response_cache import make_key
+
+# World Bank API settings
+WB_BASE_URL = "https://api.worldbank.org/v2"
+WB_PER_PAGE = 1000
+REQUEST_TIMEOUT = 30
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+MAX_WORKERS = 8
+COUNTRIES_PER_REQUEST = 50  # Countries joined with ';' in one multi-country query
+PANEL_COLUMNS = ["Country", "Year", "Indicator", "Value"]
+
+def create_session(pool_size=MAX_WORKERS):
+    """Creates a keep-alive HTTP session whose connection pool fits the worker pool."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def request_with_retries(session, url, params=None, headers=None, timeout=REQUEST_TIMEOUT,
+                         retries=MAX_RETRIES, backoff=BACKOFF_FACTOR, latencies=None):
+    """GETs a URL, retrying connection errors and 429/5xx with exponential backoff."""
+    for attempt in range(retries + 1):
+        start = time.perf_counter()
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=timeout)
+            status = response.status_code
+        except (requests.ConnectionError, requests.Timeout):
+            response, status = None, None
+
+        if latencies is not None:
+            latencies.append({"url": url, "params": params, "attempt": attempt + 1,
+                              "status": status, "latency": time.perf_counter() - start})
+
+        retryable = response is None or status == 429 or status >= 500
+        if not retryable:
+            return response
+        if attempt < retries:
+            time.sleep(backoff * (2 ** attempt))
+
+    if response is None:
+        raise requests.ConnectionError(f"Failed to reach {url} after {retries + 1} attempts")
+    return response
+
+def get_json(session, url, params=None, latencies=None, **kwargs):
+    """GETs a JSON document with retries and raises on HTTP errors."""
+    response = request_with_retries(session, url, params=params, latencies=latencies, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+def fetch_world_bank_pages(url, params, cache_key, session, latencies=None, cache=None):
+    """Returns the records of every page of a World Bank API response.
+
+    With a ResponseCache, each page is served from disk while fresh and revalidated once expired.
+    """
+    params = {**params, "page": 1}
+    items = []
+    pages = 1
+    while params["page"] <= pages:
+        page_params = dict(params)
+        if cache is None:
+            data = get_json(session, url, params=page_params, latencies=latencies)
+        else:
+            key = f"{cache_key}|page={page_params['page']}"
+            data = cache.get_json(key, "worldbank", lambda headers: request_with_retries(
+                session, url, params=page_params, headers=headers, latencies=latencies))
+        if not (isinstance(data, list) and len(data) > 1 and isinstance(data[1], list)):
+            break
+        pages = int(data[0].get("pages", 1))
+        items.extend(data[1])
+        params["page"] += 1
+    return items
+
+def fetch_world_bank_data(indicator, country="IND", start_year=1980, end_year=2024, session=None,
+                          base_url=WB_BASE_URL, per_page=WB_PER_PAGE, latencies=None, cache=None):
+    """Fetches one indicator for one country from the World Bank API, following every page."""
+    session = session or create_session(pool_size=1)
+    url = f"{base_url}/country/{country}/indicator/{indicator}"
+    params = {"date": f"{start_year}:{end_year}", "format": "json", "per_page": per_page}
+    items = fetch_world_bank_pages(url, params, make_key("worldbank", indicator, country, start_year, end_year),
+                                   session, latencies=latencies, cache=cache)
+
+    records = [{"Year": int(item["date"]), "Value": item["value"]} for item in items if item["value"] is not None]
+    if not records:
+        return pd.DataFrame(columns=["Year", "Value"])
+    return pd.DataFrame(records).sort_values("Year", ascending=True)
+
+def fetch_indicators(indicators, country="IND", start_year=1980, end_year=2024,
+                     max_workers=MAX_WORKERS, base_url=WB_BASE_URL, latencies=None, cache=None):
+    """Fetches a {name: indicator code} mapping concurrently over one shared session.
+
+    Entries whose code is None are skipped. Returns {name: DataFrame indexed by Year}.
+    """
+    jobs = {name: code for name, code in indicators.items() if code}
+    session = create_session(pool_size=max_workers)
+    data_frames = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(fetch_world_bank_data, code, country, start_year, end_year,
+                                session, base_url, WB_PER_PAGE, latencies, cache): name
+                for name, code in jobs.items()
+            }
+            for future in as_completed(futures):
+                data_frames[futures[future]] = future.result().set_index("Year")
+    finally:
+        session.close()
+
+    # Keep the caller's column order regardless of completion order
+    return {name: data_frames[name] for name in jobs}
+
+def fetch_world_bank_panel(indicator, countries, start_year=1980, end_year=2024, session=None,
+                           base_url=WB_BASE_URL, latencies=None, cache=None, name=None):
+    """Fetches one indicator for many countries in a single multi-country query.
+
+    Returns a long (Country, Year, Indicator, Value) table; Indicator is `name` or the code.
+    """
+    session = session or create_session(pool_size=1)
+    country_list = ";".join(sorted(countries))
+    url = f"{base_url}/country/{country_list}/indicator/{indicator}"
+    # The multi-country endpoint pages over countries x years, so ask for a page size that covers it
+    per_page = max(WB_PER_PAGE, len(countries) * (end_year - start_year + 1))
+    params = {"date": f"{start_year}:{end_year}", "format": "json", "per_page": per_page}
+    items = fetch_world_bank_pages(url, params, make_key("worldbank", indicator, country_list, start_year, end_year),
+                                   session, latencies=latencies, cache=cache)
+
+    records = [
+        {"Country": item.get("countryiso3code") or item["country"]["id"], "Year": int(item["date"]),
+         "Indicator": name or indicator, "Value": item["value"]}
+        for item in items if item["value"] is not None
+    ]
+    return pd.DataFrame(records, columns=PANEL_COLUMNS)
+
+def fetch_panel(indicators, countries, start_year=1980, end_year=2024, max_workers=MAX_WORKERS,
+                base_url=WB_BASE_URL, latencies=None, cache=None, countries_per_request=COUNTRIES_PER_REQUEST):
+    """Fetches a {name: indicator code} mapping for many countries as one long panel.
+
+    Issues one request per indicator per batch of countries rather than one per country.
+    """
+    countries = list(countries)
+    batches = [countries[i:i + countries_per_request] for i in range(0, len(countries), countries_per_request)]
+    jobs = [(name, code, batch) for name, code in indicators.items() if code for batch in batches]
+    session = create_session(pool_size=max_workers)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(
+                lambda job: fetch_world_bank_panel(job[1], job[2], start_year, end_year, session,
+                                                   base_url, latencies, cache, name=job[0]),
+                jobs,
+            ))
+    finally:
+        session.close()
+
+    if not frames:
+        return pd.DataFrame(columns=PANEL_COLUMNS)
+    from compact_types import categorize
+    panel = pd.concat(frames, ignore_index=True)
+    return categorize(panel.sort_values(["Country", "Indicator", "Year"], ignore_index=True))
+
+def fetch_stock_history(ticker, start="1980-01-01", end="2024-12-31", cache=None, retries=MAX_RETRIES,
+                        backoff=BACKOFF_FACTOR):
+    """Fetches the daily Yahoo Finance history for a ticker, served from the cache when fresh.
+
+    yfinance makes its own requests, so errors are retried here with the same backoff as
+    request_with_retries.
+    """
+    def load():
+        import yfinance as yf
+        for attempt in range(retries + 1):
+            try:
+                return yf.Ticker(ticker).history(period="max", start=start, end=end)
+            except Exception:
+                if attempt == retries:
+                    raise
+                time.sleep(backoff * (2 ** attempt))
+
+    if cache is None:
+        return load()
+    return cache.get_or_load(make_key("yahoo", ticker, start=start, end=end), "yahoo", load)
+
+def fetch_stock_closes(ticker, start="1980-01-01", end=None, cache=None):
+    """Daily closing prices of a ticker between start and end, indexed by exchange-local date."""
+    hist = fetch_stock_history(ticker, start=start, end=end, cache=cache)
+    if hist.empty:
+        return pd.Series(dtype="float64", name="Close")
+    closes = hist["Close"]
+    closes.index = closes.index.tz_localize(None) if closes.index.tz is not None else closes.index
+    return closes
+
+def fetch_csv(url, source="oecd", cache=None, session=None, **read_csv_kwargs):
+    """Downloads a CSV document and parses it, revalidating cached copies with ETag/Last-Modified."""
+    session = session or create_session(pool_size=1)
+    if cache is None:
+        response = request_with_retries(session, url)
+        response.raise_for_status()
+        content = response.content
+    else:
+        content = cache.get_content(make_key(source, url), source,
+                                    lambda headers: request_with_retries(session, url, headers=headers))
+    return pd.read_csv(io.BytesIO(content), **read_csv_kwargs)
+
+def summarize_latencies(latencies):
+    """Summarizes recorded request latencies (seconds) into a one-row-per-URL table."""
+    if not latencies:
+        return pd.DataFrame(columns=["url", "requests", "retries", "mean", "p50", "max"])
+    df = pd.DataFrame(latencies)
+    summary = df.groupby("url").agg(
+        requests=("latency", "size"),
+        retries=("attempt", lambda s: int((s > 1).sum())),
+        mean=("latency", "mean"),
+        p50=("latency", "median"),
+        max=("latency", "max"),
+    )
+    return summary.reset_index()
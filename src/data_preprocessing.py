@@ -1,19 +1,58 @@
+import os
+import json
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
+from artifact_store import save_frame
+from compact_types import parse_numeric
+from config import PATHS
+from instrumentation import instrument, log
 
 # Define dataset paths
-DATASET_PATH = r"D:\Projects\GDP_Prediction_Project\national_economic_indicators_1980_2024.csv"
-OUTPUT_PATH = r"D:\Projects\GDP_Prediction_Project\data\processed\cleaned_data.csv"
-
+DATASET_PATH = PATHS["raw_data"]
+OUTPUT_PATH = PATHS["cleaned_data"]
+EXPORT_CSV = True  # Also write cleaned_data.csv for inspection
+
+# Features scaled to [0, 1] before modeling
+FEATURES_TO_SCALE = [
+    'Inflation Rate (%)', 'Interest Rate (%)', 'Exchange Rate (USD/INR)',
+    'Fiscal Deficit (% of GDP)', 'Exports (Billion USD)', 'Imports (Billion USD)',
+    'FDI (Billion USD)', 'Money Supply (M3) Growth (%)', 'Bank Credit Growth (%)',
+    'Unemployment Rate (%)', 'Private Consumption (% of GDP)', 'Fixed Capital Formation (% of GDP)',
+    'Trade Balance (Billion USD)', '^NSEI Close Price', '^BSESN Close Price',
+    'CCI', 'Manufacturing PMI'
+]
+
+# Columns that may arrive as strings with a '%' suffix
+PERCENTAGE_COLUMNS = [
+    'GDP Growth (%)', 'Inflation Rate (%)', 'Money Supply (M3) Growth (%)',
+    'Bank Credit Growth (%)', 'Fiscal Deficit (% of GDP)', 'Private Consumption (% of GDP)',
+    'Fixed Capital Formation (% of GDP)', 'Unemployment Rate (%)'
+]
+
+def parse_percent_columns(df):
+    """Removes '%' symbols and converts the percentage-based columns to float, in place."""
+    return parse_numeric(df, PERCENTAGE_COLUMNS)
+
+@instrument
 def load_data(file_path):
     """Loads dataset from a CSV file and ensures correct column names."""
     df = pd.read_csv(file_path).copy()  # Ensure deep copy to avoid warnings
     df.columns = df.columns.str.strip()  # Remove leading/trailing spaces
-    print("✅ Columns in dataset:", df.columns.tolist())  # Debugging
+    log("✅ Columns in dataset:", df.columns.tolist())  # Debugging
     return df
 
-def clean_data(df):
-    """Handles missing values and ensures data consistency."""
+def pivot_panel(panel, entity_col="Country"):
+    """Turns a long (Country, Year, Indicator, Value) panel into one row per entity and year."""
+    wide = panel.pivot_table(index=[entity_col, "Year"], columns="Indicator", values="Value", aggfunc="last")
+    wide.columns.name = None
+    return wide.reset_index()
+
+@instrument
+def clean_data(df, entity_col=None):
+    """Handles missing values and ensures data consistency.
+
+    With entity_col (e.g. "Country" for a pivoted panel), rows are sorted by entity and year
+    and missing values are filled within each entity only.
+    """
     df = df.copy()  # Ensure we're working on a new copy
 
     # Ensure "Year" is numeric and drop rows where "Year" is missing
@@ -22,25 +61,24 @@ def clean_data(df):
     df.loc[:, "Year"] = df["Year"].astype(int)
 
     # Remove '%' symbols and convert percentage-based columns to float
-    percentage_columns = [
-        'GDP Growth (%)', 'Inflation Rate (%)', 'Money Supply (M3) Growth (%)',
-        'Bank Credit Growth (%)', 'Fiscal Deficit (% of GDP)', 'Private Consumption (% of GDP)',
-        'Fixed Capital Formation (% of GDP)', 'Unemployment Rate (%)'
-    ]
+    parse_percent_columns(df)
 
-    for col in percentage_columns:
-        if col in df.columns:
-            df.loc[:, col] = df[col].astype(str).str.replace('%', '', regex=True).astype(float)
-
-    # Sort data by Year before filling missing values
-    df = df.sort_values("Year").copy()
+    # Sort data by Year (within each entity) before filling missing values
+    sort_keys = [entity_col, "Year"] if entity_col else ["Year"]
+    df = df.sort_values(sort_keys, ignore_index=entity_col is not None).copy()
 
     # Prevent FutureWarning by converting object columns before filling missing values
     df = df.infer_objects(copy=False)
 
     # Forward-fill and backward-fill missing values
-    df.ffill(inplace=True)
-    df.bfill(inplace=True)
+    if entity_col:
+        value_columns = df.columns.drop(entity_col)
+        grouped = df.groupby(entity_col, sort=False)[value_columns]
+        df[value_columns] = grouped.ffill()
+        df[value_columns] = df.groupby(entity_col, sort=False)[value_columns].bfill()
+    else:
+        df.ffill(inplace=True)
+        df.bfill(inplace=True)
 
     # Explicitly re-infer data types after filling
     df = df.infer_objects(copy=False)
@@ -50,8 +88,10 @@ def clean_data(df):
 
     return df
 
+@instrument
 def scale_features(df, features):
     """Scales specified features using MinMaxScaler."""
+    from sklearn.preprocessing import MinMaxScaler
     scaler = MinMaxScaler()
 
     # Convert all feature columns to numeric (fix non-numeric errors)
@@ -66,20 +106,21 @@ def scale_features(df, features):
 
     return df, scaler
 
-if __name__ == "__main__":
-    # Load and clean data
-    df = load_data(DATASET_PATH)
+def scaler_path(output_path):
+    """Scaler parameters file stored next to the cleaned artifact."""
+    return os.path.splitext(output_path)[0] + ".scaler.json"
+
+def save_scaler(scaler, features, path):
+    """Saves the fitted MinMaxScaler as {feature: {"min": ..., "max": ...}}."""
+    params = {col: {"min": float(lo), "max": float(hi)}
+              for col, lo, hi in zip(features, scaler.data_min_, scaler.data_max_)}
+    with open(path, "w") as f:
+        json.dump(params, f, indent=2)
+
+def run(input_path=DATASET_PATH, output_path=OUTPUT_PATH, features_to_scale=FEATURES_TO_SCALE, csv_export=EXPORT_CSV):
+    """Loads, cleans and scales the raw indicators and saves the cleaned artifact."""
+    df = load_data(input_path)
     df = clean_data(df)
-    
-    # Define the features to scale
-    features_to_scale = [
-        'Inflation Rate (%)', 'Interest Rate (%)', 'Exchange Rate (USD/INR)',
-        'Fiscal Deficit (% of GDP)', 'Exports (Billion USD)', 'Imports (Billion USD)',
-        'FDI (Billion USD)', 'Money Supply (M3) Growth (%)', 'Bank Credit Growth (%)',
-        'Unemployment Rate (%)', 'Private Consumption (% of GDP)', 'Fixed Capital Formation (% of GDP)',
-        'Trade Balance (Billion USD)', '^NSEI Close Price', '^BSESN Close Price',
-        'CCI', 'Manufacturing PMI'
-    ]
 
     # Ensure selected features exist in the dataset
     features_to_scale = [col for col in features_to_scale if col in df.columns]
@@ -88,5 +129,10 @@ if __name__ == "__main__":
     df, scaler = scale_features(df, features_to_scale)
 
     # Save cleaned data
-    df.to_csv(OUTPUT_PATH, index=False)
-    print(f"✅ Data preprocessing completed. Cleaned data saved at: {OUTPUT_PATH}")
+    save_frame(df, output_path, csv_export=csv_export)
+    save_scaler(scaler, features_to_scale, scaler_path(output_path))
+    print(f"✅ Data preprocessing completed. Cleaned data saved at: {output_path}")
+    return df
+
+if __name__ == "__main__":
+    run()
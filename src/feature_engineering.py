@@ -1,35 +1,69 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
+from artifact_store import load_frame, save_frame
+from feature_engine import build_features
+from compact_types import FLOAT_DTYPE, compact, frame_mib
+from config import PATHS
+from instrumentation import instrument
 
 # Define dataset paths
-INPUT_FILE = r"D:\Projects\GDP_Prediction_Project\data\processed\cleaned_data.csv"
-OUTPUT_FILE = r"D:\Projects\GDP_Prediction_Project\data\processed\feature_engineered.csv"
+INPUT_FILE = PATHS["cleaned_data"]
+OUTPUT_FILE = PATHS["features"]
+EXPORT_CSV = True  # Also write feature_engineered.csv for inspection
 
-def create_lag_features(df, columns, lags):
-    """Creates lag-based features for time-series modeling."""
+# List of economic indicators for feature engineering
+INDICATORS = [
+    'GDP Growth (%)', 'Inflation Rate (%)', 'Interest Rate (%)',
+    'Exchange Rate (USD/INR)', 'Fiscal Deficit (% of GDP)',
+    'Exports (Billion USD)', 'Imports (Billion USD)', 'FDI (Billion USD)',
+    'Money Supply (M3) Growth (%)', 'Bank Credit Growth (%)',
+    'Unemployment Rate (%)', 'Private Consumption (% of GDP)',
+    'Fixed Capital Formation (% of GDP)', 'Trade Balance (Billion USD)',
+    '^NSEI Close Price', '^BSESN Close Price', 'CCI', 'Manufacturing PMI'
+]
+LAGS = [1, 3, 6, 12]
+WINDOWS = [3, 6, 12]
+
+@instrument
+def create_lag_features(df, columns, lags, group_col=None):
+    """Creates lag-based features for time-series modeling.
+
+    With group_col, lags are taken within each entity (rows must be sorted by entity and year).
+    """
+    source = df.groupby(group_col, sort=False)[columns] if group_col else df[columns]
     lag_dfs = []
     for lag in lags:
-        lag_df = df[columns].shift(lag).add_suffix(f"_lag{lag}")
+        lag_df = source.shift(lag).add_suffix(f"_lag{lag}")
         lag_dfs.append(lag_df)
     return pd.concat([df] + lag_dfs, axis=1)
 
-def create_rolling_features(df, columns, windows):
+@instrument
+def create_rolling_features(df, columns, windows, group_col=None):
     """Creates rolling mean and standard deviation features."""
     roll_dfs = []
     for window in windows:
-        roll_mean_df = df[columns].rolling(window=window, min_periods=1).mean().add_suffix(f"_roll_mean{window}")
-        roll_std_df = df[columns].rolling(window=window, min_periods=1).std().add_suffix(f"_roll_std{window}")
+        if group_col:
+            rolling = df.groupby(group_col, sort=False)[columns].rolling(window=window, min_periods=1)
+            roll_mean_df = rolling.mean().reset_index(level=0, drop=True).add_suffix(f"_roll_mean{window}")
+            roll_std_df = rolling.std().reset_index(level=0, drop=True).add_suffix(f"_roll_std{window}")
+        else:
+            roll_mean_df = df[columns].rolling(window=window, min_periods=1).mean().add_suffix(f"_roll_mean{window}")
+            roll_std_df = df[columns].rolling(window=window, min_periods=1).std().add_suffix(f"_roll_std{window}")
         roll_dfs.extend([roll_mean_df, roll_std_df])
     return pd.concat([df] + roll_dfs, axis=1)
 
-def create_growth_rate_features(df, columns):
+@instrument
+def create_growth_rate_features(df, columns, group_col=None):
     """Computes percentage change for economic indicators."""
-    growth_df = df[columns].pct_change().multiply(100).add_suffix("_growth")
+    source = df.groupby(group_col, sort=False)[columns] if group_col else df[columns]
+    growth_df = source.pct_change().multiply(100).add_suffix("_growth")
     df = pd.concat([df, growth_df], axis=1)
     df.fillna(0, inplace=True)
     return df
 
+@instrument
 def create_interaction_features(df):
     """Creates economic ratios that provide meaningful insights."""
     df["FDI_to_GDP"] = df["FDI (Billion USD)"] / df["GDP Growth (%)"]
@@ -38,45 +72,40 @@ def create_interaction_features(df):
     df.fillna(0, inplace=True)
     return df
 
+@instrument
 def create_cyclical_features(df):
     """Creates cyclical time-based features from the 'Year' column."""
     df["Year_sin"] = np.sin(2 * np.pi * df["Year"] / df["Year"].max())
     df["Year_cos"] = np.cos(2 * np.pi * df["Year"] / df["Year"].max())
     return df
 
-if __name__ == "__main__":
-    df = pd.read_csv(INPUT_FILE)
-
-    # List of economic indicators for feature engineering
-    indicators = [
-        'GDP Growth (%)', 'Inflation Rate (%)', 'Interest Rate (%)',
-        'Exchange Rate (USD/INR)', 'Fiscal Deficit (% of GDP)',
-        'Exports (Billion USD)', 'Imports (Billion USD)', 'FDI (Billion USD)',
-        'Money Supply (M3) Growth (%)', 'Bank Credit Growth (%)',
-        'Unemployment Rate (%)', 'Private Consumption (% of GDP)',
-        'Fixed Capital Formation (% of GDP)', 'Trade Balance (Billion USD)',
-        '^NSEI Close Price', '^BSESN Close Price', 'CCI', 'Manufacturing PMI'
-    ]
-
+def run(input_path=INPUT_FILE, output_path=OUTPUT_FILE, indicators=INDICATORS, lags=LAGS, windows=WINDOWS,
+        csv_export=EXPORT_CSV):
+    """Builds every engineered feature from the cleaned artifact and saves the result."""
+    df = load_frame(input_path)
     print(f"Original data rows: {df.shape[0]}")
 
-    df = create_lag_features(df, indicators, lags=[1, 3, 6, 12])
-    df = create_rolling_features(df, indicators, windows=[3, 6, 12])
-    df = create_growth_rate_features(df, indicators)
-    df = create_interaction_features(df)
-    df = create_cyclical_features(df)
+    # Same features as the create_*_features chain, built in one preallocated matrix
+    # and stored compactly (float32 features, categorical identifiers)
+    df = compact(build_features(df, indicators, lags=lags, windows=windows, dtype=FLOAT_DTYPE))
 
     df.dropna(inplace=True)  # Drop NaN values only at the end
     print(f"Final rows after feature engineering: {df.shape[0]}")
+    narrow = df.select_dtypes(FLOAT_DTYPE).memory_usage(index=False).sum() / 2 ** 20
+    print(f"📦 Feature matrix: {frame_mib(df):.2f} MiB ({frame_mib(df) + narrow:.2f} MiB as float64)")
 
     # Fix: Ensure the file is closed before writing
-    if os.path.exists(OUTPUT_FILE):
+    if os.path.exists(output_path):
         try:
-            os.remove(OUTPUT_FILE)  # Delete the existing file
+            os.remove(output_path)  # Delete the existing file
         except PermissionError:
-            print(f"⚠️ Warning: Cannot delete {OUTPUT_FILE}. Close the file and retry.")
-            exit(1)
+            print(f"⚠️ Warning: Cannot delete {output_path}. Close the file and retry.")
+            sys.exit(1)
 
     # Save feature-engineered dataset
-    df.to_csv(OUTPUT_FILE, index=False)
-    print("✅ Feature Engineering completed. Data saved at:", OUTPUT_FILE)
+    save_frame(df, output_path, csv_export=csv_export)
+    print("✅ Feature Engineering completed. Data saved at:", output_path)
+    return df
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,123 @@
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from feature_engine import INTERACTION_FEATURES, group_ids, shift_into, rolling_mean_std
+
+# One engineered feature: kind is raw, lag, roll_mean, roll_std, growth, ratio or cyclical;
+# source is the indicator (or (numerator, denominator) for ratios); param is the lag/window.
+FeatureSpec = namedtuple("FeatureSpec", ["name", "kind", "source", "param"])
+
+def build_registry(columns, lags, windows):
+    """Declares every feature the feature engine can produce, keyed by column name."""
+    specs = [FeatureSpec(col, "raw", col, None) for col in columns]
+    specs += [FeatureSpec(f"{col}_lag{lag}", "lag", col, lag) for lag in lags for col in columns]
+    for window in windows:
+        specs += [FeatureSpec(f"{col}_roll_mean{window}", "roll_mean", col, window) for col in columns]
+        specs += [FeatureSpec(f"{col}_roll_std{window}", "roll_std", col, window) for col in columns]
+    specs += [FeatureSpec(f"{col}_growth", "growth", col, None) for col in columns]
+    specs += [FeatureSpec(name, "ratio", (num, den), None) for name, num, den in INTERACTION_FEATURES]
+    specs += [FeatureSpec("Year_sin", "cyclical", "Year", np.sin), FeatureSpec("Year_cos", "cyclical", "Year", np.cos)]
+    return {spec.name: spec for spec in specs}
+
+def default_registry():
+    from feature_engineering import INDICATORS, LAGS, WINDOWS
+    return build_registry(INDICATORS, LAGS, WINDOWS)
+
+def model_feature_names(model):
+    """Returns the feature names an XGBoost model (sklearn wrapper or Booster) was trained on."""
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    return list(booster.feature_names or [])
+
+def feature_importances(model, importance_type="gain"):
+    """Returns {feature: importance} for every model feature (0 for features never split on)."""
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    scores = booster.get_score(importance_type=importance_type)
+    return {name: scores.get(name, 0.0) for name in model_feature_names(model)}
+
+def resolve(names, registry):
+    """Maps feature names to specs; names outside the registry are treated as raw columns."""
+    return [registry.get(name, FeatureSpec(name, "raw", name, None)) for name in names]
+
+def compute_features(df, specs, group_col=None):
+    """Computes only the requested features, with the same values build_features would give.
+
+    Returns a frame holding Year (and group_col) plus one column per spec, in spec order.
+    """
+    gid = group_ids(df, group_col)
+    n = len(df)
+    out = {}
+
+    def values_of(cols):
+        return df[list(cols)].to_numpy(dtype=np.float64)
+
+    # Lags: one shift per distinct lag over just the indicators that need it
+    by_param = {}
+    for spec in specs:
+        if spec.kind in ("lag", "roll_mean", "roll_std"):
+            key = ("lag" if spec.kind == "lag" else "roll", spec.param)
+            by_param.setdefault(key, []).append(spec)
+    for (kind, param), group in by_param.items():
+        cols = list(dict.fromkeys(spec.source for spec in group))
+        values = values_of(cols)
+        if kind == "lag":
+            shifted = shift_into(np.empty_like(values), values, param, gid)
+            for spec in group:
+                out[spec.name] = shifted[:, cols.index(spec.source)]
+        else:
+            mean, std = np.empty_like(values), np.empty_like(values)
+            rolling_mean_std(values, param, gid, mean, std)
+            for spec in group:
+                out[spec.name] = (mean if spec.kind == "roll_mean" else std)[:, cols.index(spec.source)]
+
+    growth_specs = [spec for spec in specs if spec.kind == "growth"]
+    if growth_specs:
+        cols = [spec.source for spec in growth_specs]
+        values = values_of(cols)
+        prev = shift_into(np.empty_like(values), values, 1, gid)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            growth = (values / prev - 1) * 100
+        for i, spec in enumerate(growth_specs):
+            out[spec.name] = growth[:, i]
+
+    # Engineered columns get NaN -> 0 like the batch chain; raw inputs are filled too
+    for name in out:
+        out[name] = np.where(np.isnan(out[name]), 0.0, out[name])
+
+    for spec in specs:
+        if spec.kind == "raw":
+            out[spec.name] = df[spec.source].fillna(0).to_numpy()
+        elif spec.kind == "ratio":
+            num, den = (df[col].fillna(0).to_numpy(dtype=np.float64) for col in spec.source)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                ratio = num / den
+            out[spec.name] = np.where(np.isnan(ratio), 0.0, ratio)
+        elif spec.kind == "cyclical":
+            year = df["Year"].to_numpy(dtype=np.float64)
+            out[spec.name] = spec.param(2 * np.pi * year / year.max())
+
+    keys = ["Year"] + ([group_col] if group_col else [])
+    result = df[keys].reset_index(drop=True)
+    features = pd.DataFrame({spec.name: out[spec.name] for spec in specs if spec.name not in keys})
+    return pd.concat([result, features], axis=1)
+
+def prune_features(X, importances, corr_threshold=0.95, min_importance=0.0):
+    """Drops unimportant features, then greedily removes near-duplicates.
+
+    Features are visited from most to least important; one is kept only if its absolute
+    correlation with every feature kept so far is below corr_threshold.
+    """
+    candidates = [name for name, score in sorted(importances.items(), key=lambda kv: -kv[1])
+                  if score > min_importance and name in X.columns]
+    if not candidates:
+        return []
+    values = X[candidates].to_numpy(dtype=np.float64)
+    values = np.where(np.isfinite(values), values, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = np.abs(np.corrcoef(values, rowvar=False))
+    corr = np.nan_to_num(np.atleast_2d(corr), nan=0.0)
+
+    kept = []
+    for i in range(len(candidates)):
+        if all(corr[i, j] < corr_threshold for j in kept):
+            kept.append(i)
+    return [candidates[i] for i in kept]
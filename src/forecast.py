@@ -2,82 +2,163 @@ import pandas as pd
 import pickle
 import numpy as np
 import os
-from statsmodels.tsa.arima.model import ARIMA
+import argparse
+from artifact_store import load_frame
+from config import PATHS
+from feature_registry import default_registry, model_feature_names, resolve, compute_features
+from recursive_forecast import RecursiveForecaster
+from instrumentation import instrument, log
 
 # Define Paths
-DATA_FILE = r"D:\Projects\GDP_Prediction_Project\data\processed\feature_engineered.csv"
-ARIMA_MODEL_PATH = r"D:\Projects\GDP_Prediction_Project\models\arima_model.pkl"
-XGB_MODEL_PATH = r"D:\Projects\GDP_Prediction_Project\models\xgboost_model.pkl"
-RESULTS_FILE = r"D:\Projects\GDP_Prediction_Project\results\gdp_forecast.csv"
+CLEANED_FILE = PATHS["cleaned_data"]
+DATA_FILE = PATHS["features"]
+ARIMA_MODEL_PATH = PATHS["arima_model"]
+XGB_MODEL_PATH = PATHS["xgb_model"]
+HYBRID_MODEL_PATH = PATHS["hybrid_model"]
+RESULTS_FILE = PATHS["forecast"]
 
-# Ensure results directory exists
-RESULTS_DIR = os.path.dirname(RESULTS_FILE)
-os.makedirs(RESULTS_DIR, exist_ok=True)
-
-def load_models():
+def load_models(arima_path=ARIMA_MODEL_PATH, xgb_path=XGB_MODEL_PATH):
     """Loads the trained ARIMA and XGBoost models."""
     print("📥 Loading ARIMA model...")
-    arima_model = pickle.load(open(ARIMA_MODEL_PATH, "rb"))
+    with open(arima_path, "rb") as f:
+        arima_model = pickle.load(f)
     
     print("📥 Loading XGBoost model...")
-    xgb_model = pickle.load(open(XGB_MODEL_PATH, "rb"))
+    with open(xgb_path, "rb") as f:
+        xgb_model = pickle.load(f)
     
     return arima_model, xgb_model
 
+def load_registered_models(version="current", registry_dir=PATHS["model_registry"]):
+    """Loads ARIMA, XGBoost and the stacking ensemble (or None) from a model registry version."""
+    from model_registry import ModelVersion
+    models = ModelVersion(None if version == "current" else version, registry_dir)
+    print(f"📥 Loading model version {models.version}...")
+    return models.arima, models.xgboost, models.ensemble
+
+@instrument
 def forecast_arima(model, df, steps=5):
     """Generates GDP forecasts using the ARIMA model."""
-    print("📈 Forecasting GDP using ARIMA model...")
+    log("📈 Forecasting GDP using ARIMA model...")
 
     # Fix: Ensure year is an integer before converting to string
     last_year = int(df["Year"].max())  
     future_years = pd.date_range(start=str(last_year + 1), periods=steps, freq="YE").year
     
-    forecast = model.predict(start=len(df), end=len(df) + steps - 1)
-    return pd.DataFrame({"Year": future_years, "GDP Growth (%) (ARIMA)": forecast})
+    index = model.fittedvalues.index
+    if isinstance(index, pd.PeriodIndex):
+        # Predict by Year label: the model may end before df does (or after, once updated)
+        forecast = model.predict(start=pd.Period(last_year + 1, freq=index.freq),
+                                 end=pd.Period(last_year + steps, freq=index.freq))
+    else:
+        forecast = model.predict(start=len(df), end=len(df) + steps - 1)
+    return pd.DataFrame({"Year": future_years, "GDP Growth (%) (ARIMA)": np.asarray(forecast)})
 
+@instrument
 def forecast_xgboost(model, df, steps=5):
-    """Generates GDP forecasts using the XGBoost model."""
-    print("📈 Forecasting GDP using XGBoost model...")
-    
-    latest_data = df.drop(columns=['GDP Growth (%)', 'Year'], errors='ignore').iloc[-1:].values
-    predictions = [model.predict(latest_data)[0]]
+    """Generates GDP forecasts using the XGBoost model.
 
-    for _ in range(steps - 1):
-        latest_data = np.roll(latest_data, -1)  
-        predictions.append(model.predict(latest_data)[0])
-    
-    last_year = int(df["Year"].max())  
+    Each step feeds the previous prediction back into the target's lag, rolling and growth
+    features; df must hold Year and the raw indicators the model's features derive from.
+    """
+    log("📈 Forecasting GDP using XGBoost model...")
+
+    predictions = RecursiveForecaster(model).forecast_frame(df, steps)[0]
+
+    last_year = int(df["Year"].max())
     future_years = pd.date_range(start=str(last_year + 1), periods=steps, freq="YE").year
-    
+
     return pd.DataFrame({"Year": future_years, "GDP Growth (%) (XGBoost)": predictions})
 
-def forecast_hybrid(arima_forecast, xgb_forecast):
-    """Combines ARIMA and XGBoost forecasts into a hybrid prediction."""
-    print("⚡ Combining ARIMA and XGBoost predictions into a Hybrid Model...")
+@instrument
+def forecast_hybrid(arima_forecast, xgb_forecast, ensemble=None):
+    """Combines ARIMA and XGBoost forecasts into a hybrid prediction.
+
+    With a fitted stacking ensemble the blend is learned per horizon; otherwise 0.5/0.5.
+    """
+    log("⚡ Combining ARIMA and XGBoost predictions into a Hybrid Model...")
     
     hybrid_forecast = arima_forecast.merge(xgb_forecast, on="Year", how="left")
-    hybrid_forecast["GDP Growth (%) (Hybrid)"] = (
-        0.5 * hybrid_forecast["GDP Growth (%) (ARIMA)"] + 
-        0.5 * hybrid_forecast["GDP Growth (%) (XGBoost)"]
-    )
+    if ensemble is not None:
+        forecasts = {"ARIMA": hybrid_forecast["GDP Growth (%) (ARIMA)"],
+                     "XGBoost": hybrid_forecast["GDP Growth (%) (XGBoost)"]}
+        horizons = np.arange(1, len(hybrid_forecast) + 1)
+        hybrid_forecast["GDP Growth (%) (Hybrid)"] = ensemble.combine(forecasts, horizons)
+    else:
+        hybrid_forecast["GDP Growth (%) (Hybrid)"] = (
+            0.5 * hybrid_forecast["GDP Growth (%) (ARIMA)"] + 
+            0.5 * hybrid_forecast["GDP Growth (%) (XGBoost)"]
+        )
     
     return hybrid_forecast
 
-if __name__ == "__main__":
-    print("📂 Loading dataset...")
-    df = pd.read_csv(DATA_FILE)
-    print(f"✅ Dataset Loaded: {df.shape[0]} rows, {df.shape[1]} columns.")
+def load_ensemble(hybrid_path=HYBRID_MODEL_PATH):
+    """Loads the fitted stacking ensemble, or None for older hybrid artifacts (plain predictions)."""
+    from stacking import StackedEnsemble
+    if not os.path.exists(hybrid_path):
+        return None
+    with open(hybrid_path, "rb") as f:
+        ensemble = pickle.load(f)
+    return ensemble if isinstance(ensemble, StackedEnsemble) else None
+
+def source_columns(xgb_model):
+    """Year, the target and the raw indicators the model's features are derived from."""
+    return ["Year"] + RecursiveForecaster(xgb_model).columns
+
+def load_model_features(xgb_model, cleaned_path=CLEANED_FILE):
+    """Computes just the features the XGBoost model uses, straight from the cleaned data.
 
+    The raw source indicators are kept alongside, as recursive forecasting rebuilds from them.
+    """
+    specs = resolve(model_feature_names(xgb_model), default_registry())
+    cleaned = load_frame(cleaned_path, columns=source_columns(xgb_model))
+    df = compute_features(cleaned, specs)
+    for col in cleaned.columns:
+        if col not in df:
+            df[col] = cleaned[col].to_numpy()
+    return df
+
+def run(data_path=DATA_FILE, arima_path=ARIMA_MODEL_PATH, xgb_path=XGB_MODEL_PATH, results_path=RESULTS_FILE, steps=5,
+        cleaned_path=None, model_version=None, hybrid_path=HYBRID_MODEL_PATH, registry_dir=PATHS["model_registry"]):
+    """Forecasts GDP growth with the saved models and writes the hybrid forecast.
+
+    With cleaned_path, only the features the XGBoost model uses are computed from the cleaned
+    data instead of reading the full feature artifact. With model_version ("current" or a
+    version id), the models come from the model registry instead of the pickles.
+    """
     # Load trained models
-    arima_model, xgb_model = load_models()
+    if model_version:
+        arima_model, xgb_model, ensemble = load_registered_models(model_version, registry_dir)
+    else:
+        arima_model, xgb_model = load_models(arima_path, xgb_path)
+        ensemble = load_ensemble(hybrid_path)
+
+    print("📂 Loading dataset...")
+    feature_names = model_feature_names(xgb_model)
+    if cleaned_path and feature_names:
+        df = load_model_features(xgb_model, cleaned_path)
+    else:
+        # Only read the columns the models use
+        columns = list(dict.fromkeys(source_columns(xgb_model) + feature_names)) if feature_names else None
+        df = load_frame(data_path, columns=columns)
+    print(f"✅ Dataset Loaded: {df.shape[0]} rows, {df.shape[1]} columns.")
 
     # Forecast GDP using ARIMA and XGBoost
-    arima_forecast = forecast_arima(arima_model, df)
-    xgb_forecast = forecast_xgboost(xgb_model, df)
+    arima_forecast = forecast_arima(arima_model, df, steps=steps)
+    xgb_forecast = forecast_xgboost(xgb_model, df, steps=steps)
 
     # Create Hybrid Forecast
-    hybrid_forecast = forecast_hybrid(arima_forecast, xgb_forecast)
+    hybrid_forecast = forecast_hybrid(arima_forecast, xgb_forecast, ensemble=ensemble)
 
     # Save Forecast
-    hybrid_forecast.to_csv(RESULTS_FILE, index=False)
-    print(f"✅ Forecast saved to: {RESULTS_FILE}")
+    os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    hybrid_forecast.to_csv(results_path, index=False)
+    print(f"✅ Forecast saved to: {results_path}")
+    return hybrid_forecast
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Forecast GDP growth with the trained models.")
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--model-version", help='Registry version to use ("current" or an id); default: the pickles')
+    args = parser.parse_args()
+    run(cleaned_path=CLEANED_FILE, steps=args.steps, model_version=args.model_version)
@@ -0,0 +1,356 @@
+import os
+import json
+import time
+import queue
+import hashlib
+import pickle
+import argparse
+import threading
+import collections
+import urllib.parse
+import urllib.request
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import PATHS
+
+# Server settings
+HOST = "127.0.0.1"
+PORT = 8050
+MAX_HORIZON = 30
+BATCH_WINDOW = 0.005     # Seconds the batcher waits for more requests after the first
+MAX_BATCH = 256
+CACHE_SIZE = 1024        # Forecasts kept in the LRU cache
+RELOAD_INTERVAL = 2.0    # Seconds between artifact change checks
+LATENCY_WINDOW = 10000   # Most recent request latencies kept for the percentiles
+
+class ModelStore:
+    """Holds the loaded models and history, reloading them when an artifact file changes.
+
+    A snapshot is replaced as a whole, so requests in flight keep the models they started with.
+    """
+
+    def __init__(self, arima_path=PATHS["arima_model"], xgb_path=PATHS["xgb_model"],
+                 cleaned_path=PATHS["cleaned_data"], hybrid_path=PATHS["hybrid_model"]):
+        self.paths = (arima_path, xgb_path, cleaned_path, hybrid_path)
+        self.snapshot = None
+        self.reload()
+
+    def signature(self):
+        return tuple((os.stat(path).st_mtime_ns, os.stat(path).st_size) if os.path.exists(path) else None
+                     for path in self.paths)
+
+    def reload(self):
+        from artifact_store import load_frame
+        from forecast import source_columns, load_ensemble
+        from recursive_forecast import RecursiveForecaster
+
+        signature = self.signature()
+        arima_path, xgb_path, cleaned_path, hybrid_path = self.paths
+        with open(arima_path, "rb") as f:
+            arima = pickle.load(f)
+        with open(xgb_path, "rb") as f:
+            xgb_model = pickle.load(f)
+        forecaster = RecursiveForecaster(xgb_model)
+        history = load_frame(cleaned_path, columns=source_columns(xgb_model)).sort_values("Year")
+        values = history[forecaster.columns].to_numpy(dtype=np.float64)
+        self.snapshot = {
+            "version": hashlib.sha1(repr(signature).encode()).hexdigest()[:12],
+            "signature": signature,
+            "arima": arima,
+            "forecaster": forecaster,
+            "values": values,
+            "ensemble": load_ensemble(hybrid_path),
+            "last_year": int(history["Year"].max()),
+        }
+        print(f"📦 Loaded models version {self.snapshot['version']}")
+
+    def watch(self, interval=RELOAD_INTERVAL, stop=None):
+        """Polls the artifacts and reloads on change; runs until stop is set."""
+        stop = stop or threading.Event()
+        while not stop.wait(interval):
+            try:
+                if self.signature() != self.snapshot["signature"]:
+                    self.reload()
+            except Exception as e:
+                # An artifact mid-write (truncated pickle, Arrow file or manifest): keep serving
+                # the current models and retry on the next tick, so hot reload never stops
+                print(f"⚠️ Reload skipped: {type(e).__name__}: {e}")
+
+class LRUCache:
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+class Metrics:
+    """Request latencies over a sliding window plus throughput since start."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.latencies = collections.deque(maxlen=window)
+        self.batch_sizes = collections.deque(maxlen=window)
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.requests = 0
+
+    def record(self, seconds):
+        with self.lock:
+            self.latencies.append(seconds)
+            self.requests += 1
+
+    def record_batch(self, size):
+        with self.lock:
+            self.batch_sizes.append(size)
+
+    def summary(self):
+        with self.lock:
+            latencies = np.array(self.latencies) * 1000
+            batches = np.array(self.batch_sizes)
+            requests, uptime = self.requests, time.perf_counter() - self.started
+        return {
+            "requests": requests,
+            "uptime_s": uptime,
+            "throughput_rps": requests / uptime if uptime else 0.0,
+            "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else None,
+            "p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else None,
+            "mean_batch_size": float(batches.mean()) if len(batches) else None,
+        }
+
+class Batcher:
+    """Collects concurrent forecast requests and serves each batch with one predict per step."""
+
+    def __init__(self, store, metrics, window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        self.store, self.metrics = store, metrics
+        self.window, self.max_batch = window, max_batch
+        self.requests = queue.Queue()
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def submit(self, horizon, scenario):
+        future = Future()
+        self.requests.put((horizon, scenario, future))
+        return future
+
+    def _loop(self):
+        while True:
+            batch = [self.requests.get()]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.requests.get(timeout=max(0.0, deadline - time.perf_counter())))
+                except queue.Empty:
+                    break
+            self.metrics.record_batch(len(batch))
+            try:
+                results = self._forecast(self.store.snapshot, batch)
+                for (_, _, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+
+    def _forecast(self, snapshot, batch):
+        forecaster, values = snapshot["forecaster"], snapshot["values"]
+        steps = max(horizon for horizon, _, _ in batch)
+
+        # Each request is one path: its scenario holds indicators at the given levels
+        exog = np.broadcast_to(values[-1], (len(batch), steps, values.shape[1])).copy()
+        for i, (_, scenario, _) in enumerate(batch):
+            for col, level in scenario:
+                exog[i, :, forecaster.columns.index(col)] = level
+        history = np.broadcast_to(values, (len(batch),) + values.shape)
+        xgb_paths = forecaster.forecast_paths(history, steps, exog=exog)
+        arima_path = np.asarray(snapshot["arima"].forecast(steps), dtype=np.float64)
+
+        horizons = np.arange(1, steps + 1)
+        arima_paths = np.broadcast_to(arima_path, xgb_paths.shape)
+        if snapshot["ensemble"] is None:
+            hybrid_paths = 0.5 * arima_paths + 0.5 * xgb_paths
+        else:
+            hybrid_paths = snapshot["ensemble"].combine(
+                {"ARIMA": arima_paths.ravel(), "XGBoost": xgb_paths.ravel()},
+                np.tile(horizons, len(batch))).reshape(xgb_paths.shape)
+
+        results = []
+        for i, (horizon, _, _) in enumerate(batch):
+            years = range(snapshot["last_year"] + 1, snapshot["last_year"] + horizon + 1)
+            results.append({"version": snapshot["version"], "forecast": [
+                {"Year": year, "ARIMA": float(arima_path[h]), "XGBoost": float(xgb_paths[i, h]),
+                 "Hybrid": float(hybrid_paths[i, h])}
+                for h, year in enumerate(years)]})
+        return results
+
+class ForecastService:
+    def __init__(self, store, cache_size=CACHE_SIZE, window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        self.store = store
+        self.cache = LRUCache(cache_size)
+        self.metrics = Metrics()
+        self.batcher = Batcher(store, self.metrics, window, max_batch)
+
+    def parse_scenario(self, scenario):
+        """Canonical, hashable form of {indicator: level}; unknown indicators are rejected."""
+        columns = self.store.snapshot["forecaster"].columns
+        unknown = [col for col in scenario if col not in columns[1:]]
+        if unknown:
+            raise ValueError(f"Unknown scenario indicators: {unknown}")
+        try:
+            return tuple(sorted((col, float(level)) for col, level in scenario.items()))
+        except TypeError:
+            raise ValueError("Scenario levels must be numbers") from None
+
+    def forecast(self, horizon, scenario):
+        start = time.perf_counter()
+        if not 1 <= horizon <= MAX_HORIZON:
+            raise ValueError(f"horizon must be between 1 and {MAX_HORIZON}")
+        scenario = self.parse_scenario(scenario)
+        key = (self.store.snapshot["version"], horizon, scenario)
+        result = self.cache.get(key)
+        if result is None:
+            result = self.batcher.submit(horizon, scenario).result()
+            self.cache.put((result["version"], horizon, scenario), result)
+        self.metrics.record(time.perf_counter() - start)
+        return result
+
+    def stats(self):
+        return {**self.metrics.summary(), "version": self.store.snapshot["version"],
+                "cache_hits": self.cache.hits, "cache_misses": self.cache.misses,
+                "cache_entries": len(self.cache.entries)}
+
+def parse_horizon(value):
+    """A positive integer horizon from a JSON integer or an all-digit query string."""
+    if isinstance(value, str) and value.isdigit():
+        value = int(value)
+    # bool is an int subclass, and floats would be truncated silently
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError("horizon must be a positive integer")
+    return value
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _forecast(self, read_request):
+            """Parses, validates and answers one forecast request; malformed input is a 400."""
+            try:
+                request = read_request()
+                if not isinstance(request, dict):
+                    raise ValueError("Request body must be a JSON object")
+                scenario = request.get("scenario", {})
+                if not isinstance(scenario, dict):
+                    raise ValueError("scenario must be a JSON object of {indicator: level}")
+                horizon = parse_horizon(request.get("horizon", 5))
+                result = service.forecast(horizon, scenario)
+            except ValueError as e:  # Includes json.JSONDecodeError
+                return self._send(400, {"error": str(e)})
+            self._send(200, result)
+
+        def do_GET(self):
+            url = urllib.parse.urlparse(self.path)
+            if url.path == "/forecast":
+                query = urllib.parse.parse_qs(url.query)
+                self._forecast(lambda: {"horizon": query.get("horizon", [5])[0],
+                                        "scenario": json.loads(query.get("scenario", ["{}"])[0])})
+            elif url.path == "/metrics":
+                self._send(200, service.stats())
+            elif url.path == "/health":
+                self._send(200, {"status": "ok", "version": service.store.snapshot["version"]})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if urllib.parse.urlparse(self.path).path != "/forecast":
+                return self._send(404, {"error": "not found"})
+            self._forecast(lambda: json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}"))
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+class ForecastHTTPServer(ThreadingHTTPServer):
+    # The socketserver default backlog of 5 resets connections under concurrent load
+    request_queue_size = 1024
+
+def serve(host=HOST, port=PORT, window=BATCH_WINDOW, max_batch=MAX_BATCH, cache_size=CACHE_SIZE):
+    """Loads the models once and serves forecasts until interrupted."""
+    store = ModelStore()
+    service = ForecastService(store, cache_size, window, max_batch)
+    threading.Thread(target=store.watch, daemon=True).start()
+    server = ForecastHTTPServer((host, port), make_handler(service))
+    print(f"🚀 Forecast server listening on http://{host}:{port} (GET/POST /forecast, GET /metrics)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def load_test(url=f"http://{HOST}:{PORT}", n_requests=2000, concurrency=32, scenarios=50, max_horizon=10, seed=0):
+    """Fires n_requests POST /forecast calls from `concurrency` threads and prints client-side latency."""
+    rng = np.random.default_rng(seed)
+    with urllib.request.urlopen(f"{url}/health") as response:
+        json.load(response)
+    # A fixed pool of scenarios so repeated ones exercise the cache
+    levels = rng.uniform(0, 1, size=scenarios).round(3)
+    bodies = [json.dumps({"horizon": int(rng.integers(1, max_horizon + 1)),
+                          "scenario": {"Inflation Rate (%)": float(levels[rng.integers(scenarios)])}}).encode()
+              for _ in range(n_requests)]
+
+    def call(body):
+        start = time.perf_counter()
+        request = urllib.request.Request(f"{url}/forecast", data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            response.read()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = np.array(list(executor.map(call, bodies))) * 1000
+    elapsed = time.perf_counter() - start
+    print(f"✅ {n_requests} requests in {elapsed:.2f}s ({n_requests / elapsed:,.0f} req/s); "
+          f"client p50 {np.percentile(latencies, 50):.1f} ms, p99 {np.percentile(latencies, 99):.1f} ms")
+    with urllib.request.urlopen(f"{url}/metrics") as response:
+        print(f"🔎 Server metrics: {json.load(response)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Forecast server with warm models, batching and caching.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="Run the forecast server")
+    serve_parser.add_argument("--host", default=HOST)
+    serve_parser.add_argument("--port", type=int, default=PORT)
+    serve_parser.add_argument("--batch-window", type=float, default=BATCH_WINDOW)
+    serve_parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    serve_parser.add_argument("--cache-size", type=int, default=CACHE_SIZE)
+    load_parser = sub.add_parser("load", help="Load-test a running server")
+    load_parser.add_argument("--url", default=f"http://{HOST}:{PORT}")
+    load_parser.add_argument("--requests", type=int, default=2000)
+    load_parser.add_argument("--concurrency", type=int, default=32)
+    load_parser.add_argument("--scenarios", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.host, args.port, args.batch_window, args.max_batch, args.cache_size)
+    else:
+        load_test(args.url, args.requests, args.concurrency, args.scenarios)
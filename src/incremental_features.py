@@ -0,0 +1,133 @@
+import os
+import pickle
+import argparse
+import numpy as np
+import pandas as pd
+from feature_engine import build_features
+from artifact_store import load_frame, save_frame
+from config import PATHS
+
+# Rolling state saved next to the feature artifact
+STATE_FILE = os.path.splitext(PATHS["features"])[0] + ".state.pkl"
+
+class FeatureState:
+    """Compact per-entity state for appending lag/rolling/growth features one period at a time.
+
+    Only the last max(lags + windows) raw observations of each entity are kept (a ring buffer
+    of history); that is everything the lag, rolling and growth features of a new row depend on.
+    New rows must be on the same scale as the history (i.e. transformed with the saved scaler).
+    """
+
+    def __init__(self, columns, lags, windows, group_col=None):
+        self.columns = list(columns)
+        self.lags = list(lags)
+        self.windows = list(windows)
+        self.group_col = group_col
+        self.history = max(self.lags + self.windows)
+        self.tail = None
+        self.year_max = None
+
+    @classmethod
+    def from_frame(cls, df, columns, lags, windows, group_col=None):
+        """Initializes the state from the full history the batch features were built on."""
+        state = cls(columns, lags, windows, group_col)
+        state._advance(df)
+        return state
+
+    def _sort_keys(self):
+        return [self.group_col, "Year"] if self.group_col else ["Year"]
+
+    def _advance(self, rows):
+        combined = rows if self.tail is None else pd.concat([self.tail, rows], ignore_index=True)
+        combined = combined.sort_values(self._sort_keys(), kind="stable", ignore_index=True)
+        if self.group_col:
+            self.tail = combined.groupby(self.group_col, sort=False).tail(self.history).reset_index(drop=True)
+        else:
+            self.tail = combined.tail(self.history).reset_index(drop=True)
+        year_max = rows["Year"].max()
+        self.year_max = year_max if self.year_max is None else max(self.year_max, year_max)
+
+    def update(self, new_rows):
+        """Returns the engineered features for new_rows only and advances the state past them."""
+        new_rows = new_rows.reset_index(drop=True)
+        tail = self.tail.assign(_new=False)
+        combined = pd.concat([tail, new_rows.assign(_new=True)], ignore_index=True)
+        combined = combined.sort_values(self._sort_keys(), kind="stable", ignore_index=True)
+
+        year_max = max(self.year_max, new_rows["Year"].max())
+        is_new = combined.pop("_new").to_numpy()
+        features = build_features(combined, self.columns, self.lags, self.windows,
+                                  group_col=self.group_col, year_max=year_max)
+        self._advance(new_rows)
+        return features[is_new].reset_index(drop=True)
+
+    def save(self, path=STATE_FILE):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path=STATE_FILE):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+def verify_against_batch(df, columns, lags, windows, new_periods=3, group_col=None):
+    """Checks that appending the last `new_periods` years incrementally matches a batch rebuild.
+
+    Year_sin/Year_cos are excluded: they are scaled by the latest Year, so a batch rebuild
+    rescales them for every row while incremental rows keep the scale they were built with.
+    """
+    years = np.sort(df["Year"].unique())
+    cutoff = years[-new_periods - 1]
+    history, new_rows = df[df["Year"] <= cutoff], df[df["Year"] > cutoff]
+
+    state = FeatureState.from_frame(history, columns, lags, windows, group_col)
+    incremental = pd.concat([state.update(new_rows[new_rows["Year"] == year]) for year in years[-new_periods:]],
+                            ignore_index=True)
+
+    batch = build_features(df.sort_values(state._sort_keys(), ignore_index=True), columns, lags, windows,
+                           group_col=group_col)
+    batch = batch[batch["Year"] > cutoff].sort_values(state._sort_keys(), ignore_index=True)
+    incremental = incremental.sort_values(state._sort_keys(), ignore_index=True)
+
+    assert list(batch.columns) == list(incremental.columns), "column layout differs"
+    numeric = batch.select_dtypes("number").columns.drop(["Year_sin", "Year_cos"])
+    np.testing.assert_allclose(incremental[numeric].to_numpy(dtype=float), batch[numeric].to_numpy(dtype=float),
+                               rtol=1e-12, atol=0)
+    print(f"✅ Incremental features for {len(incremental)} new rows match the batch rebuild.")
+    return incremental
+
+def append_rows(new_rows_path, features_path=PATHS["features"], cleaned_path=PATHS["cleaned_data"],
+                state_path=STATE_FILE):
+    """Appends feature rows for newly cleaned observations to the feature artifact."""
+    from feature_engineering import INDICATORS, LAGS, WINDOWS
+
+    if os.path.exists(state_path):
+        state = FeatureState.load(state_path)
+    else:
+        print("🔧 No saved feature state; initializing it from the cleaned data...")
+        state = FeatureState.from_frame(load_frame(cleaned_path), INDICATORS, LAGS, WINDOWS)
+
+    new_rows = load_frame(new_rows_path)
+    new_features = state.update(new_rows)
+    features = load_frame(features_path)
+    # New rows take the artifact's stored dtypes (e.g. float32 features)
+    new_features = new_features[features.columns].astype(features.dtypes.to_dict())
+    save_frame(pd.concat([features, new_features], ignore_index=True), features_path)
+    state.save(state_path)
+    print(f"✅ Appended {len(new_features)} rows of features to {features_path}")
+    return new_features
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Append features for new observations without a full rebuild.")
+    parser.add_argument("new_rows", nargs="?", help="Cleaned artifact (.arrow/.csv) holding only the new rows")
+    parser.add_argument("--verify", action="store_true", help="Check incremental output against a batch rebuild")
+    args = parser.parse_args()
+
+    if args.verify:
+        from feature_engineering import INDICATORS, LAGS, WINDOWS
+        verify_against_batch(load_frame(PATHS["cleaned_data"]), INDICATORS, LAGS, WINDOWS)
+    elif args.new_rows:
+        append_rows(args.new_rows)
+    else:
+        parser.error("pass a new-rows file or --verify")
@@ -0,0 +1,259 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import functools
+from config import PATHS
+
+# Instrumentation is off unless an event sink or a profile directory is configured, either
+# with configure() or through these environment variables (so pipeline and pool workers
+# inherit it). Events are JSON lines; "-" writes them to stderr.
+EVENTS_ENV = "GDP_EVENTS"
+PROFILE_ENV = "GDP_PROFILE"
+EVENTS_FILE = PATHS["events"]
+PROFILE_DIR = PATHS["profiles"]
+TOP_ALLOCATIONS = 10      # Allocation sites kept per profiled stage
+MIN_STACK_SHARE = 1e-4    # Folded stacks below this share of a stage's time are dropped
+MAX_STACK_DEPTH = 64
+
+class _Config:
+    def __init__(self):
+        self.events = os.environ.get(EVENTS_ENV) or None
+        self.profile_dir = os.environ.get(PROFILE_ENV) or None
+        self.enabled = bool(self.events or self.profile_dir)
+        self.lock = threading.Lock()
+
+_config = _Config()
+_local = threading.local()
+_counter = iter(range(sys.maxsize))
+
+def configure(events=None, profile_dir=None):
+    """Turns instrumentation on (or off with no arguments) for this process and its children.
+
+    events: JSON-lines file, or "-" for stderr. profile_dir: write a cProfile dump and
+    folded stacks per stage and record tracemalloc allocation sites in the events; events
+    default to <profile_dir>/events.jsonl.
+    """
+    if profile_dir and not events:
+        events = os.path.join(profile_dir, "events.jsonl")
+    for name, value in ((EVENTS_ENV, events), (PROFILE_ENV, profile_dir)):
+        if value:
+            os.environ[name] = value
+        else:
+            os.environ.pop(name, None)
+    _config.events, _config.profile_dir = events, profile_dir
+    _config.enabled = bool(events or profile_dir)
+
+def enabled():
+    return _config.enabled
+
+def shape_of(value):
+    """[rows, columns] of frames and arrays, [length] of series, else None."""
+    shape = getattr(value, "shape", None)
+    return list(shape) if isinstance(shape, tuple) else None
+
+def peak_rss_mib():
+    """Process high-water resident set size, or None where the resource module is missing."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+def emit(event):
+    """Writes one event as a JSON line to the configured sink."""
+    line = json.dumps(event, default=str)
+    with _config.lock:
+        if _config.events == "-":
+            print(line, file=sys.stderr, flush=True)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(_config.events)), exist_ok=True)
+            with open(_config.events, "a") as f:
+                f.write(line + "\n")
+
+def log(*parts):
+    """Prints a stage message, or records it as a "log" event while instrumentation is on.
+
+    The event names the innermost running stage, so messages line up with its timings. With
+    events on stderr the event line replaces the print instead of repeating it; with an events
+    file the message still goes to the console too.
+    """
+    message = " ".join(map(str, parts))
+    if _config.enabled:
+        stack = getattr(_local, "stack", None)
+        emit({"event": "log", "stage": stack[-1] if stack else None, "pid": os.getpid(),
+              "timestamp": time.time(), "message": message})
+        if _config.events == "-":
+            return
+    print(message)
+
+def _label(func):
+    return f"{func.__module__}.{func.__qualname__}"
+
+def folded_stacks(stats):
+    """Converts pstats data into collapsed stacks ("a;b;c microseconds" per line).
+
+    cProfile records caller -> callee edges rather than whole stacks, so each function's
+    time is split across its callers in proportion to the time spent under each; the
+    result loads in flamegraph.pl, speedscope and inferno like a sampled profile.
+    """
+    def name(func):
+        filename, line, function = func
+        return f"{function} ({os.path.basename(filename)}:{line})" if line else function
+
+    children = {}
+    for callee, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, edge_cumulative) in callers.items():
+            children.setdefault(caller, []).append((callee, edge_cumulative))
+    roots = [func for func, (_, _, _, _, callers) in stats.items() if not callers]
+    total = sum(stats[func][3] for func in roots) or 1.0
+
+    folded = {}
+    def walk(func, stack, share):
+        _, _, own, cumulative, _ = stats[func]
+        if share * cumulative < MIN_STACK_SHARE * total or func in stack or len(stack) >= MAX_STACK_DEPTH:
+            return
+        path = stack + (func,)
+        key = ";".join(map(name, path))
+        folded[key] = folded.get(key, 0.0) + share * own
+        for callee, edge_cumulative in children.get(func, ()):
+            callee_cumulative = stats[callee][3]
+            if callee_cumulative > 0:
+                # Share of the callee's time spent under this path
+                walk(callee, path, share * edge_cumulative / callee_cumulative)
+    for root in roots:
+        walk(root, (), 1.0)
+    return [f"{stack} {int(seconds * 1e6)}" for stack, seconds in folded.items() if seconds * 1e6 >= 1]
+
+class _Profile:
+    """cProfile and tracemalloc around one outermost instrumented call."""
+
+    def __init__(self, label):
+        import cProfile
+        import tracemalloc
+        self.label = label
+        self.tracemalloc = tracemalloc
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        # Enabled and disabled by the wrapper right around the call
+        self.profiler = cProfile.Profile()
+
+    def finish(self, event):
+        _, traced_peak = self.tracemalloc.get_traced_memory()
+        snapshot = self.tracemalloc.take_snapshot()
+        if self.started_tracing:
+            self.tracemalloc.stop()
+        import pstats
+
+        os.makedirs(_config.profile_dir, exist_ok=True)
+        base = os.path.join(_config.profile_dir, f"{self.label}-{os.getpid()}-{next(_counter)}")
+        self.profiler.dump_stats(base + ".prof")
+        with open(base + ".folded", "w") as f:
+            f.write("\n".join(folded_stacks(pstats.Stats(self.profiler).stats)) + "\n")
+
+        sites = snapshot.filter_traces([self.tracemalloc.Filter(False, self.tracemalloc.__file__),
+                                        self.tracemalloc.Filter(False, "<frozen *>")])
+        event["traced_peak_mib"] = traced_peak / 2 ** 20
+        # Memory allocated during the stage and still held when it returned, by source line
+        event["top_allocations"] = [
+            {"site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", "mib": stat.size / 2 ** 20}
+            for stat in sites.statistics("lineno")[:TOP_ALLOCATIONS]
+        ]
+        event["profile"] = base + ".prof"
+        event["folded"] = base + ".folded"
+
+def instrument(func):
+    """Emits a stage event (duration, argument and result shapes, peak RSS) per call.
+
+    When instrumentation is off the wrapper costs one attribute check. In profile mode the
+    outermost instrumented call on each thread is profiled; nested stages still get events.
+    """
+    label = _label(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _config.enabled:
+            return func(*args, **kwargs)
+
+        stack = _local.__dict__.setdefault("stack", [])
+        profile = _Profile(label) if _config.profile_dir and not stack else None
+        rss_before = peak_rss_mib()
+        stack.append(label)
+        event = {"event": "stage", "stage": label, "parent": stack[-2] if len(stack) > 1 else None,
+                 "pid": os.getpid(), "timestamp": time.time(),
+                 "inputs": [shape for shape in map(shape_of, list(args) + list(kwargs.values())) if shape]}
+        if profile:
+            profile.profiler.enable()
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            event["status"] = "ok"
+            outputs = result if isinstance(result, tuple) else (result,)
+            event["outputs"] = [shape for shape in map(shape_of, outputs) if shape]
+            return result
+        except BaseException as exc:
+            event["status"] = "error"
+            event["error"] = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            event["duration_s"] = time.perf_counter() - start
+            if profile:
+                profile.profiler.disable()
+            stack.pop()
+            event["peak_rss_mib"] = peak_rss_mib()
+            if rss_before is not None:
+                # How far this stage pushed the process high-water mark
+                event["peak_rss_growth_mib"] = event["peak_rss_mib"] - rss_before
+            if profile:
+                profile.finish(event)
+            emit(event)
+    return wrapper
+
+def load_events(path=EVENTS_FILE):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def summarize(events):
+    """Per-stage call count, total and mean duration and the largest peak RSS."""
+    import pandas as pd
+    frame = pd.DataFrame([e for e in events if e.get("event") == "stage"])
+    if frame.empty:
+        return frame
+    return (frame.groupby("stage")
+            .agg(calls=("duration_s", "size"), total_s=("duration_s", "sum"), mean_s=("duration_s", "mean"),
+                 peak_rss_mib=("peak_rss_mib", "max"))
+            .sort_values("total_s", ascending=False)
+            .reset_index())
+
+def overhead(calls=1_000_000):
+    """Seconds added per call by a disabled instrument() wrapper."""
+    def noop():
+        return None
+    wrapped = instrument(noop)
+    timings = []
+    for func in (noop, wrapped):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        timings.append(time.perf_counter() - start)
+    return (timings[1] - timings[0]) / calls
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize instrumentation events.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    summary_parser = sub.add_parser("summary", help="Per-stage timing and memory from an events file")
+    summary_parser.add_argument("events", nargs="?", default=EVENTS_FILE)
+    sub.add_parser("overhead", help="Measure the per-call cost of disabled instrumentation")
+    args = parser.parse_args()
+
+    if args.command == "summary":
+        print(summarize(load_events(args.events)).to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    else:
+        configure()
+        print(f"⏱️ Disabled instrumentation adds {overhead() * 1e9:.0f} ns per call")
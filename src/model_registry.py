@@ -0,0 +1,309 @@
+import os
+import gzip
+import json
+import time
+import shutil
+import pickle
+import hashlib
+import argparse
+import functools
+import numpy as np
+import pandas as pd
+from config import PATHS
+
+# Registry layout: <REGISTRY_DIR>/<version>/{manifest.json, arima.json, xgboost.ubj.gz}, plus
+# hybrid.json (and hybrid_residual.ubj.gz) when a stacking ensemble was fitted, and a CURRENT
+# file naming the version forecasts use. Old versions stay for rollback.
+REGISTRY_DIR = PATHS["model_registry"]
+FORMAT_VERSION = 2          # 2: boosters are gzipped UBJSON (version 1 stored plain .ubj)
+GZIP_LEVEL = 6              # Tree dumps shrink ~7x; level 9 saves almost nothing more
+FALLBACK_WEIGHTS = {"ARIMA": 0.5, "XGBoost": 0.5}   # forecast_hybrid's blend without an ensemble
+
+def frame_fingerprint(df):
+    """Hashes a frame's values, index and column names."""
+    digest = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    digest.update("\0".join(map(str, df.columns)).encode())
+    return digest.hexdigest()[:16]
+
+def arima_state(results):
+    """ARIMA as its specification, fitted parameters and the observations the filter reruns on.
+
+    The results pickle also carries the design matrices, filter output and caches; these
+    few numbers rebuild the same forecasts with one Kalman filter pass and no refit.
+    """
+    model = results.model
+    index = results.fittedvalues.index  # The Year PeriodIndex prepare_series built
+    return {
+        "order": list(model.order),
+        "seasonal_order": list(model.seasonal_order),
+        "trend": model.trend,
+        "params": {name: float(value) for name, value in results.params.items()},
+        "start": str(index[0]),
+        "freq": index.freqstr,
+        "endog": np.asarray(model.endog, dtype=np.float64).ravel().tolist(),
+    }
+
+def restore_arima(state, conserve_memory=0):
+    """Rebuilds ARIMA results from arima_state() without re-estimating.
+
+    conserve_memory takes statsmodels' MEMORY_* flags; MEMORY_NO_FILTERED_COV skips the
+    per-period filtered covariances (and their MultiIndex frame), which forecasts, intervals,
+    simulation and append never read.
+    """
+    from statsmodels.tsa.arima.model import ARIMA
+    index = pd.period_range(state["start"], periods=len(state["endog"]), freq=state["freq"], name="Year")
+    series = pd.Series(state["endog"], index=index)
+    model = ARIMA(series, order=tuple(state["order"]), seasonal_order=tuple(state["seasonal_order"]),
+                  trend=state["trend"])
+    # cov_type="none" skips the numerical Hessian; forecasts and simulations do not need it
+    return model.filter(pd.Series(state["params"]), cov_type="none", conserve_memory=conserve_memory)
+
+def save_booster(model, path):
+    """Writes an XGBoost model as gzipped UBJSON."""
+    with gzip.open(path, "wb", compresslevel=GZIP_LEVEL) as f:
+        f.write(model.get_booster().save_raw("ubj"))
+
+def load_booster(path):
+    """Loads an XGBRegressor saved by save_booster (or as plain .ubj by format 1)."""
+    from xgboost import XGBRegressor
+    model = XGBRegressor()
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            model.load_model(bytearray(f.read()))
+    else:
+        model.load_model(path)
+    return model
+
+def ensemble_state(ensemble):
+    """A StackedEnsemble as JSON: method, base models and per-horizon weights.
+
+    A residual ensemble's XGBoost model is stored next to it as hybrid_residual.ubj.gz.
+    """
+    return {
+        "method": ensemble.method,
+        "base": ensemble.base,
+        "params": ensemble.params,
+        "models": list(ensemble.models),
+        "weights": {str(horizon): np.asarray(w, dtype=np.float64).tolist() for horizon, w in ensemble.weights.items()},
+    }
+
+def restore_ensemble(state, residual_path=None):
+    """Rebuilds the StackedEnsemble stored by ensemble_state()."""
+    from stacking import StackedEnsemble
+    ensemble = StackedEnsemble(state["method"], state["base"], state["params"])
+    ensemble.models = state["models"]
+    ensemble.weights = {(key if key == "pooled" else int(key)): np.array(w) for key, w in state["weights"].items()}
+    if residual_path:
+        ensemble.residual_model = load_booster(residual_path)
+    return ensemble
+
+def hybrid_summary(ensemble):
+    """The manifest's record of how the hybrid forecast is blended."""
+    if ensemble is None:
+        return {"method": "fixed", "weights": FALLBACK_WEIGHTS}
+    if ensemble.method == "weights":
+        return {"method": "weights", "weights": dict(zip(ensemble.models, map(float, ensemble.weights["pooled"])))}
+    return {"method": "residual", "base": ensemble.base, "models": list(ensemble.models)}
+
+def current_version(registry_dir=REGISTRY_DIR):
+    path = os.path.join(registry_dir, "CURRENT")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read().strip()
+
+def set_current(version, registry_dir=REGISTRY_DIR):
+    """Points CURRENT at a stored version (atomic, so readers never see a partial name)."""
+    if not os.path.exists(os.path.join(registry_dir, version, "manifest.json")):
+        raise FileNotFoundError(f"No model version {version} in {registry_dir}")
+    tmp_path = os.path.join(registry_dir, "CURRENT.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, os.path.join(registry_dir, "CURRENT"))
+
+def save_version(arima_results, xgb_model, train_df, scaler=None, ensemble=None,
+                 registry_dir=REGISTRY_DIR, make_current=True):
+    """Stores one model version, with the stacking ensemble if one was fitted, and returns its id.
+
+    The version is written to a temporary directory and renamed into place, so a crash
+    never leaves a half-written version behind.
+    """
+    from feature_registry import model_feature_names
+
+    fingerprint = frame_fingerprint(train_df)
+    version = f"{time.strftime('%Y%m%dT%H%M%S')}-{fingerprint[:8]}"
+    final_dir = os.path.join(registry_dir, version)
+    tmp_dir = final_dir + ".tmp"
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    with open(os.path.join(tmp_dir, "arima.json"), "w") as f:
+        json.dump(arima_state(arima_results), f)
+    save_booster(xgb_model, os.path.join(tmp_dir, "xgboost.ubj.gz"))
+    files = {"arima": "arima.json", "xgboost": "xgboost.ubj.gz"}
+    if ensemble is not None:
+        with open(os.path.join(tmp_dir, "hybrid.json"), "w") as f:
+            json.dump(ensemble_state(ensemble), f)
+        files["hybrid"] = "hybrid.json"
+        if ensemble.residual_model is not None:
+            save_booster(ensemble.residual_model, os.path.join(tmp_dir, "hybrid_residual.ubj.gz"))
+            files["hybrid_residual"] = "hybrid_residual.ubj.gz"
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "version": version,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "data_fingerprint": fingerprint,
+        "train_rows": len(train_df),
+        "train_years": [int(train_df["Year"].min()), int(train_df["Year"].max())],
+        "feature_names": model_feature_names(xgb_model),
+        "scaler": scaler or {},
+        "hybrid": hybrid_summary(ensemble),
+        "files": files,
+    }
+    with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(final_dir, ignore_errors=True)
+    os.replace(tmp_dir, final_dir)
+    if make_current:
+        set_current(version, registry_dir)
+    return version
+
+class ModelVersion:
+    """One stored version. Only the manifest is read up front; each model loads on first use."""
+
+    def __init__(self, version=None, registry_dir=REGISTRY_DIR):
+        version = version or current_version(registry_dir)
+        if version is None:
+            raise FileNotFoundError(f"No current model version in {registry_dir}")
+        self.version = version
+        self.path = os.path.join(registry_dir, version)
+        with open(os.path.join(self.path, "manifest.json")) as f:
+            self.manifest = json.load(f)
+
+    @functools.cached_property
+    def arima(self):
+        from statsmodels.tsa.statespace.kalman_filter import MEMORY_NO_FILTERED_COV
+        with open(os.path.join(self.path, self.manifest["files"]["arima"])) as f:
+            return restore_arima(json.load(f), conserve_memory=MEMORY_NO_FILTERED_COV)
+
+    @functools.cached_property
+    def xgboost(self):
+        return load_booster(os.path.join(self.path, self.manifest["files"]["xgboost"]))
+
+    @functools.cached_property
+    def ensemble(self):
+        """The stacking ensemble, or None when the version blends 0.5/0.5."""
+        files = self.manifest["files"]
+        if "hybrid" not in files:
+            return None
+        with open(os.path.join(self.path, files["hybrid"])) as f:
+            state = json.load(f)
+        residual = files.get("hybrid_residual")
+        return restore_ensemble(state, os.path.join(self.path, residual) if residual else None)
+
+def list_versions(registry_dir=REGISTRY_DIR):
+    """Returns the stored versions, oldest first, with the current one flagged."""
+    current = current_version(registry_dir)
+    rows = []
+    if os.path.isdir(registry_dir):
+        for name in sorted(os.listdir(registry_dir)):
+            if name.endswith(".tmp"):
+                continue    # Left by a save_version that crashed before its rename
+            manifest_path = os.path.join(registry_dir, name, "manifest.json")
+            if os.path.exists(manifest_path):
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+                size = sum(os.path.getsize(os.path.join(registry_dir, name, file))
+                           for file in os.listdir(os.path.join(registry_dir, name)))
+                rows.append({"version": name, "current": name == current, "created": manifest["created"],
+                             "data_fingerprint": manifest["data_fingerprint"],
+                             "features": len(manifest["feature_names"]), "bytes": size})
+    return pd.DataFrame(rows)
+
+def prune_versions(keep=5, registry_dir=REGISTRY_DIR):
+    """Deletes all but the newest `keep` versions, never the current one."""
+    versions = list_versions(registry_dir)
+    if versions.empty:
+        return []
+    stale = versions.iloc[:-keep] if keep else versions
+    removed = [v for v in stale.loc[~stale["current"], "version"]]
+    for version in removed:
+        shutil.rmtree(os.path.join(registry_dir, version))
+    return removed
+
+def publish(arima_path=PATHS["arima_model"], xgb_path=PATHS["xgb_model"], features_path=PATHS["features"],
+            cleaned_path=PATHS["cleaned_data"], hybrid_path=PATHS["hybrid_model"], registry_dir=REGISTRY_DIR):
+    """Stores the trained pickled models, and the stacking ensemble saved at hybrid_path if
+    there is one, as a new registry version and makes it current."""
+    from artifact_store import load_frame
+    from data_preprocessing import scaler_path
+    from forecast import load_ensemble
+
+    with open(arima_path, "rb") as f:
+        arima_results = pickle.load(f)
+    with open(xgb_path, "rb") as f:
+        xgb_model = pickle.load(f)
+    scaler = {}
+    if os.path.exists(scaler_path(cleaned_path)):
+        with open(scaler_path(cleaned_path)) as f:
+            scaler = json.load(f)
+    version = save_version(arima_results, xgb_model, load_frame(features_path), scaler=scaler,
+                           ensemble=load_ensemble(hybrid_path), registry_dir=registry_dir)
+    print(f"📦 Published model version {version} to {registry_dir}")
+    return version
+
+def benchmark(arima_path=PATHS["arima_model"], xgb_path=PATHS["xgb_model"], registry_dir=REGISTRY_DIR, repeats=5):
+    """Compares artifact size and load-to-first-forecast time of the pickles and the registry.
+
+    Both sides load both models and make a one-step ARIMA forecast, so the registry's cost of
+    rebuilding the ARIMA results is counted against the pickle's full results object.
+    """
+    # Import the model libraries first so both sides are timed warm
+    import xgboost, statsmodels.tsa.arima.model  # noqa: F401
+
+    def pickles():
+        with open(arima_path, "rb") as f:
+            pickle.load(f).forecast(1)
+        with open(xgb_path, "rb") as f:
+            return pickle.load(f)
+
+    def registry():
+        version = ModelVersion(registry_dir=registry_dir)
+        version.arima.forecast(1)
+        return version.xgboost
+
+    version_dir = os.path.join(registry_dir, current_version(registry_dir))
+    sizes = {"pickle": os.path.getsize(arima_path) + os.path.getsize(xgb_path),
+             "registry": sum(os.path.getsize(os.path.join(version_dir, f)) for f in os.listdir(version_dir))}
+    for name, load in (("pickle", pickles), ("registry", registry)):
+        load()
+        start = time.perf_counter()
+        for _ in range(repeats):
+            load()
+        seconds = (time.perf_counter() - start) / repeats
+        print(f"🔹 {name:<8} {sizes[name] / 1024:8.1f} KiB  load {seconds * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Versioned model registry.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("publish", help="Store the trained models as a new current version")
+    sub.add_parser("list", help="List stored versions")
+    rollback_parser = sub.add_parser("rollback", help="Make an older version current")
+    rollback_parser.add_argument("version")
+    prune_parser = sub.add_parser("prune", help="Delete old versions")
+    prune_parser.add_argument("--keep", type=int, default=5)
+    sub.add_parser("benchmark", help="Compare size and load time with the pickles")
+    args = parser.parse_args()
+
+    if args.command == "publish":
+        publish()
+    elif args.command == "list":
+        print(list_versions().to_string(index=False))
+    elif args.command == "rollback":
+        set_current(args.version)
+        print(f"✅ Current model version is now {args.version}")
+    elif args.command == "prune":
+        print(f"✅ Removed {len(prune_versions(args.keep))} old versions")
+    else:
+        benchmark()
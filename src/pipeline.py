@@ -0,0 +1,282 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import importlib
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from config import resolve_paths
+
+# Stage parameters that feed into each stage's fingerprint
+DEFAULT_PARAMS = {
+    "lags": [1, 3, 6, 12],
+    "windows": [3, 6, 12],
+    "arima_order": (5, 1, 0),
+    "arima_search": False,
+    "xgb_params": {"n_estimators": 100, "learning_rate": 0.1, "max_depth": 5},
+    "prune_features": False,
+    "xgb_tune": False,
+    "xgb_trials": 32,
+    "steps": 5,
+    "backtest_min_train": 20,
+    "backtest_horizon": 5,
+    "hybrid_method": "weights",
+    "csv_export": True,
+}
+
+class Stage:
+    """One pipeline step: a `module.function` called with path and parameter keyword arguments.
+
+    `inputs` and `outputs` are file paths; dependencies between stages are derived from
+    which stage produces which input. `code` lists the modules whose source is fingerprinted.
+    Outputs of a stage that is not `cacheable` are never restored from the cache.
+    """
+
+    def __init__(self, name, target, inputs, outputs, path_args, params=None, code=(), cacheable=True):
+        self.name = name
+        self.cacheable = cacheable
+        self.target = target
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.path_args = dict(path_args)
+        self.params = dict(params or {})
+        self.code = list(code) + [target.split(":")[0]]
+
+def frame_outputs(path, csv_export):
+    """Lists the files save_frame writes for an artifact."""
+    outputs = [path, path + ".schema.json"]
+    if csv_export:
+        csv_path = os.path.splitext(path)[0] + ".csv"
+        outputs += [csv_path, csv_path + ".schema.json"]
+    return outputs
+
+def build_stages(paths, params=None):
+    """Builds the preprocess -> features -> train -> publish -> forecast DAG for the given paths.
+
+    The forecast stage loads the models from the registry version publish made current.
+    """
+    from xgb_tuning import trials_path  # Deferred: xgb_tuning imports xgboost
+    from data_preprocessing import scaler_path
+    current = os.path.join(paths["model_registry"], "CURRENT")
+    p = {**DEFAULT_PARAMS, **(params or {})}
+    return [
+        Stage("preprocess", "data_preprocessing:run",
+              inputs=[paths["raw_data"]],
+              outputs=frame_outputs(paths["cleaned_data"], p["csv_export"]) + [scaler_path(paths["cleaned_data"])],
+              path_args={"input_path": paths["raw_data"], "output_path": paths["cleaned_data"]},
+              params={"csv_export": p["csv_export"]}, code=["artifact_store"]),
+        Stage("features", "feature_engineering:run",
+              inputs=[paths["cleaned_data"]], outputs=frame_outputs(paths["features"], p["csv_export"]),
+              path_args={"input_path": paths["cleaned_data"], "output_path": paths["features"]},
+              params={"lags": p["lags"], "windows": p["windows"], "csv_export": p["csv_export"]},
+              code=["artifact_store", "feature_engine"]),
+        Stage("train_arima", "train_model:run_arima",
+              inputs=[paths["features"]], outputs=[paths["arima_model"]],
+              path_args={"input_path": paths["features"], "model_path": paths["arima_model"]},
+              params={"order": tuple(p["arima_order"]), "search": p["arima_search"]},
+              code=["artifact_store", "arima_search"]),
+        Stage("train_xgboost", "train_model:run_xgboost",
+              inputs=[paths["features"]],
+              outputs=[paths["xgb_model"]] + ([trials_path(paths["xgb_model"])] if p["xgb_tune"] else []),
+              path_args={"input_path": paths["features"], "model_path": paths["xgb_model"]},
+              params={"params": p["xgb_params"], "prune": p["prune_features"], "tune": p["xgb_tune"],
+                      "n_trials": p["xgb_trials"]},
+              code=["artifact_store", "feature_registry", "xgb_tuning"]),
+        Stage("train_hybrid", "train_model:run_hybrid",
+              inputs=[paths["oos_predictions"]], outputs=[paths["hybrid_model"]],
+              path_args={"oos_path": paths["oos_predictions"], "hybrid_path": paths["hybrid_model"]},
+              params={"method": p["hybrid_method"]}, code=["artifact_store", "stacking"]),
+        # CURRENT names a version directory, so restoring it from the cache could point at a pruned version
+        Stage("publish", "model_registry:publish",
+              inputs=[paths["arima_model"], paths["xgb_model"], paths["features"], scaler_path(paths["cleaned_data"]),
+                      paths["hybrid_model"]],
+              outputs=[current],
+              path_args={"arima_path": paths["arima_model"], "xgb_path": paths["xgb_model"],
+                         "features_path": paths["features"], "cleaned_path": paths["cleaned_data"],
+                         "hybrid_path": paths["hybrid_model"], "registry_dir": paths["model_registry"]},
+              code=["artifact_store", "feature_registry", "stacking"], cacheable=False),
+        Stage("forecast", "forecast:run",
+              inputs=[paths["cleaned_data"], paths["features"], current],
+              outputs=[paths["forecast"]],
+              path_args={"data_path": paths["features"], "cleaned_path": paths["cleaned_data"],
+                         "registry_dir": paths["model_registry"], "results_path": paths["forecast"]},
+              params={"steps": p["steps"], "model_version": "current"},
+              code=["artifact_store", "feature_engine", "feature_registry", "recursive_forecast", "stacking",
+                    "model_registry"]),
+        Stage("backtest", "backtest:run",
+              inputs=[paths["features"]], outputs=[paths["backtest"]] + frame_outputs(paths["oos_predictions"], False),
+              path_args={"input_path": paths["features"], "output_path": paths["backtest"],
+                         "oos_path": paths["oos_predictions"]},
+              params={"min_train": p["backtest_min_train"], "horizon": p["backtest_horizon"]},
+              code=["artifact_store", "train_model", "forecast", "arima_search", "recursive_forecast", "stacking"]),
+    ]
+
+def stage_dependencies(stages):
+    """Maps each stage name to the names of the stages producing its inputs."""
+    producers = {output: stage.name for stage in stages for output in stage.outputs}
+    return {stage.name: {producers[i] for i in stage.inputs if i in producers} for stage in stages}
+
+def file_hash(path, _memo={}):
+    """SHA-256 of a file's contents, memoized on (path, size, mtime)."""
+    st = os.stat(path)
+    key = (path, st.st_size, st.st_mtime_ns)
+    if key not in _memo:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _memo[key] = digest.hexdigest()
+    return _memo[key]
+
+def stage_fingerprint(stage):
+    """Hashes a stage's input data, source code and parameters."""
+    digest = hashlib.sha256(stage.name.encode())
+    for module in sorted(set(stage.code)):
+        digest.update(file_hash(importlib.util.find_spec(module).origin).encode())
+    digest.update(json.dumps(stage.params, sort_keys=True, default=str).encode())
+    for path in stage.inputs:
+        digest.update(os.path.basename(path).encode())
+        digest.update(file_hash(path).encode())
+    return digest.hexdigest()
+
+def _execute(target, kwargs):
+    module_name, func_name = target.split(":")
+    start = time.perf_counter()
+    getattr(importlib.import_module(module_name), func_name)(**kwargs)
+    return time.perf_counter() - start
+
+class Pipeline:
+    """Runs stages in dependency order, skipping or restoring stages whose fingerprint is unchanged."""
+
+    def __init__(self, stages, state_path, cache_dir, max_workers=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.deps = stage_dependencies(stages)
+        self.state_path = state_path
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.state = {}
+        if os.path.exists(state_path):
+            with open(state_path) as f:
+                self.state = json.load(f)
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        with open(self.state_path, "w") as f:
+            json.dump(self.state, f, indent=2)
+
+    def _up_to_date(self, stage, fingerprint):
+        record = self.state.get(stage.name)
+        if not record or record["fingerprint"] != fingerprint:
+            return False
+        return all(os.path.exists(path) and file_hash(path) == record["outputs"].get(path)
+                   for path in stage.outputs)
+
+    def _cache_entry(self, stage, fingerprint):
+        return os.path.join(self.cache_dir, stage.name, fingerprint)
+
+    def _restore(self, stage, fingerprint):
+        """Copies cached outputs from an earlier run with the same fingerprint back into place."""
+        entry = self._cache_entry(stage, fingerprint)
+        cached = [os.path.join(entry, f"{i}_{os.path.basename(path)}") for i, path in enumerate(stage.outputs)]
+        if not all(os.path.exists(path) for path in cached):
+            return False
+        for src, dst in zip(cached, stage.outputs):
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copy2(src, dst)
+        return True
+
+    def _record(self, stage, fingerprint):
+        if stage.cacheable:
+            entry = self._cache_entry(stage, fingerprint)
+            os.makedirs(entry, exist_ok=True)
+            for i, path in enumerate(stage.outputs):
+                shutil.copy2(path, os.path.join(entry, f"{i}_{os.path.basename(path)}"))
+        self.state[stage.name] = {"fingerprint": fingerprint,
+                                  "outputs": {path: file_hash(path) for path in stage.outputs}}
+        self._save_state()
+
+    def run(self, targets=None, force=(), dry_run=False):
+        """Runs the stages needed for `targets` (default: all). Returns {stage: status}."""
+        wanted = set(targets or self.stages)
+        pending = list(wanted)
+        while pending:
+            name = pending.pop()
+            for dep in self.deps[name] - wanted:
+                wanted.add(dep)
+                pending.append(dep)
+
+        done, status = set(), {}
+        running = {}
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            while len(done) < len(wanted):
+                ready = [name for name in wanted - done - set(running.values())
+                         if self.deps[name] <= done]
+                for name in ready:
+                    stage = self.stages[name]
+                    fingerprint = None
+                    if name not in force and all(os.path.exists(path) for path in stage.inputs):
+                        fingerprint = stage_fingerprint(stage)
+                        if self._up_to_date(stage, fingerprint):
+                            status[name] = "up to date"
+                        elif stage.cacheable and self._restore(stage, fingerprint):
+                            self._record(stage, fingerprint)
+                            status[name] = "restored from cache"
+                    if name in status:
+                        print(f"⏭️  {name}: {status[name]}")
+                        done.add(name)
+                    elif dry_run:
+                        print(f"🔸 {name}: would run")
+                        status[name] = "would run"
+                        done.add(name)
+                    else:
+                        print(f"🚀 {name}: running")
+                        future = executor.submit(_execute, stage.target, {**stage.path_args, **stage.params})
+                        running[future] = name
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    elapsed = future.result()
+                    self._record(self.stages[name], stage_fingerprint(self.stages[name]))
+                    status[name] = f"ran in {elapsed:.2f}s"
+                    print(f"✅ {name}: {status[name]}")
+                    done.add(name)
+        return status
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the GDP pipeline, skipping up-to-date stages.")
+    parser.add_argument("stages", nargs="*", help="Stages to bring up to date (default: all)")
+    parser.add_argument("--config", help="JSON file overriding artifact paths (and 'root')")
+    parser.add_argument("--root", help="Project root that relative paths resolve against")
+    parser.add_argument("--params", help="JSON file overriding stage parameters")
+    parser.add_argument("--force", nargs="*", default=[], help="Stages to rerun regardless of fingerprint")
+    parser.add_argument("--workers", type=int, help="Maximum stages run in parallel")
+    parser.add_argument("--dry-run", action="store_true", help="Only report which stages would run")
+    parser.add_argument("--events", help='Write JSON stage events to this file ("-" for stderr)')
+    parser.add_argument("--profile", action="store_true", help="Profile each stage into the profiles directory")
+    args = parser.parse_args(argv)
+
+    paths = resolve_paths(args.config, root=args.root)
+    if args.events or args.profile:
+        # Set before the worker pool starts so every stage process inherits it
+        from instrumentation import configure
+        configure(events=args.events, profile_dir=paths["profiles"] if args.profile else None)
+    params = None
+    if args.params:
+        with open(args.params) as f:
+            params = json.load(f)
+    stages = build_stages(paths, params)
+    unknown = set(args.stages) - {stage.name for stage in stages}
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    pipeline = Pipeline(stages, paths["pipeline_state"], paths["pipeline_cache"], max_workers=args.workers)
+    pipeline.run(args.stages or None, force=set(args.force), dry_run=args.dry_run)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import pickle
+import sqlite3
+import threading
+from config import PROJECT_ROOT
+
+# Default cache location and policy
+CACHE_PATH = os.path.join(PROJECT_ROOT, "data", "cache", "responses.sqlite")
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_TTLS = {
+    "worldbank": 7 * 24 * 3600,  # Annual series, revised rarely
+    "oecd": 7 * 24 * 3600,
+    "yahoo": 24 * 3600,          # Daily closes
+    "rest": 24 * 3600,
+}
+DEFAULT_TTL = 24 * 3600
+
+def make_key(source, indicator, country=None, start=None, end=None, **extra):
+    """Builds a stable cache key from the fields that identify a series request."""
+    parts = [source, indicator, country or "", f"{start or ''}:{end or ''}"]
+    parts += [f"{k}={extra[k]}" for k in sorted(extra)]
+    return "|".join(str(p) for p in parts)
+
+class ResponseCache:
+    """Persistent SQLite-backed cache for API payloads with per-source TTLs and LRU eviction.
+
+    Entries keep the ETag/Last-Modified validators of the response that produced them, so
+    expired HTTP entries are revalidated with a conditional GET instead of re-downloaded.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttls=None, max_bytes=MAX_CACHE_BYTES):
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, source TEXT, payload BLOB, size INTEGER,"
+            " created REAL, accessed REAL, etag TEXT, last_modified TEXT)"
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self):
+        """Returns hit/miss counters and the current size of the cache."""
+        with self._lock:
+            count, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            return {"hits": self.hits, "misses": self.misses, "revalidated": self.revalidated,
+                    "entries": count, "bytes": size}
+
+    def _count(self, counter):
+        """Increments a hit/miss counter; `+= 1` is not atomic across fetcher threads."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _lookup(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source, payload, created, etag, last_modified FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        source, payload, created, etag, last_modified = row
+        fresh = time.time() - created < self.ttls.get(source, DEFAULT_TTL)
+        return {"payload": payload, "fresh": fresh, "etag": etag, "last_modified": last_modified}
+
+    def _touch(self, key, refresh=False):
+        now = time.time()
+        with self._lock:
+            if refresh:
+                self._conn.execute("UPDATE entries SET accessed = ?, created = ? WHERE key = ?", (now, now, key))
+            else:
+                self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+    def _store(self, key, source, payload, etag=None, last_modified=None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, source, payload, len(payload), now, now, etag, last_modified),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drops least-recently-used entries until the cache fits in max_bytes."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def get_or_load(self, key, source, loader):
+        """Returns the cached object for key, calling loader() and pickling its result on a miss."""
+        entry = self._lookup(key)
+        if entry is not None and entry["fresh"]:
+            self._count("hits")
+            self._touch(key)
+            return pickle.loads(entry["payload"])
+        self._count("misses")
+        value = loader()
+        self._store(key, source, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        return value
+
+    def get_content(self, key, source, request):
+        """Returns a cached HTTP response body, revalidating expired entries.
+
+        request(headers) must perform the GET with the given extra headers and return the
+        requests.Response; a 304 answer reuses the stored body.
+        """
+        entry = self._lookup(key)
+        if entry is not None and entry["fresh"]:
+            self._count("hits")
+            self._touch(key)
+            return entry["payload"]
+
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = request(headers)
+        if entry is not None and response.status_code == 304:
+            self._count("revalidated")
+            self._touch(key, refresh=True)
+            return entry["payload"]
+
+        self._count("misses")
+        response.raise_for_status()
+        self._store(key, source, response.content,
+                    etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"))
+        return response.content
+
+    def get_json(self, key, source, request):
+        """Like get_content, but decodes the body as JSON."""
+        return json.loads(self.get_content(key, source, request))
@@ -0,0 +1,199 @@
+import os
+import io
+import json
+import time
+import pickle
+import argparse
+import contextlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from config import PATHS
+
+# Scenario settings
+N_PATHS = 10000
+BATCH_SIZE = 1000           # Paths simulated and scored together by one worker task
+STEPS = 5
+QUANTILES = (0.05, 0.5, 0.95)
+BINS = 4096                 # Histogram resolution of the streaming quantiles
+SEED = 42
+MODELS = ("ARIMA", "XGBoost", "Hybrid")
+SCENARIO_FILE = PATHS["scenarios"]
+
+class ExogSampler:
+    """Samples future indicator paths as cumulative yearly changes from the last observed year.
+
+    By default the changes are bootstrapped as whole historical years, keeping the co-movement
+    between indicators. `distributions` overrides single indicators with a numpy Generator
+    distribution, e.g. {"Inflation (%)": {"dist": "normal", "loc": 0.0, "scale": 0.05}}, whose
+    draws are the yearly changes in the indicator's cleaned-data units.
+    """
+
+    def __init__(self, history, columns, distributions=None):
+        values = history[columns].to_numpy(dtype=np.float64)
+        changes = np.diff(values, axis=0)
+        self.changes = changes[~np.isnan(changes).any(axis=1)]
+        self.last = values[-1]
+        self.distributions = {columns.index(col): dict(spec) for col, spec in (distributions or {}).items()
+                              if col in columns}
+
+    def sample(self, rng, n_paths, steps):
+        """Returns an (n_paths, steps, n_columns) array of indicator levels."""
+        changes = self.changes[rng.integers(0, len(self.changes), size=(n_paths, steps))]
+        for i, spec in self.distributions.items():
+            params = {k: v for k, v in spec.items() if k != "dist"}
+            changes[:, :, i] = getattr(rng, spec.get("dist", "normal"))(size=(n_paths, steps), **params)
+        return self.last + np.cumsum(changes, axis=1)
+
+class StreamingQuantiles:
+    """Fixed-grid histogram per (model, step) cell.
+
+    Memory does not grow with the number of paths, and histograms built by different workers
+    over the same grid merge by adding counts. Quantiles are interpolated within a bin, so
+    their resolution is (hi - lo) / bins; values outside [lo, hi] are clipped to the edges.
+    """
+
+    def __init__(self, lo, hi, shape, bins=BINS):
+        self.edges = np.linspace(lo, hi, bins + 1)
+        self.counts = np.zeros(shape + (bins + 2,), dtype=np.int64)  # Plus under- and overflow
+        self.sums = np.zeros(shape)
+        self.n = 0
+
+    def update(self, values):
+        """Adds a batch shaped (n_paths,) + shape."""
+        n_bins = self.counts.shape[-1]
+        cells = np.arange(self.sums.size).reshape(self.sums.shape)
+        index = cells * n_bins + np.searchsorted(self.edges, values, side="right")
+        self.counts += np.bincount(index.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+        self.sums += values.sum(axis=0)
+        self.n += len(values)
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.sums += other.sums
+        self.n += other.n
+        return self
+
+    def mean(self):
+        return self.sums / self.n
+
+    def quantile(self, q):
+        cumulative = self.counts.cumsum(axis=-1)
+        target = q * self.n
+        b = np.minimum((cumulative < target).sum(axis=-1, keepdims=True), self.counts.shape[-1] - 1)
+        in_bin = np.take_along_axis(self.counts, b, -1)
+        below = np.take_along_axis(cumulative, b, -1) - in_bin
+        # Bin b covers [edges[b-1], edges[b]); interp clips the tail bins to lo and hi
+        position = b - 1 + (target - below) / np.maximum(in_bin, 1)
+        return np.interp(position[..., 0], np.arange(len(self.edges)), self.edges)
+
+def simulate_arima(results, steps, n_paths, rng):
+    """Simulates n_paths future paths from the end of the fitted ARIMA sample."""
+    simulated = results.simulate(steps, anchor="end", repetitions=n_paths, rng=rng)
+    return np.asarray(simulated, dtype=np.float64).reshape(steps, n_paths).T
+
+# Per-worker state set once by _init_worker, as in the backtest
+_worker = {}
+
+def _init_worker(arima_path, xgb_path, cleaned_path, distributions, steps, hybrid_path=PATHS["hybrid_model"]):
+    from artifact_store import load_frame
+    from forecast import source_columns, load_ensemble
+    from recursive_forecast import RecursiveForecaster
+
+    with open(arima_path, "rb") as f:
+        arima = pickle.load(f)
+    with open(xgb_path, "rb") as f:
+        xgb_model = pickle.load(f)
+    # One xgboost thread per worker: the pool provides the parallelism
+    xgb_model.get_booster().set_param({"nthread": 1})
+    forecaster = RecursiveForecaster(xgb_model)
+    history = load_frame(cleaned_path, columns=source_columns(xgb_model)).sort_values("Year")
+    values = history[forecaster.columns].to_numpy(dtype=np.float64)[None]
+    _worker.update(arima=arima, forecaster=forecaster, values=values, steps=steps,
+                   ensemble=load_ensemble(hybrid_path),
+                   sampler=ExogSampler(history, forecaster.columns, distributions),
+                   last_year=int(history["Year"].max()))
+
+def _sample_paths(rng, n_paths):
+    """Returns an (n_paths, len(MODELS), steps) array of simulated GDP growth paths."""
+    steps, forecaster = _worker["steps"], _worker["forecaster"]
+    exog = _worker["sampler"].sample(rng, n_paths, steps)
+    history = np.broadcast_to(_worker["values"], (n_paths,) + _worker["values"].shape[1:])
+    xgb_paths = forecaster.forecast_paths(history, steps, exog=exog)
+    arima_paths = simulate_arima(_worker["arima"], steps, n_paths, rng)
+    return np.stack([arima_paths, xgb_paths, hybrid_paths(arima_paths, xgb_paths)], axis=1)
+
+def hybrid_paths(arima_paths, xgb_paths):
+    """Blends the paths with the fitted stacking ensemble, or 0.5/0.5 without one."""
+    ensemble = _worker["ensemble"]
+    if ensemble is None:
+        return 0.5 * arima_paths + 0.5 * xgb_paths
+    horizons = np.broadcast_to(np.arange(1, arima_paths.shape[1] + 1), arima_paths.shape)
+    blended = ensemble.combine({"ARIMA": arima_paths.ravel(), "XGBoost": xgb_paths.ravel()}, horizons.ravel())
+    return blended.reshape(arima_paths.shape)
+
+def _simulate_batch(task):
+    """Simulates one batch and returns only its histogram, so workers never ship whole paths."""
+    seed, n_paths, lo, hi = task
+    paths = _sample_paths(np.random.default_rng(seed), n_paths)
+    quantiles = StreamingQuantiles(lo, hi, paths.shape[1:])
+    quantiles.update(paths)
+    return quantiles
+
+def run_scenarios(n_paths=N_PATHS, steps=STEPS, batch_size=BATCH_SIZE, distributions=None, max_workers=None,
+                  seed=SEED, arima_path=PATHS["arima_model"], xgb_path=PATHS["xgb_model"],
+                  cleaned_path=PATHS["cleaned_data"], hybrid_path=PATHS["hybrid_model"]):
+    """Simulates n_paths scenarios across a process pool and returns the fan chart table."""
+    init_args = (arima_path, xgb_path, cleaned_path, distributions, steps, hybrid_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        _init_worker(*init_args)
+
+    # A pilot batch fixes the shared histogram grid, padded well beyond the pilot's spread
+    seeds = np.random.SeedSequence(seed).spawn(-(-n_paths // batch_size) + 1)
+    pilot = _sample_paths(np.random.default_rng(seeds[0]), min(batch_size, 500))
+    spread = max(float(pilot.max() - pilot.min()), 1.0)
+    lo, hi = float(pilot.min()) - 2 * spread, float(pilot.max()) + 2 * spread
+
+    sizes = [min(batch_size, n_paths - start) for start in range(0, n_paths, batch_size)]
+    tasks = [(child, size, lo, hi) for child, size in zip(seeds[1:], sizes)]
+    start = time.perf_counter()
+    total = StreamingQuantiles(lo, hi, (len(MODELS), steps))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=init_args) as executor:
+        for batch in executor.map(_simulate_batch, tasks):
+            total.merge(batch)
+    elapsed = time.perf_counter() - start
+
+    years = np.arange(_worker["last_year"] + 1, _worker["last_year"] + steps + 1)
+    table = {"Year": np.tile(years, len(MODELS)), "model": np.repeat(MODELS, steps),
+             "mean": total.mean().ravel()}
+    for q in QUANTILES:
+        table[f"p{round(q * 100)}"] = total.quantile(q).ravel()
+    return pd.DataFrame(table), total.n / elapsed
+
+def run(output_path=SCENARIO_FILE, n_paths=N_PATHS, steps=STEPS, batch_size=BATCH_SIZE, distributions_file=None,
+        max_workers=None, seed=SEED):
+    """Runs the scenario engine and saves the p5/p50/p95 fan chart."""
+    distributions = None
+    if distributions_file:
+        with open(distributions_file) as f:
+            distributions = json.load(f)
+
+    print(f"🎲 Simulating {n_paths} scenario paths over {steps} years...")
+    fan, rate = run_scenarios(n_paths, steps, batch_size, distributions, max_workers, seed)
+    print(fan.to_string(index=False))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    fan.to_csv(output_path, index=False)
+    print(f"✅ {rate:,.0f} paths/s; fan chart saved to {output_path}")
+    return fan
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo GDP growth scenarios with p5/p50/p95 fan charts.")
+    parser.add_argument("--paths", type=int, default=N_PATHS)
+    parser.add_argument("--steps", type=int, default=STEPS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--distributions", help="JSON file of per-indicator change distributions")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", default=SCENARIO_FILE)
+    args = parser.parse_args()
+    run(args.output, args.paths, args.steps, args.batch_size, args.distributions, args.workers, args.seed)
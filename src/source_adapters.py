@@ -0,0 +1,210 @@
+import io
+import re
+import json
+import time
+import threading
+import requests
+import pandas as pd
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from data_fetching import WB_BASE_URL, MAX_WORKERS, fetch_world_bank_data, request_with_retries
+from response_cache import make_key
+
+# Requests per second allowed to each host (others get DEFAULT_RATE)
+HOST_RATES = {
+    "api.worldbank.org": 10.0,
+    "finance.yahoo.com": 2.0,
+}
+DEFAULT_RATE = 4.0
+SERIES_COLUMNS = ["Year", "Value"]
+
+# Column names recognised in generic REST/CSV payloads
+YEAR_COLUMNS = ("Year", "year", "TIME", "TIME_PERIOD", "date", "Date")
+VALUE_COLUMNS = ("Value", "value", "OBS_VALUE")
+
+class HostRateLimiter:
+    """Spaces out requests to each host to at most `rate` per second, across threads.
+
+    rates: {host: requests per second}, HOST_RATES when None; other hosts get `default`.
+    """
+
+    def __init__(self, rates=None, default=DEFAULT_RATE):
+        self.rates = HOST_RATES if rates is None else rates
+        self.default = default
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def rate(self, host):
+        # finance.yahoo.com also covers query1/query2.finance.yahoo.com
+        for known, rate in self.rates.items():
+            if host == known or host.endswith("." + known):
+                return rate
+        return self.default
+
+    def wait(self, host):
+        """Blocks until the next request slot for host and reserves it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + 1.0 / self.rate(host)
+        if slot > now:
+            time.sleep(slot - now)
+
+class RateLimitedSession(requests.Session):
+    """Keep-alive session that waits for the limiter before every request (pages and retries too)."""
+
+    def __init__(self, limiter, pool_size=MAX_WORKERS):
+        super().__init__()
+        self.limiter = limiter
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        self.limiter.wait(urlparse(url).hostname or "")
+        return super().request(method, url, *args, **kwargs)
+
+def empty_series():
+    return pd.DataFrame(columns=SERIES_COLUMNS)
+
+class WorldBankAdapter:
+    """World Bank indicator codes such as NV.AGR.TOTL.ZS."""
+
+    name = "worldbank"
+    uses_session = True
+    CODE = re.compile(r"^[A-Z]{2,3}(\.[A-Z0-9]+)+$")
+
+    def __init__(self, country="IND", start_year=2000, end_year=2024, base_url=WB_BASE_URL, cache=None):
+        self.country, self.start_year, self.end_year = country, start_year, end_year
+        self.base_url, self.cache = base_url, cache
+
+    def matches(self, code):
+        return bool(self.CODE.match(code))
+
+    def host(self, code):
+        return urlparse(self.base_url).hostname
+
+    def fetch(self, code, session):
+        return fetch_world_bank_data(code, self.country, self.start_year, self.end_year, session=session,
+                                     base_url=self.base_url, cache=self.cache)[SERIES_COLUMNS]
+
+class YahooAdapter:
+    """Tickers written as yahoo:<ticker> (e.g. yahoo:^NSEI), synced into the time-series store
+    and reduced to one value per year."""
+
+    name = "yahoo"
+    uses_session = False    # yfinance makes its own requests
+    PREFIX = "yahoo:"
+
+    def __init__(self, store=None, how="last", start="2000-01-01", cache=None):
+        from timeseries_store import TimeSeriesStore
+        # Created once here: fetch() runs on several worker threads, which share this store
+        self.store = store or TimeSeriesStore()
+        self.how, self.start, self.cache = how, start, cache
+
+    def matches(self, code):
+        return code.startswith(self.PREFIX)
+
+    def host(self, code):
+        return "finance.yahoo.com"
+
+    def fetch(self, code, session):
+        from timeseries_store import sync_stocks
+        ticker = code[len(self.PREFIX):]
+        sync_stocks([ticker], self.store, start=self.start, cache=self.cache)
+        annual = self.store.resample(ticker, "annual", self.how)
+        return pd.DataFrame({"Year": annual.index.year.astype(int), "Value": annual.to_numpy()})
+
+class RestAdapter:
+    """Any http(s) URL returning JSON records or CSV with a year and a value column."""
+
+    name = "rest"
+    uses_session = True
+
+    def __init__(self, cache=None):
+        self.cache = cache
+
+    def matches(self, code):
+        return code.startswith(("http://", "https://"))
+
+    def host(self, code):
+        return urlparse(code).hostname
+
+    def fetch(self, code, session):
+        if self.cache is None:
+            response = request_with_retries(session, code)
+            response.raise_for_status()
+            content, content_type = response.content, response.headers.get("Content-Type", "")
+        else:
+            content = self.cache.get_content(make_key("rest", code), "rest",
+                                             lambda headers: request_with_retries(session, code, headers=headers))
+            content_type = ""
+        if "csv" in content_type or not content.lstrip().startswith((b"[", b"{")):
+            df = pd.read_csv(io.BytesIO(content))
+        else:
+            payload = json.loads(content)
+            if isinstance(payload, dict):
+                # {"data": [...]}-style envelopes: use the first list of records
+                payload = next((value for value in payload.values() if isinstance(value, list)), [payload])
+            df = pd.json_normalize(payload)
+        return self.to_series(df, code)
+
+    @staticmethod
+    def to_series(df, code):
+        year = next((col for col in YEAR_COLUMNS if col in df.columns), None)
+        value = next((col for col in VALUE_COLUMNS if col in df.columns), None)
+        if value is None:
+            numeric = [col for col in df.select_dtypes("number").columns if col != year]
+            value = numeric[0] if len(numeric) == 1 else None
+        if year is None or value is None:
+            raise ValueError(f"No year/value columns in response from {code}: {list(df.columns)}")
+        years = pd.to_numeric(df[year].astype(str).str[:4], errors="coerce")
+        out = pd.DataFrame({"Year": years, "Value": pd.to_numeric(df[value], errors="coerce")})
+        return out.dropna(subset=["Year"]).astype({"Year": int})
+
+def default_adapters(cache=None, country="IND", start_year=2000, end_year=2024, wb_base_url=WB_BASE_URL):
+    return [WorldBankAdapter(country, start_year, end_year, wb_base_url, cache), YahooAdapter(cache=cache), RestAdapter(cache)]
+
+def pick_adapter(code, adapters):
+    return next((adapter for adapter in adapters if adapter.matches(code)), None)
+
+def fetch_series(jobs, adapters, max_workers=MAX_WORKERS, limiter=None):
+    """Fetches {key: code} concurrently, each through the first adapter that matches its code.
+
+    Every HTTP request waits for its host's rate limit; adapters that do not use the shared
+    session (Yahoo) take one slot per series. Failures are reported and give an empty series.
+    Returns {key: DataFrame(Year, Value)} in the order of jobs.
+    """
+    limiter = limiter or HostRateLimiter()
+    session = RateLimitedSession(limiter, pool_size=max_workers)
+
+    def run(item):
+        key, code = item
+        adapter = pick_adapter(code, adapters)
+        if adapter is None:
+            print(f"⚠️ No source adapter for {code}; skipped")
+            return empty_series()
+        if not adapter.uses_session:
+            limiter.wait(adapter.host(code))
+        try:
+            return adapter.fetch(code, session)
+        except Exception as e:
+            print(f"❌ Error fetching {code} from {adapter.name}: {e}")
+            return empty_series()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(run, jobs.items()))
+    finally:
+        session.close()
+    return dict(zip(jobs, results))
+
+def join_on_year(series_map):
+    """Aligns {column: DataFrame(Year, Value)} on Year with a single concat."""
+    columns = {name: df.groupby("Year")["Value"].last() for name, df in series_map.items() if not df.empty}
+    if not columns:
+        return pd.DataFrame(columns=["Year"])
+    joined = pd.concat(columns, axis=1).sort_index()
+    joined.index.name = "Year"
+    return joined.reset_index()
@@ -0,0 +1,121 @@
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from config import PATHS
+
+# Stacking settings
+OOS_FILE = PATHS["oos_predictions"]
+KEYS = ["origin", "horizon", "Year"]
+DERIVED_MODELS = ("Hybrid",)     # Blends of the base models, never stacked as a base
+RESIDUAL_PARAMS = {"n_estimators": 50, "learning_rate": 0.05, "max_depth": 2}
+
+def oos_matrix(detail):
+    """Pivots backtest detail (Year, model, forecast, horizon, origin, actual) into one row per
+    (origin, horizon) with the actual value and one float32 column per base model."""
+    detail = detail[~detail["model"].isin(DERIVED_MODELS)]
+    matrix = detail.pivot_table(index=KEYS, columns="model", values="forecast", aggfunc="first")
+    matrix.columns.name = None
+    actuals = detail.drop_duplicates(KEYS).set_index(KEYS)["actual"]
+    matrix = matrix.astype(np.float32)
+    matrix.insert(0, "actual", actuals.reindex(matrix.index).astype(np.float32))
+    return matrix.reset_index().sort_values(KEYS, ignore_index=True)
+
+def base_models(matrix):
+    return [col for col in matrix.columns if col not in KEYS + ["actual"]]
+
+def add_base_model(matrix, name, predictions):
+    """Adds a new base model's out-of-sample predictions (KEYS + "forecast") to the cache."""
+    predictions = predictions[KEYS + ["forecast"]].rename(columns={"forecast": name})
+    predictions[name] = predictions[name].astype(np.float32)
+    return matrix.drop(columns=[name], errors="ignore").merge(predictions, on=KEYS, how="left")
+
+def save_oos(matrix, path=OOS_FILE):
+    from artifact_store import save_frame
+    save_frame(matrix, path)
+
+def load_oos(path=OOS_FILE):
+    from artifact_store import load_frame
+    return load_frame(path)
+
+def simplex_weights(X, y):
+    """Non-negative least-squares weights, normalised to sum to one."""
+    from scipy.optimize import nnls
+    weights = nnls(X, y)[0]
+    return weights / weights.sum() if weights.sum() > 0 else np.full(X.shape[1], 1 / X.shape[1])
+
+class StackedEnsemble:
+    """Combines N base model forecasts with weights or a residual model fit on cached
+    out-of-sample predictions; the base models themselves are never refit.
+
+    method="weights": one set of non-negative, sum-to-one weights per horizon (pooled weights
+    for horizons the cache does not cover). method="residual": an XGBoost model predicts the
+    residual of `base` from the horizon and every base forecast.
+    """
+
+    def __init__(self, method="weights", base="ARIMA", params=None):
+        self.method, self.base = method, base
+        self.params = params or RESIDUAL_PARAMS
+        self.models = []
+        self.weights = {}
+        self.residual_model = None
+
+    def fit(self, matrix, models=None):
+        self.models = list(models or base_models(matrix))
+        rows = matrix.dropna(subset=self.models + ["actual"])
+        X = rows[self.models].to_numpy(dtype=np.float64)
+        y = rows["actual"].to_numpy(dtype=np.float64)
+        if self.method == "weights":
+            self.weights = {"pooled": simplex_weights(X, y)}
+            for horizon, index in rows.groupby("horizon").indices.items():
+                self.weights[int(horizon)] = simplex_weights(X[index], y[index])
+        else:
+            from xgboost import XGBRegressor
+            inputs = np.column_stack([rows["horizon"].to_numpy(dtype=np.float64), X])
+            residual = y - rows[self.base].to_numpy(dtype=np.float64)
+            self.residual_model = XGBRegressor(**self.params).fit(inputs, residual)
+        return self
+
+    def combine(self, forecasts, horizons):
+        """forecasts: {model: array of forecasts}; horizons: matching array of steps ahead."""
+        X = np.column_stack([np.asarray(forecasts[model], dtype=np.float64) for model in self.models])
+        horizons = np.asarray(horizons)
+        if self.method == "weights":
+            weights = np.array([self.weights.get(int(h), self.weights["pooled"]) for h in horizons])
+            return (X * weights).sum(axis=1)
+        inputs = np.column_stack([horizons.astype(np.float64), X])
+        return np.asarray(forecasts[self.base], dtype=np.float64) + self.residual_model.predict(inputs)
+
+    def describe(self):
+        if self.method == "weights":
+            return pd.DataFrame(self.weights, index=self.models).T
+        return pd.DataFrame({"method": ["residual"], "base": [self.base], "inputs": [["horizon"] + self.models]})
+
+def evaluate(matrix, ensemble):
+    """In-sample RMSE of each base model and the ensemble on the cached predictions."""
+    rows = matrix.dropna(subset=ensemble.models + ["actual"])
+    combined = ensemble.combine({m: rows[m] for m in ensemble.models}, rows["horizon"])
+    errors = {m: rows[m] - rows["actual"] for m in ensemble.models}
+    errors["Stacked"] = combined - rows["actual"]
+    return {name: float(np.sqrt(np.mean(np.square(e)))) for name, e in errors.items()}
+
+def fit_ensemble(oos_path=OOS_FILE, method="weights", models=None):
+    """Loads the out-of-sample cache and fits the ensemble on it."""
+    import scipy.optimize, xgboost  # noqa: F401  (imported before timing the fit itself)
+    matrix = load_oos(oos_path)
+    start = time.perf_counter()
+    ensemble = StackedEnsemble(method).fit(matrix, models)
+    print(f"🔹 Fitted {method} ensemble of {ensemble.models} on {len(matrix)} cached predictions "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return ensemble, matrix
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit stacking weights or a residual model on cached backtest predictions.")
+    parser.add_argument("--method", choices=["weights", "residual"], default="weights")
+    parser.add_argument("--models", nargs="+", help="Base models to stack (default: every cached model)")
+    parser.add_argument("--oos", default=OOS_FILE)
+    args = parser.parse_args()
+
+    ensemble, matrix = fit_ensemble(args.oos, args.method, args.models)
+    print(ensemble.describe().to_string())
+    print(f"✅ RMSE on cached predictions: {evaluate(matrix, ensemble)}")
@@ -0,0 +1,192 @@
+import os
+import re
+import json
+import time
+import argparse
+import threading
+import pandas as pd
+from config import PATHS
+
+# Local store of native-frequency series (daily closes, monthly surveys, ...):
+# <STORE_DIR>/<series>.arrow with Date and Value columns, plus manifest.json recording each
+# series' frequency, source and date range so a sync knows where to resume without reading data.
+STORE_DIR = PATHS["timeseries"]
+OVERLAP_DAYS = 5          # Re-fetched on each sync to pick up revisions and the last partial bar
+DEFAULT_START = "1980-01-01"
+
+# Target frequencies and the aggregations resample() supports
+FREQUENCIES = {"annual": "Y", "quarterly": "Q", "monthly": "M"}
+AGGREGATIONS = ("last", "first", "mean", "sum", "min", "max")
+
+def resample(series, freq="annual", how="last"):
+    """Aggregates a date-indexed series to annual, quarterly or monthly periods.
+
+    Every conversion in the project goes through here: the result is indexed by a
+    PeriodIndex and only has periods with at least one observation.
+    """
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency '{freq}'; expected one of {list(FREQUENCIES)}")
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation '{how}'; expected one of {list(AGGREGATIONS)}")
+    series = series.dropna()
+    grouped = series.groupby(series.index.to_period(FREQUENCIES[freq]), sort=True)
+    return grouped.sum(min_count=1) if how == "sum" else getattr(grouped, how)()
+
+def period_frame(series_map, freq="annual"):
+    """Joins already-resampled {column: series} into one frame keyed by Year (plus Quarter or Month)."""
+    df = pd.concat(series_map, axis=1).sort_index()
+    index = df.index
+    df = df.reset_index(drop=True)
+    if freq == "quarterly":
+        df.insert(0, "Quarter", index.quarter)
+    elif freq == "monthly":
+        df.insert(0, "Month", index.month)
+    df.insert(0, "Year", index.year.astype(int))
+    return df
+
+def series_file(name):
+    """File-system safe name for a series id such as ^NSEI."""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name) + ".arrow"
+
+class TimeSeriesStore:
+    """Native-frequency series on disk, synced incrementally from a loader.
+
+    Writes are serialized, so one store can be shared by concurrent fetchers.
+    """
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self.manifest = {}
+        self._lock = threading.RLock()
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+
+    def _save_manifest(self):
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            tmp_path = self.manifest_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.manifest, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+
+    def names(self):
+        return sorted(self.manifest)
+
+    def last_date(self, name):
+        """Last stored date, or None when the series has no observations yet (e.g. an empty first sync)."""
+        last = self.manifest.get(name, {}).get("last")
+        return pd.Timestamp(last) if last else None
+
+    def read(self, name, start=None, end=None):
+        """Returns the stored series indexed by Date, optionally sliced to [start, end]."""
+        from artifact_store import load_frame
+        if name not in self.manifest:
+            raise KeyError(f"No series {name} in {self.root}")
+        df = load_frame(os.path.join(self.root, self.manifest[name]["file"]))
+        series = df.set_index("Date")["Value"].rename(name)
+        return series.loc[start:end] if start is not None or end is not None else series
+
+    def write(self, name, series, freq, source):
+        """Merges new observations into the stored series (new values win on the same date).
+
+        Returns the number of dates that were not stored before.
+        """
+        from artifact_store import save_frame
+        series = pd.Series(series, dtype="float64").dropna()
+        series.index = pd.DatetimeIndex(series.index).tz_localize(None).normalize()
+        with self._lock:
+            stored = self.read(name) if name in self.manifest else pd.Series(dtype="float64")
+            added = len(series.index.difference(stored.index))
+            merged = pd.concat([stored, series])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+
+            # Written next to the old file and renamed, so a crash keeps the previous version
+            path = os.path.join(self.root, series_file(name))
+            tmp_path = path[:-len(".arrow")] + ".tmp.arrow"
+            save_frame(pd.DataFrame({"Date": merged.index, "Value": merged.to_numpy()}), tmp_path)
+            os.replace(tmp_path, path)
+            os.replace(tmp_path + ".schema.json", path + ".schema.json")
+
+            self.manifest[name] = {
+                "file": series_file(name), "freq": freq, "source": source, "rows": len(merged),
+                "first": merged.index[0].strftime("%Y-%m-%d") if len(merged) else None,
+                "last": merged.index[-1].strftime("%Y-%m-%d") if len(merged) else None,
+                "synced": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            self._save_manifest()
+        return added
+
+    def sync(self, name, loader, freq="D", source=None, start=DEFAULT_START, end=None):
+        """Fetches only the dates after the last stored one (minus OVERLAP_DAYS) via
+        loader(start, end) -> date-indexed series, and merges them in."""
+        last = self.last_date(name)
+        fetch_from = (last - pd.Timedelta(days=OVERLAP_DAYS)).strftime("%Y-%m-%d") if last is not None else start
+        end = end or (pd.Timestamp.today() + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        series = loader(fetch_from, end)
+        added = self.write(name, series, freq, source or self.manifest.get(name, {}).get("source"))
+        print(f"🔄 {name}: fetched {len(series)} rows from {fetch_from}, {added} new, "
+              f"{self.manifest[name]['rows']} stored")
+        return added
+
+    def resample(self, name, freq="annual", how="last"):
+        return resample(self.read(name), freq, how)
+
+    def frame(self, aggregations, freq="annual", columns=None):
+        """Wide frame of several stored series at one frequency.
+
+        aggregations: {series: how}; columns optionally renames series to column names.
+        """
+        columns = columns or {}
+        resampled = {columns.get(name, name): self.resample(name, freq, how) for name, how in aggregations.items()}
+        return period_frame(resampled, freq)
+
+def sync_stocks(tickers, store=None, start=DEFAULT_START, cache=None):
+    """Brings the daily closes of Yahoo Finance tickers up to date in the store.
+
+    Downloads go through fetch_stock_history, so they share its retries and response cache.
+    """
+    from data_fetching import fetch_stock_closes
+    store = store or TimeSeriesStore()
+    for ticker in tickers:
+        store.sync(ticker, lambda s, e, t=ticker: fetch_stock_closes(t, start=s, end=e, cache=cache), freq="D",
+                   source="yahoo", start=start)
+    return store
+
+def import_csv(name, path, date_col, value_col, freq, source="csv", store=None, **read_csv_kwargs):
+    """Loads a downloaded (Date, Value) CSV export into the store."""
+    store = store or TimeSeriesStore()
+    df = pd.read_csv(path, **read_csv_kwargs)
+    series = pd.Series(pd.to_numeric(df[value_col], errors="coerce").to_numpy(), index=pd.to_datetime(df[date_col]))
+    added = store.write(name, series, freq, source)
+    print(f"📥 {name}: imported {len(series)} rows from {path}, {added} new")
+    return store
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local native-frequency time-series store.")
+    parser.add_argument("--store", default=STORE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync_parser = sub.add_parser("sync", help="Fetch new daily closes from Yahoo Finance")
+    sync_parser.add_argument("tickers", nargs="+")
+    sync_parser.add_argument("--start", default=DEFAULT_START, help="First date for series not stored yet")
+    sub.add_parser("list", help="List stored series")
+    export_parser = sub.add_parser("export", help="Resample stored series into one CSV")
+    export_parser.add_argument("series", nargs="+", help="NAME or NAME:how (default how: last)")
+    export_parser.add_argument("--freq", choices=list(FREQUENCIES), default="annual")
+    export_parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+
+    store = TimeSeriesStore(args.store)
+    if args.command == "sync":
+        sync_stocks(args.tickers, store, start=args.start)
+    elif args.command == "list":
+        if store.manifest:
+            print(pd.DataFrame.from_dict(store.manifest, orient="index").to_string())
+        else:
+            print(f"⚠️ No series stored in {store.root}")
+    else:
+        aggregations = dict(item.split(":", 1) if ":" in item else (item, "last") for item in args.series)
+        df = store.frame(aggregations, freq=args.freq)
+        df.to_csv(args.output, index=False)
+        print(f"✅ {len(df)} {args.freq} rows of {list(aggregations)} saved to {args.output}")
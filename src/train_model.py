@@ -1,16 +1,27 @@
 import pandas as pd
 import pickle
 import numpy as np
-from statsmodels.tsa.arima.model import ARIMA
-from xgboost import XGBRegressor
-from sklearn.model_selection import train_test_split
+import os
+from artifact_store import load_frame
+from config import PATHS
+from feature_registry import model_feature_names, feature_importances, prune_features
+from arima_search import CACHE_DIR, prepare_series, search_orders
+from instrumentation import instrument, log
+
+# statsmodels, xgboost and scikit-learn are imported inside the functions that use them,
+# so training one model (or importing this module for its helpers) loads only what it needs
 
 # Define dataset paths
-INPUT_FILE = r"D:\Projects\GDP_Prediction_Project\data\processed\feature_engineered.csv"
-ARIMA_MODEL_PATH = r"D:\Projects\GDP_Prediction_Project\models\arima_model.pkl"
-XGB_MODEL_PATH = r"D:\Projects\GDP_Prediction_Project\models\xgboost_model.pkl"
-HYBRID_MODEL_PATH = r"D:\Projects\GDP_Prediction_Project\models\hybrid_model.pkl"
+INPUT_FILE = PATHS["features"]
+ARIMA_MODEL_PATH = PATHS["arima_model"]
+XGB_MODEL_PATH = PATHS["xgb_model"]
+HYBRID_MODEL_PATH = PATHS["hybrid_model"]
+
+# Model settings
+ARIMA_ORDER = (5, 1, 0)
+XGB_PARAMS = {"n_estimators": 100, "learning_rate": 0.1, "max_depth": 5}
 
+@instrument
 def clean_data(df):
     """Cleans the dataset by handling NaN, Inf values, and forward-filling missing data."""
     df.replace([np.inf, -np.inf], np.nan, inplace=True)  # Convert inf to NaN
@@ -20,75 +31,162 @@ def clean_data(df):
     df.fillna(0, inplace=True)  # Replace remaining NaNs with 0
     
     missing_after = df.isnull().sum().sum()
-    print(f"🔍 Cleaned dataset: Removed {missing_before - missing_after} missing values.")
+    log(f"🔍 Cleaned dataset: Removed {missing_before - missing_after} missing values.")
     return df
 
-def train_arima(df):
-    """Trains an ARIMA model on GDP Growth (%) with proper time indexing."""
-    df = df.set_index("Year")  # Ensure Year is the index
-    df.index = pd.to_datetime(df.index, format="%Y").to_period("Y")  # Set yearly frequency
+@instrument
+def train_arima(df, order=ARIMA_ORDER, search=False, criterion="aic", target="GDP Growth (%)", cache_dir=CACHE_DIR):
+    """Trains an ARIMA model on the target (GDP Growth (%)) with proper time indexing.
+
+    With search, the order is chosen by a parallel (p, d, q) search ranked by AIC/BIC, with
+    fits cached under cache_dir.
+    """
+    from statsmodels.tsa.arima.model import ARIMA
+    series = prepare_series(df, target)  # Year as a yearly PeriodIndex
 
-    print("🚀 Training ARIMA model...")
-    model = ARIMA(df['GDP Growth (%)'], order=(5,1,0))  # ARIMA(5,1,0)
+    if search:
+        log("🔎 Searching ARIMA orders...")
+        ranking, model_fit = search_orders(series, criterion=criterion, cache_dir=cache_dir)
+        if model_fit is not None:
+            log(ranking[["order", "aic", "bic", "seconds", "status", "cached"]].head(10).to_string(index=False))
+            log(f"✅ Selected ARIMA{ranking.loc[0, 'order']} by {criterion.upper()}.")
+            return model_fit
+        log("⚠️ Order search found no usable fit; falling back to the configured order.")
+
+    log("🚀 Training ARIMA model...")
+    model = ARIMA(series, order=order)
     model_fit = model.fit()
     return model_fit
 
-def train_xgboost(df):
-    """Trains an XGBoost regression model for GDP forecasting."""
-    X = df.drop(columns=['GDP Growth (%)', 'Year'], errors='ignore')  # Drop target & Year column
-    y = df['GDP Growth (%)']
+def model_inputs(model, df):
+    """Selects the feature columns a trained XGBoost model expects from df."""
+    names = model_feature_names(model)
+    if names:
+        return df[names]
+    return df.drop(columns=['GDP Growth (%)', 'Year'], errors='ignore')
+
+@instrument
+def train_xgboost(df, params=None, features=None, target="GDP Growth (%)", verbose=True):
+    """Trains an XGBoost regression model for GDP forecasting.
+
+    features restricts training to a subset of columns (e.g. from select_xgboost_features).
+    verbose=False skips the per-feature summary, which costs more than the fit on small data.
+    """
+    from xgboost import XGBRegressor
+    from sklearn.model_selection import train_test_split
+
+    X = df.drop(columns=[target, 'Year'], errors='ignore')  # Drop target & Year column
+    if features is not None:
+        X = X[list(features)]
+    y = df[target]
     
     # Train-Test Split
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
     # Print dataset summary for debugging
-    print("🔹 XGBoost Training Data Summary 🔹")
-    print(f"Total Features: {X_train.shape[1]}, Training Samples: {X_train.shape[0]}")
-    print(X_train.describe().T)  # Show feature statistics
+    if verbose:
+        log("🔹 XGBoost Training Data Summary 🔹")
+        log(f"Total Features: {X_train.shape[1]}, Training Samples: {X_train.shape[0]}")
+        log(X_train.describe().T)  # Show feature statistics
     
     # Train XGBoost Model
-    model = XGBRegressor(n_estimators=100, learning_rate=0.1, max_depth=5)
+    model = XGBRegressor(**(params or XGB_PARAMS))
     model.fit(X_train, y_train)
 
     return model
 
-def train_hybrid_model(arima_model, xgb_model, df):
-    """Creates a hybrid model by combining ARIMA and XGBoost predictions."""
-    print("⚡ Training Hybrid Model...")
-    
-    # Predict using ARIMA
-    arima_pred = arima_model.predict(start=df.index[0], end=df.index[-1])
-    
-    # Predict using XGBoost
+def select_xgboost_features(model, df, corr_threshold=0.95, min_importance=0.0):
+    """Picks the features worth keeping: non-zero gain importance, correlation-deduplicated."""
     X = df.drop(columns=['GDP Growth (%)', 'Year'], errors='ignore')
-    xgb_pred = xgb_model.predict(X)
-    
-    # Combine predictions (Weighted Average)
-    hybrid_pred = (0.5 * arima_pred) + (0.5 * xgb_pred)
-    
-    print("✅ Hybrid Model trained successfully.")
-    return hybrid_pred
+    features = prune_features(X, feature_importances(model), corr_threshold=corr_threshold,
+                              min_importance=min_importance)
+    print(f"✂️ Pruned features: {len(features)} of {X.shape[1]} kept.")
+    return features
 
-if __name__ == "__main__":
-    print("📂 Loading dataset...")
-    df = pd.read_csv(INPUT_FILE)
+@instrument
+def train_hybrid_model(oos_matrix, method="weights"):
+    """Fits the hybrid on cached out-of-sample base predictions (see stacking.py).
+
+    The weights (or the residual model) come from walk-forward forecasts, aligned on
+    (origin, horizon, Year), so the base models are never refit here.
+    """
+    from stacking import StackedEnsemble, evaluate
+    log("⚡ Training Hybrid Model...")
+    ensemble = StackedEnsemble(method).fit(oos_matrix)
+    log(ensemble.describe().to_string())
+    log(f"✅ Hybrid Model trained successfully. RMSE on cached predictions: {evaluate(oos_matrix, ensemble)}")
+    return ensemble
+
+@instrument
+def load_training_data(input_path=INPUT_FILE):
+    """Loads and cleans the feature-engineered dataset for training."""
+    log("📂 Loading dataset...")
+    df = load_frame(input_path)
+    log(f"✅ Dataset Loaded: {df.shape[0]} rows, {df.shape[1]} columns.")
+    return clean_data(df)
 
-    print(f"✅ Dataset Loaded: {df.shape[0]} rows, {df.shape[1]} columns.")
+def save_model(model, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        pickle.dump(model, f)
 
-    # Clean Data
-    df = clean_data(df)
+def load_model(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
 
-    # Train & Save ARIMA Model
-    arima_model = train_arima(df)
-    pickle.dump(arima_model, open(ARIMA_MODEL_PATH, "wb"))
+def run_arima(input_path=INPUT_FILE, model_path=ARIMA_MODEL_PATH, order=ARIMA_ORDER, search=False, criterion="aic"):
+    """Trains and saves the ARIMA model."""
+    arima_model = train_arima(load_training_data(input_path), order=order, search=search, criterion=criterion)
+    save_model(arima_model, model_path)
     print("✅ ARIMA model saved.")
+    return arima_model
 
-    # Train & Save XGBoost Model
-    xgb_model = train_xgboost(df)
-    pickle.dump(xgb_model, open(XGB_MODEL_PATH, "wb"))
+def run_xgboost(input_path=INPUT_FILE, model_path=XGB_MODEL_PATH, params=None, prune=False, corr_threshold=0.95,
+                tune=False, n_trials=32, workers=None):
+    """Trains and saves the XGBoost model.
+
+    With prune, the model is refit on the features selected from a first full fit, so
+    forecasting only has to compute those features. With tune, hyperparameters are chosen
+    by a parallel search with early stopping on the latest years, and the trial summary is
+    saved next to the model.
+    """
+    df = load_training_data(input_path)
+    features = None
+    if prune or not tune:
+        xgb_model = train_xgboost(df, params=params)
+    if prune:
+        features = select_xgboost_features(xgb_model, df, corr_threshold=corr_threshold)
+        if not tune:
+            xgb_model = train_xgboost(df, params=params, features=features)
+    if tune:
+        from xgb_tuning import tune_xgboost, save_summary
+        xgb_model, summary = tune_xgboost(df, n_trials=n_trials, workers=workers, features=features)
+        save_summary(summary, model_path)
+    save_model(xgb_model, model_path)
     print("✅ XGBoost model saved.")
+    return xgb_model
+
+def run_hybrid(input_path=INPUT_FILE, oos_path=PATHS["oos_predictions"], hybrid_path=HYBRID_MODEL_PATH,
+               method="weights"):
+    """Fits and saves the hybrid ensemble, backtesting first if no prediction cache exists."""
+    from stacking import load_oos, oos_matrix, save_oos
+    if os.path.exists(oos_path):
+        matrix = load_oos(oos_path)
+    else:
+        from backtest import run_backtest
+        print("🔸 No out-of-sample prediction cache; running the backtest to build it...")
+        detail, _ = run_backtest(load_training_data(input_path))
+        matrix = oos_matrix(detail)
+        save_oos(matrix, oos_path)
+    ensemble = train_hybrid_model(matrix, method=method)
+    save_model(ensemble, hybrid_path)
+    print("✅ Hybrid model saved.")
+    return ensemble
+
+if __name__ == "__main__":
+    run_arima()
+    run_xgboost()
+    run_hybrid()
 
-    # Train & Save Hybrid Model
-    hybrid_predictions = train_hybrid_model(arima_model, xgb_model, df)
-    pickle.dump(hybrid_predictions, open(HYBRID_MODEL_PATH, "wb"))
-    print("✅ Hybrid model predictions saved.")
\ No newline at end of file
+    from model_registry import publish
+    publish()
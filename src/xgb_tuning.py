@@ -0,0 +1,98 @@
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from concurrent.futures import ThreadPoolExecutor
+from xgboost import XGBRegressor
+
+# Tuning settings
+TARGET = "GDP Growth (%)"
+VALID_FRACTION = 0.2       # Most recent rows held out for early stopping
+N_TRIALS = 32
+MAX_ROUNDS = 1000
+EARLY_STOPPING_ROUNDS = 50
+BASE_PARAMS = {"objective": "reg:squarederror", "tree_method": "hist", "eval_metric": "rmse"}
+
+def sample_params(rng):
+    """Draws one hyperparameter configuration from the search space."""
+    return {
+        "max_depth": int(rng.integers(2, 9)),
+        "eta": float(10 ** rng.uniform(-2, np.log10(0.3))),
+        "subsample": float(rng.uniform(0.6, 1.0)),
+        "colsample_bytree": float(rng.uniform(0.5, 1.0)),
+        "min_child_weight": float(rng.integers(1, 11)),
+        "lambda": float(10 ** rng.uniform(-1, 1)),
+    }
+
+def time_split(df, valid_fraction=VALID_FRACTION, features=None):
+    """Splits by Year: the latest valid_fraction of rows is the validation fold (no shuffling)."""
+    df = df.sort_values("Year")
+    X = df.drop(columns=[TARGET, "Year"], errors="ignore")
+    if features is not None:
+        X = X[list(features)]
+    y = df[TARGET]
+    cut = len(df) - max(1, int(round(len(df) * valid_fraction)))
+    return X.iloc[:cut], y.iloc[:cut], X.iloc[cut:], y.iloc[cut:]
+
+def split_threads(n_trials, workers=None, total=None):
+    """Divides the cores between concurrent trials and xgboost threads per trial."""
+    total = total or os.cpu_count() or 1
+    workers = workers or max(1, min(n_trials, total // 2))
+    return workers, max(1, total // workers)
+
+def tune_xgboost(df, n_trials=N_TRIALS, workers=None, seed=42, features=None, valid_fraction=VALID_FRACTION):
+    """Random hyperparameter search with early stopping on a time-ordered validation fold.
+
+    The training and validation QuantileDMatrix are built once and shared by every trial;
+    trials run on a thread pool (xgboost releases the GIL), each with its own nthread.
+    Returns (best refit XGBRegressor, summary dict).
+    """
+    X_train, y_train, X_valid, y_valid = time_split(df, valid_fraction, features)
+    build_start = time.perf_counter()
+    dtrain = xgb.QuantileDMatrix(X_train, y_train)
+    dvalid = xgb.QuantileDMatrix(X_valid, y_valid, ref=dtrain)
+    build_seconds = time.perf_counter() - build_start
+
+    workers, nthread = split_threads(n_trials, workers)
+    rng = np.random.default_rng(seed)
+    candidates = [sample_params(rng) for _ in range(n_trials)]
+
+    def run_trial(params):
+        start = time.perf_counter()
+        booster = xgb.train({**BASE_PARAMS, **params, "nthread": nthread, "seed": seed}, dtrain,
+                            num_boost_round=MAX_ROUNDS, evals=[(dvalid, "valid")],
+                            early_stopping_rounds=EARLY_STOPPING_ROUNDS, verbose_eval=False)
+        return {"params": params, "best_iteration": int(booster.best_iteration),
+                "valid_rmse": float(booster.best_score), "seconds": time.perf_counter() - start}
+
+    search_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        trials = list(executor.map(run_trial, candidates))
+    search_seconds = time.perf_counter() - search_start
+
+    best = min(trials, key=lambda trial: trial["valid_rmse"])
+    print(f"🔹 {n_trials} trials on {workers} workers x {nthread} threads in {search_seconds:.2f}s; "
+          f"best valid RMSE {best['valid_rmse']:.4f} at {best['best_iteration'] + 1} rounds")
+
+    # Refit on all rows (train + validation) with the selected settings and round count
+    model = XGBRegressor(n_estimators=best["best_iteration"] + 1, tree_method="hist", random_state=seed,
+                         max_depth=best["params"]["max_depth"], learning_rate=best["params"]["eta"],
+                         subsample=best["params"]["subsample"],
+                         colsample_bytree=best["params"]["colsample_bytree"],
+                         min_child_weight=best["params"]["min_child_weight"],
+                         reg_lambda=best["params"]["lambda"])
+    model.fit(pd.concat([X_train, X_valid]), pd.concat([y_train, y_valid]))
+    summary = {"workers": workers, "nthread": nthread, "dmatrix_seconds": build_seconds,
+               "search_seconds": search_seconds, "train_rows": len(X_train), "valid_rows": len(X_valid),
+               "best": best, "trials": sorted(trials, key=lambda trial: trial["valid_rmse"])}
+    return model, summary
+
+def trials_path(model_path):
+    """Trial summary file stored next to the model artifact."""
+    return os.path.splitext(model_path)[0] + ".trials.json"
+
+def save_summary(summary, model_path):
+    with open(trials_path(model_path), "w") as f:
+        json.dump(summary, f, indent=2)
@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# The modules under src/ import each other as top-level scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+
+class StubServer:
+    """Local HTTP server answering GETs from `routes`.
+
+    routes: {path: (status, body) or callable(query, hits) -> (status, body)}, where query is the
+    parsed query string and hits counts earlier requests to the path. Bodies that are not
+    bytes or str are sent as JSON; str bodies as CSV. Unknown paths get 404.
+    """
+
+    def __init__(self):
+        self.routes, self.requests = {}, []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urllib.parse.urlparse(self.path)
+                query = {key: values[0] for key, values in urllib.parse.parse_qs(url.query).items()}
+                hits = sum(path == url.path for path, _ in stub.requests)
+                stub.requests.append((url.path, query))
+                route = stub.routes.get(url.path, (404, {"error": "not found"}))
+                status, body = route(query, hits) if callable(route) else route
+                if isinstance(body, str):
+                    body, content_type = body.encode(), "text/csv"
+                elif isinstance(body, bytes):
+                    content_type = "application/octet-stream"
+                else:
+                    body, content_type = json.dumps(body).encode(), "application/json"
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def http_stub():
+    stub = StubServer()
+    yield stub
+    stub.close()
@@ -0,0 +1,33 @@
+import signal
+import numpy as np
+import pandas as pd
+import pytest
+import arima_search
+import train_model
+
+def yearly(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"Year": np.arange(1990, 1990 + n), "GDP Growth (%)": rng.normal(6, 1.5, n)})
+
+def test_no_candidates_returns_no_fit(tmp_path):
+    series = arima_search.prepare_series(yearly(8))
+    assert arima_search.candidate_orders(series, d=0) == []
+    ranking, best = arima_search.search_orders(series, criterion="aic", cache_dir=str(tmp_path))
+    assert best is None and ranking.empty
+
+def test_all_failed_fits_return_no_fit(tmp_path):
+    series = arima_search.prepare_series(yearly(30))
+    ranking, best = arima_search.search_orders(series, orders=[(-1, 0, 0), (0, 0, -1)], max_workers=1,
+                                               cache_dir=str(tmp_path))
+    assert best is None
+    assert ranking["status"].str.startswith("failed").all()
+
+def test_train_arima_search_falls_back_to_configured_order(tmp_path):
+    model = train_model.train_arima(yearly(8), order=(1, 0, 0), search=True, cache_dir=str(tmp_path))
+    assert model.model.order == (1, 0, 0)
+
+@pytest.mark.skipif(not hasattr(signal, "SIGALRM"), reason="fit timeouts need SIGALRM")
+def test_fit_timeout_is_reported_not_raised():
+    series = arima_search.prepare_series(yearly(30))
+    fit = arima_search._fit_worker(series, (2, 0, 2), 1e-6)
+    assert fit["status"] == "timeout"
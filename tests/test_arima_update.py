@@ -0,0 +1,126 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from arima_search import prepare_series
+from arima_update import update_arima, update_model_file, update_state
+from artifact_store import save_frame
+from forecast import forecast_arima
+from model_registry import arima_state, restore_arima
+
+
+def yearly(first=1990, last=2019, seed=0):
+    rng = np.random.default_rng(seed)
+    years = np.arange(first, last + 1)
+    values = np.empty(len(years))
+    values[0] = 6.0
+    for i in range(1, len(years)):
+        values[i] = 6.0 + 0.5 * (values[i - 1] - 6.0) + rng.normal(0, 1.0)
+    return pd.DataFrame({"Year": years, "GDP Growth (%)": values})
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    from statsmodels.tsa.arima.model import ARIMA
+    return ARIMA(prepare_series(yearly()), order=(1, 0, 0)).fit()
+
+
+def refiltered(results, series):
+    """The fitted parameters filtered over series from scratch."""
+    from statsmodels.tsa.arima.model import ARIMA
+    model = results.model
+    return ARIMA(series, order=model.order, trend=model.trend).filter(results.params)
+
+
+def test_appends_new_years_without_refitting(fitted):
+    series = prepare_series(yearly(last=2022))
+    updated, report = update_arima(fitted, series, refit="never")
+
+    assert (report["appended"], report["revised"], report["refit"]) == (3, 0, False)
+    assert report["last_year"] == "2022"
+    np.testing.assert_allclose(updated.params, fitted.params)
+    np.testing.assert_allclose(updated.forecast(3), refiltered(fitted, series).forecast(3))
+
+
+def test_missing_year_is_filtered_as_nan(fitted):
+    df = yearly(last=2022)
+    updated, report = update_arima(fitted, prepare_series(df[df["Year"] != 2021]), refit="never")
+
+    assert report["appended"] == 3 and report["last_year"] == "2022"
+    assert np.isnan(updated.model.endog[-2, 0])
+    expected = prepare_series(df).copy()
+    expected.loc[pd.Period("2021", freq="Y")] = np.nan
+    np.testing.assert_allclose(updated.forecast(2), refiltered(fitted, expected).forecast(2))
+
+
+def test_update_model_file_survives_a_missing_year(tmp_path, fitted):
+    model_path, features_path = str(tmp_path / "arima.pkl"), str(tmp_path / "features.arrow")
+    with open(model_path, "wb") as f:
+        pickle.dump(fitted, f)
+    df = yearly(last=2022)
+    save_frame(df[df["Year"] != 2020].reset_index(drop=True), features_path)
+
+    updated, report = update_model_file(model_path, features_path, refit="never")
+    assert report["last_year"] == "2022"
+    with open(model_path, "rb") as f:
+        assert str(pickle.load(f).fittedvalues.index[-1]) == "2022"
+
+
+def test_revisions_are_refiltered(fitted):
+    df = yearly()
+    df.loc[df["Year"] == 2005, "GDP Growth (%)"] += 0.1
+    series = prepare_series(df)
+    updated, report = update_arima(fitted, series, refit="drift")
+
+    assert (report["appended"], report["revised"], report["refit"]) == (0, 1, False)
+    np.testing.assert_allclose(updated.forecast(2), refiltered(fitted, series).forecast(2))
+
+
+def test_large_revision_triggers_a_refit(fitted):
+    df = yearly()
+    df.loc[df["Year"] == 2005, "GDP Growth (%)"] += 25.0
+    updated, report = update_arima(fitted, prepare_series(df), refit="drift")
+
+    assert report["revised"] == 1 and report["drift"] and report["refit"]
+    assert not np.allclose(updated.params, fitted.params)
+
+
+def test_drift_in_new_years_forces_a_refit(fitted):
+    df = yearly(last=2022)
+    df.loc[df["Year"] > 2019, "GDP Growth (%)"] = -20.0
+    quiet, _ = update_arima(fitted, prepare_series(df), refit="never")
+    updated, report = update_arima(fitted, prepare_series(df), refit="drift")
+
+    assert report["drift"] and report["refit"] and report["max_abs_z"] > 3.0
+    assert not np.allclose(updated.params, fitted.params)
+    np.testing.assert_allclose(quiet.params, fitted.params)
+
+
+def test_update_state_round_trips_through_json(fitted):
+    import json
+    series = prepare_series(yearly(last=2021))
+    state = json.loads(json.dumps(arima_state(fitted)))
+    new_state, report = update_state(state, series, refit="never")
+    new_state = json.loads(json.dumps(new_state))
+
+    assert report["appended"] == 2
+    assert new_state["start"] == "1990" and len(new_state["endog"]) == 32
+    direct, _ = update_arima(fitted, series, refit="never")
+    np.testing.assert_allclose(restore_arima(new_state).forecast(3), direct.forecast(3), rtol=1e-10)
+
+
+def test_forecast_arima_predicts_by_year_after_an_update(fitted):
+    updated, _ = update_arima(fitted, prepare_series(yearly(last=2022)), refit="never")
+
+    # Data through the model's last year: the forecast starts right after it
+    result = forecast_arima(updated, yearly(last=2022), steps=3)
+    assert result["Year"].tolist() == [2023, 2024, 2025]
+    np.testing.assert_allclose(result["GDP Growth (%) (ARIMA)"], updated.forecast(3))
+
+    # Data that ends before the update: the labels still pick the matching years
+    result = forecast_arima(updated, yearly(last=2020), steps=3)
+    assert result["Year"].tolist() == [2021, 2022, 2023]
+    expected = updated.predict(start=pd.Period("2021", freq="Y"), end=pd.Period("2023", freq="Y"))
+    np.testing.assert_allclose(result["GDP Growth (%) (ARIMA)"], expected)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import backtest
+from backtest import TARGET, run_backtest
+
+MIN_TRAIN, HORIZON = 12, 3
+XGB_PARAMS = {"n_estimators": 5, "max_depth": 2}
+
+
+def yearly(n=18, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"Year": np.arange(2000, 2000 + n), TARGET: rng.normal(6, 1.5, n),
+                         "Inflation Rate (%)": rng.normal(5, 1, n)})
+
+
+@pytest.fixture
+def worker_for():
+    """Sets up the backtest worker state in this process for a frame."""
+    from train_model import train_arima
+
+    def init(df):
+        arima_base = train_arima(df.iloc[:MIN_TRAIN], order=(1, 0, 0))
+        backtest._init_worker(df, arima_base, MIN_TRAIN, HORIZON, XGB_PARAMS)
+    yield init
+    backtest._worker.clear()
+
+
+@pytest.mark.parametrize("origin", [MIN_TRAIN, MIN_TRAIN + 3])
+def test_each_origin_only_sees_rows_before_it(worker_for, origin):
+    df = yearly()
+    worker_for(df)
+    expected = backtest._forecast_origin(origin)
+
+    # Overwrite everything from the origin on: forecasts made at the origin must not change
+    leaked = df.copy()
+    leaked.loc[origin:, [TARGET, "Inflation Rate (%)"]] = 1e3
+    worker_for(leaked)
+    pd.testing.assert_frame_equal(backtest._forecast_origin(origin), expected)
+
+    assert (expected["origin"] == df["Year"].iloc[origin - 1]).all()
+    assert sorted(expected["horizon"].unique()) == list(range(1, HORIZON + 1))
+
+
+def test_hybrid_metrics_come_from_out_of_sample_forecasts():
+    df = yearly()
+    detail, errors = run_backtest(df, min_train=MIN_TRAIN, horizon=HORIZON, order=(1, 0, 0),
+                                  xgb_params=XGB_PARAMS, max_workers=2)
+
+    assert (detail["Year"] > detail["origin"]).all()
+    assert detail["origin"].min() == df["Year"].iloc[MIN_TRAIN - 1]
+    forecasts = detail.pivot_table(index=["origin", "Year"], columns="model", values="forecast")
+    np.testing.assert_allclose(forecasts["Hybrid"], 0.5 * forecasts["ARIMA"] + 0.5 * forecasts["XGBoost"])
+
+    hybrid = detail[detail["model"] == "Hybrid"]
+    actual = hybrid["Year"].map(df.set_index("Year")[TARGET])
+    rmse = ((hybrid["forecast"] - actual) ** 2).groupby(hybrid["horizon"]).mean() ** 0.5
+    table = errors[errors["model"] == "Hybrid"].set_index("horizon")
+    np.testing.assert_allclose(table["rmse"], rmse.loc[table.index])
+    # Forecasts past the data's last year have no actual and are not scored
+    assert table["n"].tolist() == [len(df) - MIN_TRAIN - h + 1 for h in table.index]
@@ -0,0 +1,68 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from batch_training import default_jobs, run_batch, slug, write_matrix
+
+TARGET = "GDP Growth (%)"
+
+
+def panel(rows=(30, 20, 5), seed=0):
+    """Entities A, B and a too-short C, interleaved so write_matrix has to sort them."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for entity, n in zip("ABC", rows):
+        frames.append(pd.DataFrame({"Country": entity, "Year": np.arange(2024 - n, 2024),
+                                    TARGET: rng.normal(6, 1.5, n), "Exports": rng.normal(100, 10, n),
+                                    "Exports_lag1": rng.normal(100, 10, n)}))
+    return pd.concat(frames).sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def test_slugs_keep_distinct_names_apart():
+    assert slug("GDP Growth (%)") != slug("GDP Growth")
+    assert slug("GDP Growth (%)").startswith("GDP_Growth-")
+    assert slug("GDP Growth (%)") == slug("GDP Growth (%)")
+
+
+def test_write_matrix_gives_contiguous_entity_ranges(tmp_path):
+    df = panel()
+    path = str(tmp_path / "panel.npy")
+    columns, ranges = write_matrix(df, path)
+
+    assert columns == ["Year", TARGET, "Exports", "Exports_lag1"]
+    assert ranges == {"A": (0, 30), "B": (30, 50), "C": (50, 55)}
+    matrix = np.load(path)
+    for entity, (start, stop) in ranges.items():
+        expected = df[df["Country"] == entity].sort_values("Year")[columns].to_numpy()
+        np.testing.assert_array_equal(matrix[start:stop], expected)
+
+
+def test_default_jobs():
+    df = panel()
+    assert default_jobs(df) == [(entity, TARGET) for entity in df["Country"].unique()]
+    # Without GDP growth every raw column is a target; engineered ones never are
+    df = df.drop(columns=[TARGET])
+    df.loc[df["Country"] == "B", "Exports"] = np.nan
+    assert sorted(default_jobs(df)) == [("A", "Exports"), ("C", "Exports")]
+
+
+def test_run_batch_writes_artifacts_and_reports_every_status(tmp_path):
+    jobs = [("A", TARGET), ("B", TARGET), ("C", TARGET), ("Z", TARGET)]
+    summary = run_batch(panel(), jobs, output_dir=str(tmp_path), workers=2, order=(1, 0, 0),
+                        xgb_params={"n_estimators": 5})
+
+    status = dict(zip(summary["entity"], summary["status"]))
+    assert status == {"A": "ok", "B": "ok", "C": "skipped", "Z": "error"}
+    assert summary["pid"].nunique() <= 2
+    for entity, rows in [("A", 30), ("B", 20)]:
+        job_dir = os.path.join(str(tmp_path), slug(entity), slug(TARGET))
+        assert sorted(os.listdir(job_dir)) == ["arima.json", "job.json", "xgboost.ubj"]
+        with open(os.path.join(job_dir, "job.json")) as f:
+            job = json.load(f)
+        assert (job["entity"], job["target"], job["rows"], job["order"]) == (entity, TARGET, rows, [1, 0, 0])
+    errors = dict(zip(summary["entity"], summary["error"]))
+    assert "fewer than" in errors["C"] and errors["Z"].startswith("KeyError")
+    # Only the job directories are left behind; the shared matrix's temp dir is removed
+    assert sorted(os.listdir(str(tmp_path))) == sorted([slug("A"), slug("B")])
@@ -0,0 +1,22 @@
+import pytest
+
+from benchmark_suite import find_entry
+
+HISTORY = [{"commit": "1234567abc"}, {"commit": "89abcdef01"}, {"commit": "1234567abc"}, {"commit": "fedcba9876"}]
+
+
+def test_commit_prefix_wins_over_index():
+    assert find_entry(HISTORY, "1234567") is HISTORY[2]
+    assert find_entry(HISTORY, "89") is HISTORY[1]
+
+
+def test_small_integers_are_indices():
+    assert find_entry(HISTORY, "-2") is HISTORY[2]
+    assert find_entry(HISTORY, "0") is HISTORY[0]
+    assert find_entry(HISTORY, "3") is HISTORY[3]
+
+
+@pytest.mark.parametrize("ref", ["5550000", "-5", "abc"])
+def test_unknown_refs_raise(ref):
+    with pytest.raises(KeyError):
+        find_entry(HISTORY, ref)
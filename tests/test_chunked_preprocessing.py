@@ -0,0 +1,67 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from artifact_store import load_frame
+from config import PATHS
+import chunked_preprocessing
+import data_preprocessing
+
+def panel(entities=6, years=15, seed=0):
+    """Small (Country, Year, indicators) panel with leading and interior gaps."""
+    rng = np.random.default_rng(seed)
+    columns = data_preprocessing.FEATURES_TO_SCALE[:4] + ["GDP Growth (%)"]
+    df = pd.DataFrame(rng.normal(5, 2, size=(entities * years, len(columns))), columns=columns)
+    df.insert(0, "Year", np.tile(np.arange(2000, 2000 + years), entities))
+    df.insert(0, "Country", np.repeat([f"C{i}" for i in range(entities)], years))
+    df.iloc[::4, 2] = np.nan
+    df.loc[df["Year"] < 2003, columns[1]] = np.nan
+    return df
+
+def in_memory(df, entity_col):
+    cleaned = data_preprocessing.clean_data(df, entity_col=entity_col)
+    features = [col for col in data_preprocessing.FEATURES_TO_SCALE if col in cleaned.columns]
+    if entity_col is None:
+        return data_preprocessing.scale_features(cleaned, features)[0]
+    scaled = data_preprocessing.scale_features(cleaned.drop(columns=[entity_col]), features)[0]
+    scaled.insert(0, entity_col, cleaned[entity_col].to_numpy())
+    return scaled
+
+def chunked(df, tmp_path, entity_col, chunk_rows):
+    source = os.path.join(tmp_path, "raw.csv")
+    df.to_csv(source, index=False)
+    output = os.path.join(tmp_path, "cleaned.arrow")
+    chunked_preprocessing.run(source, output, entity_col=entity_col, chunk_rows=chunk_rows, csv_export=False,
+                              partitions=3)
+    return load_frame(output)
+
+def assert_same(expected, actual, keys):
+    expected = expected.sort_values(keys, ignore_index=True)
+    actual = actual.sort_values(keys, ignore_index=True)
+    pd.testing.assert_frame_equal(expected, actual, check_dtype=False)
+
+@pytest.mark.parametrize("shuffle", [False, True])
+@pytest.mark.parametrize("chunk_rows", [7, 1000])
+def test_single_country_matches_in_memory(tmp_path, shuffle, chunk_rows):
+    raw = pd.read_csv(PATHS["raw_data"])
+    if shuffle:
+        raw = raw.sample(frac=1, random_state=1)
+    expected = in_memory(raw, None)
+    assert_same(expected, chunked(raw, tmp_path, None, chunk_rows), ["Year"])
+
+@pytest.mark.parametrize("shuffle", [False, True])
+@pytest.mark.parametrize("chunk_rows", [7, 1000])
+def test_panel_matches_in_memory(tmp_path, shuffle, chunk_rows):
+    raw = panel()
+    if shuffle:
+        raw = raw.sample(frac=1, random_state=2)
+    expected = in_memory(raw, "Country")
+    assert_same(expected, chunked(raw, tmp_path, "Country", chunk_rows), ["Country", "Year"])
+
+def test_scan_detects_order():
+    raw = panel()
+    chunks = [raw.iloc[i:i + 10] for i in range(0, len(raw), 10)]
+    assert chunked_preprocessing.scan(chunks, "Country")["ordered"]
+    shuffled = raw.sample(frac=1, random_state=3)
+    assert not chunked_preprocessing.scan([shuffled], "Country")["ordered"]
+    assert not chunked_preprocessing.scan([raw.iloc[::-1]], None)["ordered"]
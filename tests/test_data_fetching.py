@@ -0,0 +1,82 @@
+import pytest
+import requests
+
+import data_fetching
+from data_fetching import BACKOFF_FACTOR, MAX_RETRIES, fetch_indicators, fetch_world_bank_data
+
+INDICATOR_PATH = "/v2/country/IND/indicator/{}"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Records backoff sleeps instead of waiting them out."""
+    recorded = []
+    monkeypatch.setattr(data_fetching.time, "sleep", recorded.append)
+    return recorded
+
+
+def paged(records, per_page):
+    """Route serving records in World Bank pages of per_page."""
+    pages = -(-len(records) // per_page)
+
+    def route(query, hits):
+        page = int(query["page"])
+        return 200, [{"page": page, "pages": pages, "per_page": per_page, "total": len(records)},
+                     records[(page - 1) * per_page:page * per_page]]
+    return route
+
+
+def test_fetch_world_bank_data_follows_every_page(http_stub, sleeps):
+    records = [{"date": str(year), "value": year / 100} for year in range(2010, 1999, -1)]
+    path = INDICATOR_PATH.format("NY.GDP.MKTP.KD.ZG")
+    http_stub.routes[path] = paged(records, per_page=4)
+
+    df = fetch_world_bank_data("NY.GDP.MKTP.KD.ZG", start_year=2000, end_year=2010, base_url=http_stub.url + "/v2",
+                               per_page=4)
+
+    assert [query["page"] for _, query in http_stub.requests] == ["1", "2", "3"]
+    assert {query["per_page"] for _, query in http_stub.requests} == {"4"}
+    assert df["Year"].tolist() == list(range(2000, 2011))
+    assert df["Value"].tolist() == [year / 100 for year in range(2000, 2011)]
+    assert sleeps == []
+
+
+def test_fetch_world_bank_data_retries_server_errors(http_stub, sleeps):
+    path = INDICATOR_PATH.format("FP.CPI.TOTL.ZG")
+    pages = paged([{"date": "2001", "value": 3.5}, {"date": "2000", "value": None}], per_page=1000)
+    http_stub.routes[path] = lambda query, hits: (503, {"error": "busy"}) if hits < 2 else pages(query, hits)
+    latencies = []
+
+    df = fetch_world_bank_data("FP.CPI.TOTL.ZG", base_url=http_stub.url + "/v2", latencies=latencies)
+
+    assert df.to_dict("list") == {"Year": [2001], "Value": [3.5]}
+    assert [entry["status"] for entry in latencies] == [503, 503, 200]
+    assert sleeps == [BACKOFF_FACTOR, 2 * BACKOFF_FACTOR]
+
+
+def test_fetch_world_bank_data_raises_once_retries_run_out(http_stub, sleeps):
+    path = INDICATOR_PATH.format("FP.CPI.TOTL.ZG")
+    http_stub.routes[path] = (500, {"error": "down"})
+
+    with pytest.raises(requests.HTTPError):
+        fetch_world_bank_data("FP.CPI.TOTL.ZG", base_url=http_stub.url + "/v2")
+    assert len(http_stub.requests) == MAX_RETRIES + 1
+    assert len(sleeps) == MAX_RETRIES
+
+
+def test_fetch_indicators_keeps_the_requested_order(http_stub, sleeps):
+    for code, value in [("NY.GDP.MKTP.KD.ZG", 6.5), ("FP.CPI.TOTL.ZG", 4.0)]:
+        records = [{"date": str(year), "value": value + year - 2000} for year in (2002, 2001, 2000)]
+        http_stub.routes[INDICATOR_PATH.format(code)] = paged(records, per_page=2)
+    indicators = {"GDP Growth (%)": "NY.GDP.MKTP.KD.ZG", "Unmapped": None, "Inflation (%)": "FP.CPI.TOTL.ZG"}
+
+    frames = fetch_indicators(indicators, start_year=2000, end_year=2002, max_workers=2,
+                              base_url=http_stub.url + "/v2")
+
+    assert list(frames) == ["GDP Growth (%)", "Inflation (%)"]
+    assert frames["GDP Growth (%)"]["Value"].to_dict() == {2000: 6.5, 2001: 7.5, 2002: 8.5}
+    assert frames["Inflation (%)"]["Value"].to_dict() == {2000: 4.0, 2001: 5.0, 2002: 6.0}
+    # The server pages by two whatever per_page asks for, so each indicator takes two requests
+    assert sorted((path, query["page"]) for path, query in http_stub.requests) == [
+        (INDICATOR_PATH.format(code), page) for code in ("FP.CPI.TOTL.ZG", "NY.GDP.MKTP.KD.ZG") for page in "12"]
+    assert all(query["date"] == "2000:2002" and query["per_page"] == "1000" for _, query in http_stub.requests)
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_engine import build_features, group_ids, rolling_mean_std
+
+
+def two_pass_std(values, entity, window):
+    std = np.full(values.shape, np.nan)
+    for i in range(len(values)):
+        start = max(i - window + 1, np.searchsorted(entity, entity[i]))
+        for j in range(values.shape[1]):
+            observed = values[start:i + 1, j][~np.isnan(values[start:i + 1, j])]
+            if len(observed) > 1:
+                std[i, j] = np.std(observed, ddof=1)
+    return std
+
+
+@pytest.mark.parametrize("window", [1, 2, 3, 5, 12, 40])
+@pytest.mark.parametrize("entities", [1, 6])
+def test_rolling_mean_std_matches_pandas(window, entities):
+    rng = np.random.default_rng(window * 10 + entities)
+    df = pd.DataFrame(np.cumsum(rng.normal(0, 1, (300, 3)), axis=0) + [0.0, 80.0, 1e3], columns=list("abc"))
+    df.insert(0, "Country", np.sort(rng.integers(0, entities, len(df))))
+    df.iloc[rng.random(len(df)) < 0.1, 1] = np.nan
+    values = df[["a", "b", "c"]].to_numpy()
+    mean, std = np.empty_like(values), np.empty_like(values)
+    rolling_mean_std(values, window, group_ids(df, "Country"), mean, std)
+
+    rolling = df.groupby("Country", sort=False)[["a", "b", "c"]].rolling(window, min_periods=1)
+    expected_mean = rolling.mean().reset_index(level=0, drop=True).sort_index().to_numpy()
+    np.testing.assert_allclose(mean, expected_mean, rtol=1e-12, atol=1e-12)
+    # pandas' online rolling variance is itself off by up to ~1e-6 here, so compare with two passes
+    np.testing.assert_allclose(std, two_pass_std(values, df["Country"].to_numpy(), window), rtol=1e-7)
+
+
+def test_rolling_mean_std_empty():
+    values = np.empty((0, 2))
+    mean, std = np.empty_like(values), np.empty_like(values)
+    rolling_mean_std(values, 3, np.zeros(0, dtype=np.int64), mean, std)
+    assert mean.shape == std.shape == (0, 2)
+
+
+def test_float32_build_rounds_the_float64_features_once():
+    rng = np.random.default_rng(0)
+    # Slow-moving levels give growth rates near zero, where rounding the ratio would show
+    df = pd.DataFrame(1e3 + np.cumsum(rng.normal(0, 1e-3, (200, 2)), axis=0), columns=["a", "b"])
+    df.insert(0, "Country", np.repeat(["X", "Y"], 100))
+    df.insert(1, "Year", np.tile(np.arange(2000, 2100), 2))
+    kwargs = dict(lags=[1, 2], windows=[3], group_col="Country", interactions=False)
+    wide = build_features(df, ["a", "b"], dtype=np.float64, **kwargs)
+    narrow = build_features(df, ["a", "b"], dtype=np.float32, **kwargs)
+    engineered = wide.columns[4:]
+    assert (narrow[engineered].dtypes == np.float32).all()
+    np.testing.assert_array_equal(narrow[engineered].to_numpy(), wide[engineered].to_numpy(dtype=np.float32))
+
+
+@pytest.mark.parametrize("gap", [slice(10, 15), slice(10, 20), slice(0, 5)])
+def test_rolling_std_keeps_precision_around_an_all_nan_block(gap):
+    rng = np.random.default_rng(1)
+    values = 1e6 + rng.normal(0, 1e-3, (40, 2))
+    values[gap, 0] = np.nan
+    mean, std = np.empty_like(values), np.empty_like(values)
+    rolling_mean_std(values, 5, np.zeros(len(values), dtype=np.int64), mean, std)
+
+    expected = two_pass_std(values, np.zeros(len(values)), 5)
+    np.testing.assert_array_equal(np.isnan(std), np.isnan(expected))
+    np.testing.assert_allclose(std, expected, rtol=1e-4)
@@ -0,0 +1,98 @@
+import json
+import threading
+import time
+import types
+import urllib.error
+import urllib.request
+
+import pytest
+
+from forecast_server import ForecastHTTPServer, ForecastService, ModelStore, make_handler
+
+
+@pytest.fixture
+def server_url():
+    store = types.SimpleNamespace(snapshot={"version": "v1", "forecaster": types.SimpleNamespace(
+        columns=["GDP Growth (%)", "Inflation Rate (%)"])})
+    service = ForecastService(store, window=0.0)
+    service.batcher._forecast = lambda snapshot, batch: [
+        {"version": snapshot["version"], "horizon": horizon, "scenario": dict(scenario)} for horizon, scenario, _ in batch]
+    server = ForecastHTTPServer(("127.0.0.1", 0), make_handler(service))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def call(url, body=None):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_valid_requests(server_url):
+    assert call(f"{server_url}/forecast?horizon=2&scenario=%7B%22Inflation%20Rate%20(%25)%22%3A%205%7D") == (
+        200, {"version": "v1", "horizon": 2, "scenario": {"Inflation Rate (%)": 5.0}})
+    body = json.dumps({"horizon": 3, "scenario": {"Inflation Rate (%)": 4}}).encode()
+    assert call(f"{server_url}/forecast", body)[1]["horizon"] == 3
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/forecast?scenario=not-json", None),
+    ("/forecast?scenario=%5B1%5D", None),
+    ("/forecast?horizon=abc", None),
+    ("/forecast", b"{not json"),
+    ("/forecast", b"[1, 2]"),
+    ("/forecast", b'{"scenario": "high"}'),
+    ("/forecast", b'{"horizon": null}'),
+    ("/forecast", b'{"horizon": 99}'),
+    ("/forecast", b'{"horizon": 2.7}'),
+    ("/forecast", b'{"horizon": true}'),
+    ("/forecast", b'{"horizon": 0}'),
+    ("/forecast", b'{"horizon": -3}'),
+    ("/forecast?horizon=2.7", None),
+    ("/forecast?horizon=-1", None),
+    ("/forecast", b'{"scenario": {"Inflation Rate (%)": [1]}}'),
+    ("/forecast", b'{"scenario": {"Unknown": 1}}'),
+])
+def test_malformed_requests_are_400(server_url, path, body):
+    status, payload = call(server_url + path, body)
+    assert status == 400
+    assert "error" in payload
+
+
+class JsonModelStore(ModelStore):
+    """Loads one JSON document, which raises JSONDecodeError (not OSError) when half-written."""
+
+    def reload(self):
+        signature = self.signature()
+        with open(self.paths[0]) as f:
+            self.snapshot = {"signature": signature, "model": json.load(f)}
+
+
+def test_watch_survives_a_corrupt_artifact(tmp_path, capsys):
+    path = tmp_path / "model.json"
+    path.write_text('{"version": 1}')
+    missing = str(tmp_path / "missing")
+    store = JsonModelStore(str(path), missing, missing, missing)
+    stop = threading.Event()
+    watcher = threading.Thread(target=store.watch, kwargs={"interval": 0.01, "stop": stop}, daemon=True)
+    watcher.start()
+    try:
+        path.write_text('{"vers')
+        deadline = time.monotonic() + 5
+        while "Reload skipped" not in capsys.readouterr().out and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert store.snapshot["model"] == {"version": 1}
+
+        path.write_text('{"version": 2}')
+        while store.snapshot["model"] != {"version": 2} and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert store.snapshot["model"] == {"version": 2}
+        assert watcher.is_alive()
+    finally:
+        stop.set()
+        watcher.join()
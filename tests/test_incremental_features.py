@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_engineering import create_growth_rate_features, create_lag_features, create_rolling_features
+from incremental_features import FeatureState
+
+# FeatureState also builds the interaction features, which read these indicators
+COLUMNS = ["GDP Growth (%)", "FDI (Billion USD)", "Exports (Billion USD)", "Imports (Billion USD)",
+           "Money Supply (M3) Growth (%)"]
+LAGS = [1, 3]
+WINDOWS = [2, 4]
+
+
+def synthetic(group_col=None, years=range(2000, 2016), seed=0):
+    rng = np.random.default_rng(seed)
+    entities = ["X", "Y"] if group_col else [None]
+    frames = []
+    for entity in entities:
+        df = pd.DataFrame(rng.uniform(1, 20, (len(years), len(COLUMNS))), columns=COLUMNS)
+        df.insert(0, "Year", list(years))
+        if group_col:
+            df.insert(0, group_col, entity)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def reference(df, group_col=None):
+    """The pandas feature chain on the full history."""
+    df = create_lag_features(df.copy(), COLUMNS, LAGS, group_col)
+    df = create_rolling_features(df, COLUMNS, WINDOWS, group_col)
+    return create_growth_rate_features(df, COLUMNS, group_col)
+
+
+@pytest.mark.parametrize("group_col", [None, "Country"])
+def test_update_matches_pandas_chain(group_col):
+    df = synthetic(group_col)
+    keys = [group_col, "Year"] if group_col else ["Year"]
+    cutoff = 2012
+    state = FeatureState.from_frame(df[df["Year"] <= cutoff], COLUMNS, LAGS, WINDOWS, group_col)
+    incremental = pd.concat([state.update(df[df["Year"] == year]) for year in range(cutoff + 1, 2016)],
+                            ignore_index=True).sort_values(keys, ignore_index=True)
+
+    expected = reference(df, group_col)
+    expected = expected[expected["Year"] > cutoff].sort_values(keys, ignore_index=True)
+    columns = [col for col in expected.columns if col != group_col]  # Interaction and cyclical columns aside
+    assert len(incremental) == len(expected)
+    np.testing.assert_allclose(incremental[columns].to_numpy(dtype=float), expected[columns].to_numpy(dtype=float),
+                               rtol=1e-12, atol=1e-12)
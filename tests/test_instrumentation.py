@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+import instrumentation
+from instrumentation import configure, instrument, load_events, log
+
+
+@pytest.fixture
+def restore_config():
+    yield
+    configure()
+
+
+@instrument
+def stage():
+    log("📂 Loading dataset...")
+    return 1
+
+
+def test_messages_print_when_instrumentation_is_off(capsys):
+    configure()
+    stage()
+    captured = capsys.readouterr()
+    assert captured.out == "📂 Loading dataset...\n"
+    assert captured.err == ""
+
+
+def test_messages_become_stage_events_on_stderr_without_a_print(capsys, restore_config):
+    configure(events="-")
+    stage()
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    events = [json.loads(line) for line in captured.err.splitlines()]
+    assert [e["event"] for e in events] == ["log", "stage"]
+    assert events[0]["message"] == "📂 Loading dataset..."
+    assert events[0]["stage"] == events[1]["stage"] == instrumentation._label(stage)
+
+
+def test_messages_are_printed_and_recorded_with_an_events_file(tmp_path, capsys, restore_config):
+    path = tmp_path / "events.jsonl"
+    configure(events=str(path))
+    stage()
+    assert capsys.readouterr().out == "📂 Loading dataset...\n"
+    assert [e["event"] for e in load_events(path)] == ["log", "stage"]
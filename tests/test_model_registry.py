@@ -0,0 +1,75 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from model_registry import ModelVersion, list_versions, prune_versions, save_version
+from stacking import StackedEnsemble
+
+
+def oos_matrix(rows=40, seed=0):
+    rng = np.random.default_rng(seed)
+    actual = rng.normal(6, 2, rows)
+    return pd.DataFrame({
+        "origin": np.repeat(np.arange(rows // 2), 2), "horizon": np.tile([1, 2], rows // 2), "Year": np.arange(rows),
+        "actual": actual, "ARIMA": actual + rng.normal(0, 1.5, rows), "XGBoost": actual + rng.normal(0, 0.5, rows),
+    })
+
+
+@pytest.fixture(scope="module")
+def base_models():
+    from statsmodels.tsa.arima.model import ARIMA
+    from xgboost import XGBRegressor
+    train = pd.DataFrame({"Year": np.arange(1990, 2020), "GDP Growth (%)": np.sin(np.arange(30)) + 6.0,
+                          "x": np.arange(30, dtype=float)})
+    series = pd.Series(train["GDP Growth (%)"].to_numpy(), index=pd.period_range("1990", periods=30, freq="Y"))
+    arima = ARIMA(series, order=(1, 0, 0)).fit()
+    xgb = XGBRegressor(n_estimators=5).fit(train[["x"]], train["GDP Growth (%)"])
+    return arima, xgb, train
+
+
+@pytest.mark.parametrize("method", ["weights", "residual"])
+def test_version_round_trips_stacked_ensemble(tmp_path, base_models, method):
+    arima, xgb, train = base_models
+    ensemble = StackedEnsemble(method, params={"n_estimators": 5}).fit(oos_matrix())
+    save_version(arima, xgb, train, ensemble=ensemble, registry_dir=str(tmp_path))
+
+    version = ModelVersion(registry_dir=str(tmp_path))
+    assert version.manifest["hybrid"]["method"] == method
+    forecasts, horizons = {"ARIMA": np.array([5.0, 6.0, 7.0]), "XGBoost": np.array([6.5, 6.0, 5.5])}, [1, 2, 3]
+    np.testing.assert_allclose(version.ensemble.combine(forecasts, horizons), ensemble.combine(forecasts, horizons),
+                               rtol=1e-6)
+    if method == "weights":
+        assert version.manifest["hybrid"]["weights"] == pytest.approx(
+            dict(zip(ensemble.models, ensemble.weights["pooled"])))
+
+
+def test_version_without_ensemble_records_fixed_blend(tmp_path, base_models):
+    save_version(*base_models, registry_dir=str(tmp_path))
+    version = ModelVersion(registry_dir=str(tmp_path))
+    assert version.ensemble is None
+    assert version.manifest["hybrid"] == {"method": "fixed", "weights": {"ARIMA": 0.5, "XGBoost": 0.5}}
+
+
+def test_version_reproduces_base_model_forecasts(tmp_path, base_models):
+    arima, xgb, train = base_models
+    save_version(arima, xgb, train, registry_dir=str(tmp_path))
+    version = ModelVersion(registry_dir=str(tmp_path))
+
+    assert version.manifest["files"]["xgboost"] == "xgboost.ubj.gz"
+    np.testing.assert_allclose(version.xgboost.predict(train[["x"]]), xgb.predict(train[["x"]]))
+    np.testing.assert_allclose(version.arima.forecast(3), arima.forecast(3), rtol=1e-10)
+    np.testing.assert_allclose(version.arima.get_forecast(3).conf_int(), arima.get_forecast(3).conf_int(), rtol=1e-8)
+
+
+def test_crashed_saves_are_neither_listed_nor_pruned(tmp_path, base_models):
+    version = save_version(*base_models, registry_dir=str(tmp_path))
+    # What a save_version that died between writing the manifest and the rename leaves behind
+    crashed = os.path.join(str(tmp_path), "20000101T000000-deadbeef.tmp")
+    shutil.copytree(os.path.join(str(tmp_path), version), crashed)
+
+    assert list_versions(str(tmp_path))["version"].tolist() == [version]
+    assert prune_versions(keep=0, registry_dir=str(tmp_path)) == []
+    assert os.path.isdir(crashed)
@@ -0,0 +1,11 @@
+from config import resolve_paths
+from pipeline import build_stages, stage_dependencies
+
+
+def test_forecast_stage_reads_the_published_registry_version(tmp_path):
+    stages = {stage.name: stage for stage in build_stages(resolve_paths(root=str(tmp_path)))}
+    deps = stage_dependencies(stages.values())
+    assert deps["publish"] == {"preprocess", "features", "train_arima", "train_xgboost", "train_hybrid"}
+    assert deps["forecast"] == {"preprocess", "features", "publish"}
+    assert stages["forecast"].params["model_version"] == "current"
+    assert not stages["publish"].cacheable
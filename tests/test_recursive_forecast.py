@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_engine import build_features
+from feature_registry import build_registry
+from recursive_forecast import TARGET, RecursiveForecaster
+
+# The interaction features read these indicators
+COLUMNS = [TARGET, "FDI (Billion USD)", "Exports (Billion USD)", "Imports (Billion USD)",
+           "Money Supply (M3) Growth (%)"]
+LAGS = [1, 2]
+WINDOWS = [2, 3]
+STEPS = 4
+
+
+def history(years=30, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.uniform(1, 20, (years, len(COLUMNS))), columns=COLUMNS)
+    df.insert(0, "Year", np.arange(1990, 1990 + years))
+    return df
+
+
+@pytest.fixture(scope="module")
+def model():
+    from xgboost import XGBRegressor
+    features = build_features(history(), COLUMNS, LAGS, WINDOWS)
+    X = features.drop(columns=[TARGET, "Year"])
+    return XGBRegressor(n_estimators=20, max_depth=3).fit(X, features[TARGET])
+
+
+def forecaster(model):
+    return RecursiveForecaster(model, build_registry(COLUMNS, LAGS, WINDOWS))
+
+
+def one_step_at_a_time(model, df, steps, exog=None):
+    """Appends one year at a time, rebuilds every feature with build_features and predicts it.
+
+    The new year's target is unknown while its features are built, so it holds the previous
+    value until the prediction replaces it (the forecaster's placeholder).
+    """
+    names = model.get_booster().feature_names
+    df = df.copy()
+    predictions = []
+    for step in range(steps):
+        row = df.iloc[[-1]].copy()
+        row["Year"] += 1
+        if exog is not None:
+            row[COLUMNS[1:]] = exog[step, 1:]
+        df = pd.concat([df, row], ignore_index=True)
+        features = build_features(df, COLUMNS, LAGS, WINDOWS)
+        X = features[names].iloc[[-1]].replace([np.inf, -np.inf], 0.0)
+        predictions.append(float(model.predict(X)[0]))
+        df.loc[df.index[-1], TARGET] = predictions[-1]
+    return np.array(predictions)
+
+
+def test_recursive_forecast_matches_rebuilding_features_each_step(model):
+    df = history()
+    expected = one_step_at_a_time(model, df, STEPS)
+    actual = forecaster(model).forecast_frame(df, STEPS)[0]
+    np.testing.assert_allclose(actual, expected, rtol=1e-6)
+
+
+def test_batched_paths_match_one_path_at_a_time(model):
+    df = history()
+    paths = forecaster(model)
+    rng = np.random.default_rng(1)
+    last = df[paths.columns].to_numpy()[-1]
+    exog = last * rng.uniform(0.5, 1.5, (3, STEPS, len(paths.columns)))
+
+    batched = paths.forecast_frame(df, STEPS, n_paths=3, exog=exog)
+    for path in range(3):
+        # Put the scenario back in COLUMNS order for the reference loop
+        scenario = np.stack([exog[path, :, paths.columns.index(col)] for col in COLUMNS], axis=1)
+        np.testing.assert_allclose(batched[path], one_step_at_a_time(model, df, STEPS, scenario), rtol=1e-6)
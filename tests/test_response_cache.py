@@ -0,0 +1,23 @@
+import threading
+
+from response_cache import ResponseCache
+
+
+def test_counters_are_exact_under_concurrent_lookups():
+    cache = ResponseCache(":memory:")
+    cache.get_or_load("warm", "worldbank", lambda: 1)
+    threads, per_thread = 8, 200
+
+    def work(i):
+        for j in range(per_thread):
+            cache.get_or_load("warm", "worldbank", lambda: 1)
+            cache.get_or_load(f"cold-{i}-{j}", "worldbank", lambda: 2)
+
+    workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    stats = cache.stats()
+    assert stats["hits"] == threads * per_thread
+    assert stats["misses"] == threads * per_thread + 1
@@ -0,0 +1,91 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import scenarios
+from arima_search import prepare_series
+from artifact_store import save_frame
+from scenarios import MODELS, StreamingQuantiles, run_scenarios
+
+TARGET = "GDP Growth (%)"
+FEATURES = [f"{TARGET}_lag1", "Inflation Rate (%)_lag1", "Inflation Rate (%)_roll_mean3"]
+N_PATHS, BATCH_SIZE, STEPS, SEED = 600, 200, 3, 7
+
+
+@pytest.fixture(scope="module")
+def artifacts(tmp_path_factory):
+    """ARIMA and XGBoost pickles plus the cleaned data they forecast from; no hybrid model."""
+    from statsmodels.tsa.arima.model import ARIMA
+    from xgboost import XGBRegressor
+    from feature_engine import build_features
+
+    root = tmp_path_factory.mktemp("scenarios")
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"Year": np.arange(1990, 2020), TARGET: rng.normal(6, 1.5, 30),
+                       "Inflation Rate (%)": rng.normal(5, 1, 30)})
+    features = build_features(df, [TARGET, "Inflation Rate (%)"], [1], [3], interactions=False)
+    xgb = XGBRegressor(n_estimators=10, max_depth=2).fit(features[FEATURES], features[TARGET])
+    arima = ARIMA(prepare_series(df), order=(1, 0, 0)).fit()
+
+    paths = {"arima_path": str(root / "arima.pkl"), "xgb_path": str(root / "xgb.pkl"),
+             "cleaned_path": str(root / "cleaned.arrow"), "hybrid_path": str(root / "missing.pkl")}
+    for model, key in [(arima, "arima_path"), (xgb, "xgb_path")]:
+        with open(paths[key], "wb") as f:
+            pickle.dump(model, f)
+    save_frame(df, paths["cleaned_path"])
+    yield paths
+    scenarios._worker.clear()
+
+
+def simulate(artifacts, workers):
+    fan, _ = run_scenarios(N_PATHS, STEPS, BATCH_SIZE, max_workers=workers, seed=SEED, **artifacts)
+    return fan
+
+
+def all_paths():
+    """Regenerates every path run_scenarios drew, with its seeds, plus the histogram bin width."""
+    seeds = np.random.SeedSequence(SEED).spawn(N_PATHS // BATCH_SIZE + 1)
+    pilot = scenarios._sample_paths(np.random.default_rng(seeds[0]), min(BATCH_SIZE, 500))
+    width = 5 * max(float(pilot.max() - pilot.min()), 1.0) / scenarios.BINS
+    paths = np.concatenate([scenarios._sample_paths(np.random.default_rng(child), BATCH_SIZE)
+                            for child in seeds[1:]])
+    return paths, width
+
+
+def test_fan_chart_does_not_depend_on_the_worker_count(artifacts):
+    single = simulate(artifacts, workers=1)
+    pd.testing.assert_frame_equal(simulate(artifacts, workers=2), single)
+    assert single["Year"].tolist() == [2020, 2021, 2022] * len(MODELS)
+
+
+def test_streaming_quantiles_match_the_exact_quantiles_of_every_path(artifacts):
+    fan = simulate(artifacts, workers=2).set_index(["model", "Year"])
+    paths, width = all_paths()
+    assert len(paths) == N_PATHS
+
+    for m, model in enumerate(MODELS):
+        table = fan.loc[model]
+        np.testing.assert_allclose(table["mean"], paths[:, m].mean(axis=0), rtol=1e-10)
+        for q in scenarios.QUANTILES:
+            # The histogram interpolates inside the bin holding the exact order statistic
+            exact = np.quantile(paths[:, m], q, axis=0, method="inverted_cdf")
+            np.testing.assert_allclose(table[f"p{round(q * 100)}"], exact, rtol=0.0, atol=width)
+
+
+def test_merged_histograms_equal_one_histogram():
+    values = np.random.default_rng(3).normal(0, 1, (1000, 2, 3))
+    whole = StreamingQuantiles(-5, 5, (2, 3), bins=512)
+    whole.update(values)
+    merged = StreamingQuantiles(-5, 5, (2, 3), bins=512)
+    for part in np.array_split(values, 3):
+        batch = StreamingQuantiles(-5, 5, (2, 3), bins=512)
+        batch.update(part)
+        merged.merge(batch)
+
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+    assert merged.n == 1000
+    np.testing.assert_allclose(merged.quantile(0.5), whole.quantile(0.5))
+    np.testing.assert_allclose(whole.quantile(0.9), np.quantile(values, 0.9, axis=0, method="inverted_cdf"),
+                               atol=10 / 512)
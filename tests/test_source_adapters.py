@@ -0,0 +1,54 @@
+import threading
+
+import pandas as pd
+
+from source_adapters import HostRateLimiter, RestAdapter, WorldBankAdapter, YahooAdapter, fetch_series
+from timeseries_store import TimeSeriesStore
+
+
+def test_fetch_series_from_each_adapter(http_stub, tmp_path):
+    http_stub.routes.update({
+        "/v2/country/IND/indicator/NV.AGR.TOTL.ZS": (200, [
+            {"page": 1, "pages": 1}, [{"date": "2001", "value": 17.5}, {"date": "2000", "value": None},
+                                      {"date": "2002", "value": 16.9}]]),
+        "/data.json": (200, {"meta": {"source": "stub"}, "data": [{"year": 2000, "value": "1.5"},
+                                                                 {"year": 2001, "value": 2.5}]}),
+        "/series.csv": (200, "TIME_PERIOD,OBS_VALUE\n2000-01,10\n2001-01,11\n"),
+    })
+    adapters = [WorldBankAdapter(base_url=http_stub.url + "/v2"), YahooAdapter(store=TimeSeriesStore(str(tmp_path))),
+                RestAdapter()]
+    jobs = {"agri": "NV.AGR.TOTL.ZS", "missing": "NY.NOT.THERE", "json": http_stub.url + "/data.json",
+            "csv": http_stub.url + "/series.csv", "unknown": "not a code"}
+    results = fetch_series(jobs, adapters, max_workers=4, limiter=HostRateLimiter(default=1000.0))
+
+    assert list(results) == list(jobs)
+    assert results["agri"].to_dict("list") == {"Year": [2001, 2002], "Value": [17.5, 16.9]}
+    assert results["json"].to_dict("list") == {"Year": [2000, 2001], "Value": [1.5, 2.5]}
+    assert results["csv"].to_dict("list") == {"Year": [2000, 2001], "Value": [10, 11]}
+    # A 404 and a code no adapter matches both give an empty series instead of failing the batch
+    assert results["missing"].empty and results["unknown"].empty
+    assert ("/v2/country/IND/indicator/NY.NOT.THERE", {"date": "2000:2024", "format": "json", "per_page": "1000",
+                                                       "page": "1"}) in http_stub.requests
+
+
+def test_yahoo_adapter_creates_its_store_up_front():
+    # fetch() runs on worker threads, so they must all find the same store already there
+    assert isinstance(YahooAdapter().store, TimeSeriesStore)
+
+
+def test_store_writes_from_threads_keep_every_series(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    names = [f"S{i}" for i in range(16)]
+
+    def write(name):
+        for day in range(1, 11):
+            store.write(name, pd.Series([float(day)], index=[pd.Timestamp(2020, 1, day)]), "D", "test")
+
+    threads = [threading.Thread(target=write, args=(name,)) for name in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    reopened = TimeSeriesStore(str(tmp_path))
+    assert reopened.names() == sorted(names)
+    assert all(reopened.manifest[name]["rows"] == 10 for name in names)
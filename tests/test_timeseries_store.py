@@ -0,0 +1,32 @@
+import pandas as pd
+
+from timeseries_store import TimeSeriesStore
+
+
+def test_sync_after_empty_first_sync_starts_from_start(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    calls = []
+
+    def loader(start, end):
+        calls.append(start)
+        if len(calls) == 1:
+            return pd.Series(dtype="float64")
+        return pd.Series([1.0, 2.0], index=pd.to_datetime(["2020-01-02", "2020-01-03"]))
+
+    assert store.sync("X", loader, start="2020-01-01") == 0
+    assert store.last_date("X") is None
+
+    # The reopened store reads "last": null from the manifest and still resumes from start
+    store = TimeSeriesStore(str(tmp_path))
+    assert store.sync("X", loader, start="2020-01-01") == 2
+    assert calls == ["2020-01-01", "2020-01-01"]
+    assert store.last_date("X") == pd.Timestamp("2020-01-03")
+    assert store.read("X").tolist() == [1.0, 2.0]
+
+
+def test_sync_resumes_before_last_date(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    store.write("X", pd.Series([1.0], index=pd.to_datetime(["2020-01-10"])), "D", "test")
+    starts = []
+    store.sync("X", lambda s, e: starts.append(s) or pd.Series(dtype="float64"))
+    assert starts == ["2020-01-05"]